@@ -78,14 +78,24 @@ def main():
 
 	response = check_response(requests.get(f"{host}/api/cellstates", params={ "uuid": sim['uuid'], "index": frame_count - 1 }, headers={ "Authorization": token }))
 
-	# Unpack the cell states
-	states = fmt.read_all_states_from_buffer(response.content)
+	# Unpack the cell states. Only the columns we need are decoded, and each of them is returned
+	# as a NumPy array. If you prefer working with one object per cell, you can use
+	# 'fmt.read_all_states_from_buffer' instead.
+	columns = fmt.read_columns_from_buffer(response.content, [ "target_volume" ])
 
-	avg_volume = 0
-	for state in states:
-		avg_volume += state.target_volume
-	avg_volume /= len(states)
+	avg_volume = columns["target_volume"].mean()
 
 	print(f"Average Volume: {avg_volume}")
 
+	# The server can also compute aggregates for every frame of the simulation, so a growth curve
+	# doesn't require downloading every frame
+	response = check_response(requests.get(f"{host}/api/framestatistics", params={ "uuid": sim['uuid'], "attributes": "target_volume" }, headers={ "Authorization": token }))
+	frame_statistics = json.loads(response.text)
+
+	print("Average Volume per step:")
+	for (step, statistics) in zip(frame_statistics["steps"], frame_statistics["statistics"]):
+		if statistics is None: continue
+
+		print(f"    {step}: {statistics['groups']['all']['attributes']['target_volume']['mean']}")
+
 main()
\ No newline at end of file
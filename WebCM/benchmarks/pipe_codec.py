@@ -0,0 +1,74 @@
+# Compares how many instance messages per second can be sent through a pipe with the old JSON
+# encoding (one pickled JSON string per message) and with the msgpack batches that
+# 'DuplexPipeEndpoint' sends now. Run it from the server's root directory with:
+#
+#	python -m benchmarks.pipe_codec [message count] [batch size]
+import sys
+import json
+import time
+import threading
+import multiprocessing as mp
+
+from simrunner.instances.duplex_pipe_endpoint import encode_pipe_batch, decode_pipe_batch
+
+DEFAULT_MESSAGE_COUNT = 100_000
+DEFAULT_BATCH_SIZE = 16
+
+def create_message(frame):
+	return { "newframe": { "frame": frame, "step_file": f"./step-{frame:05d}.cm5_step", "viz_file": f"cache/step-{frame:05d}.cm5_viz" } }
+
+def run_json(message_count, batch_size):
+	reader, writer = mp.Pipe(duplex=False)
+
+	def receive():
+		for it in range(message_count):
+			message = json.loads(reader.recv())
+			list(message)[0]
+
+	thread = threading.Thread(target=receive)
+	thread.start()
+
+	for it in range(message_count):
+		writer.send(json.dumps(create_message(it)))
+
+	thread.join()
+
+def run_msgpack(message_count, batch_size):
+	reader, writer = mp.Pipe(duplex=False)
+
+	def receive():
+		received = 0
+
+		while received < message_count:
+			for message in decode_pipe_batch(reader.recv_bytes()):
+				list(message)[0]
+				received += 1
+
+	thread = threading.Thread(target=receive)
+	thread.start()
+
+	for batch_start in range(0, message_count, batch_size):
+		batch_end = min(batch_start + batch_size, message_count)
+		writer.send_bytes(encode_pipe_batch([ create_message(it) for it in range(batch_start, batch_end) ]))
+
+	thread.join()
+
+def main():
+	message_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MESSAGE_COUNT
+	batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BATCH_SIZE
+
+	runs = [
+		("JSON (one message per write)", run_json, 1),
+		("msgpack (one message per write)", run_msgpack, 1),
+		(f"msgpack (batches of {batch_size})", run_msgpack, batch_size),
+	]
+
+	for (name, func, run_batch_size) in runs:
+		start = time.perf_counter()
+		func(message_count, run_batch_size)
+		elapsed = time.perf_counter() - start
+
+		print(f"{name:>34}: {message_count / elapsed:>12,.0f} messages/s")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,70 @@
+# Measures the round-trip latency of a message sent through a pair of 'DuplexPipeEndpoint's, with
+# the second endpoint running in a child process (like a simulation instance). Run it from the
+# server's root directory with:
+#
+#	python -m benchmarks.pipe_latency [round trips]
+import sys
+import time
+import threading
+import statistics
+import multiprocessing as mp
+
+from simrunner.instances.duplex_pipe_endpoint import DuplexPipeEndpoint
+
+DEFAULT_ROUND_TRIPS = 200
+
+def echo_process(pipe):
+	endpoint = None
+
+	def echo(message):
+		endpoint.send_item(message)
+
+	closed = threading.Event()
+
+	endpoint = DuplexPipeEndpoint(pipe, echo, closed.set)
+	endpoint.start()
+
+	closed.wait()
+
+def main():
+	round_trips = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROUND_TRIPS
+
+	ctx = mp.get_context("spawn")
+	parent_pipe, child_pipe = mp.Pipe(duplex=True)
+
+	process = ctx.Process(target=echo_process, args=(child_pipe,), daemon=True)
+	process.start()
+
+	received = threading.Event()
+
+	endpoint = DuplexPipeEndpoint(parent_pipe, lambda message: received.set())
+	endpoint.start()
+
+	# Make sure the child process is up and running before we start measuring
+	endpoint.send_item("warmup")
+	received.wait()
+
+	latencies = []
+
+	for it in range(round_trips):
+		received.clear()
+
+		start = time.perf_counter()
+		endpoint.send_item(it)
+		received.wait()
+
+		latencies.append(time.perf_counter() - start)
+
+	endpoint.shutdown()
+	process.join(timeout=2.0)
+
+	latencies.sort()
+
+	print(f"Round trips: {round_trips}")
+	print(f"    Mean:   {1000.0 * statistics.mean(latencies):8.3f} ms")
+	print(f"    Median: {1000.0 * statistics.median(latencies):8.3f} ms")
+	print(f"    P99:    {1000.0 * latencies[int(0.99 * (len(latencies) - 1))]:8.3f} ms")
+	print(f"    Max:    {1000.0 * latencies[-1]:8.3f} ms")
+
+if __name__ == "__main__":
+	main()
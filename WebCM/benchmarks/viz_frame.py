@@ -0,0 +1,113 @@
+# Compares the vectorized viz frame writer against the original per-cell and per-voxel 'struct.pack' loops.
+# Run it from the server's root directory with:
+#
+#	python -m benchmarks.viz_frame [cell counts...]
+import io
+import sys
+import time
+import struct
+import random
+
+import numpy
+
+from simrunner.backends.cellmodeller4 import pack_norm_color, pack_viz_cell_data, pack_signal_voxels
+
+DEFAULT_CELL_COUNTS = [ 10_000, 100_000, 1_000_000 ]
+SIGNAL_GRID_SIZES = [ (64, 8, 12), (128, 128, 32) ]
+
+class _FakeCellState:
+	def __init__(self, id):
+		self.id = id
+		self.pos = [ random.uniform(-50, 50), random.uniform(-50, 50), random.uniform(-5, 5) ]
+		self.dir = [ 1.0, 0.0, 0.0 ]
+		self.length = random.uniform(2.0, 4.0)
+		self.radius = 0.5
+		self.color = [ random.random(), random.random(), random.random() ]
+
+def create_cell_states(cell_count):
+	return { id: _FakeCellState(id) for id in range(cell_count) }
+
+# This is how viz frames packed the cell data before it was vectorized
+def pack_cells_reference(cell_states):
+	byte_buffer = io.BytesIO()
+	byte_buffer.write(struct.pack("<i", len(cell_states)))
+
+	for it in cell_states.keys():
+		state = cell_states[it]
+
+		packed_color = pack_norm_color(state.color[0], state.color[1], state.color[2], 1.0)
+		final_length = max(state.length + 1.0 - 2.0 * state.radius, 0)
+
+		byte_buffer.write(struct.pack("<fff", state.pos[0], state.pos[2], state.pos[1]))
+		byte_buffer.write(struct.pack("<fff", state.dir[0], state.dir[2], state.dir[1]))
+		byte_buffer.write(struct.pack("<ffI", final_length, state.radius, packed_color))
+
+	for it in cell_states.keys():
+		byte_buffer.write(struct.pack("<Q", int(cell_states[it].id)))
+
+	return byte_buffer.getvalue()
+
+def pack_cells_vectorized(cell_states):
+	cell_data, cell_ids = pack_viz_cell_data(cell_states)
+
+	byte_buffer = io.BytesIO()
+	byte_buffer.write(struct.pack("<i", len(cell_data)))
+	byte_buffer.write(cell_data)
+	byte_buffer.write(cell_ids)
+
+	return byte_buffer.getvalue()
+
+# This is how viz frames packed the signals grid before it was vectorized
+def pack_signals_reference(voxels, cell_count):
+	byte_buffer = io.BytesIO()
+
+	for z in range(cell_count[1]):
+		for y in range(cell_count[2]):
+			for x in range(cell_count[0]):
+				density = voxels[x][z][y]
+				byte_buffer.write(struct.pack("<I", pack_norm_color(density, 0.0, 0.0, density)))
+
+	return byte_buffer.getvalue()
+
+def pack_signals_vectorized(voxels, cell_count):
+	return pack_signal_voxels(voxels, cell_count).tobytes()
+
+def time_call(func, *args):
+	start = time.perf_counter()
+	result = func(*args)
+
+	return result, time.perf_counter() - start
+
+def main():
+	cell_counts = [ int(arg) for arg in sys.argv[1:] ] or DEFAULT_CELL_COUNTS
+
+	print(f"{'cells':>10} {'reference (s)':>14} {'vectorized (s)':>15} {'speedup':>8}")
+
+	for cell_count in cell_counts:
+		cell_states = create_cell_states(cell_count)
+
+		reference_data, reference_time = time_call(pack_cells_reference, cell_states)
+		vectorized_data, vectorized_time = time_call(pack_cells_vectorized, cell_states)
+
+		if not reference_data == vectorized_data:
+			raise Exception(f"Vectorized output does not match the reference output ({cell_count} cells)")
+
+		print(f"{cell_count:>10} {reference_time:>14.3f} {vectorized_time:>15.3f} {reference_time / vectorized_time:>7.1f}x")
+
+	print()
+	print(f"{'grid':>14} {'reference (s)':>14} {'vectorized (s)':>15} {'speedup':>8}")
+
+	for grid_size in SIGNAL_GRID_SIZES:
+		voxels = numpy.random.uniform(-0.2, 1.2, grid_size)
+
+		reference_data, reference_time = time_call(pack_signals_reference, voxels, grid_size)
+		vectorized_data, vectorized_time = time_call(pack_signals_vectorized, voxels, grid_size)
+
+		if not reference_data == vectorized_data:
+			raise Exception(f"Vectorized output does not match the reference output (grid {grid_size})")
+
+		grid_name = "x".join(str(size) for size in grid_size)
+		print(f"{grid_name:>14} {reference_time:>14.3f} {vectorized_time:>15.3f} {reference_time / vectorized_time:>7.1f}x")
+
+if __name__ == "__main__":
+	main()
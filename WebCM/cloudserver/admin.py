@@ -3,4 +3,11 @@ from .models import SimulationEntry, SourceContentEntry, PerUserSetting
 
 admin.site.register(SimulationEntry)
 admin.site.register(SourceContentEntry)
-admin.site.register(PerUserSetting)
\ No newline at end of file
+@admin.register(PerUserSetting)
+class PerUserSettingAdmin(admin.ModelAdmin):
+	list_display = ("owner", "max_cell_count", "cpu_share", "cpu_hours")
+	readonly_fields = ("cpu_seconds",)
+
+	@admin.display(description="CPU hours", ordering="cpu_seconds")
+	def cpu_hours(self, setting):
+		return round(setting.cpu_seconds / 3600.0, 2)
\ No newline at end of file
@@ -18,8 +18,12 @@ django_asgi_app = get_asgi_application()
 
 # NOTE: The code above needs to happens BEFORE everything else, otherwise, ASGI applications won't work
 import simrunner.routing
+from simrunner.instances import manager
 from channels.routing import ProtocolTypeRouter, URLRouter
 
+# Start the process that simulations are forked from, so it is ready by the time the first simulation starts
+manager.prewarm_instance_processes()
+
 application = ProtocolTypeRouter({
 	"http": django_asgi_app,
 	"websocket": URLRouter(simrunner.routing.websocket_urlpatterns),
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import F
 
 import uuid
 
@@ -10,6 +11,10 @@ class SimulationEntry(models.Model):
 	uuid = models.UUIDField(default=uuid.uuid4, editable=True)
 	save_location = models.TextField()
 	max_cell_count = models.IntegerField(default=0)
+	# Zero means the stride set by the model (e.g. 'sim.pickleSteps') is used
+	output_stride = models.IntegerField(default=0)
+	# Minimum number of seconds between frames
+	output_interval = models.FloatField(default=0.0)
 
 	def __str__(self):
 		return f"(Simulation: {self.uuid}, {self.owner})"
@@ -26,6 +31,10 @@ class SourceContentEntry(models.Model):
 class PerUserSetting(models.Model):
 	owner = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True)
 	max_cell_count = models.IntegerField(default=0)
+	# Relative share of the server's cores, used when the cores are contended (see simrunner/instances/fair_share.py)
+	cpu_share = models.FloatField(default=1.0)
+	# Total CPU time used by the user's simulations
+	cpu_seconds = models.FloatField(default=0.0)
 
 	def __str__(self):
 		return f"(Settings: {self.owner}, { '<no limit>' if self.max_cell_count <= 0 else self.max_cell_count })"
@@ -62,4 +71,16 @@ def lookup_per_user_settings(user):
 	try:
 		return PerUserSetting.objects.get(owner=user)
 	except (PerUserSetting.DoesNotExist, PerUserSetting.MultipleObjectsReturned):
-		return None
\ No newline at end of file
+		return None
+
+def lookup_user_cpu_share(owner_id):
+	user_settings = PerUserSetting.objects.filter(owner_id=owner_id).first()
+	return 1.0 if user_settings is None else user_settings.cpu_share
+
+# 'usage' maps user IDs to the number of CPU seconds to add
+def add_user_cpu_seconds(usage):
+	for (owner_id, seconds) in usage.items():
+		if owner_id is None: continue
+
+		PerUserSetting.objects.get_or_create(owner_id=owner_id)
+		PerUserSetting.objects.filter(owner_id=owner_id).update(cpu_seconds=F("cpu_seconds") + seconds)
\ No newline at end of file
@@ -29,6 +29,48 @@ SECRET_KEY = 'django-insecure-(r=sn9c$ri39&jsx0oi=lyqx+03+79saiiaw!m!w1-)2euzg%!
 DEBUG = True
 ENABLE_CELLMODELLER5 = False
 
+# Step files are written on background threads while the simulation keeps running. The queue depth
+# is the maximum number of frames that can be waiting to be written before the simulation blocks.
+SIM_FRAME_WRITER_THREADS = 2
+SIM_FRAME_QUEUE_DEPTH = 4
+
+# I/O budget of every simulation. When the frames written by a simulation go over the budget, it
+# automatically writes fewer frames. The budget is given in MB/s written and/or the fraction of
+# wall time spent writing frames. Zero means no limit.
+SIM_IO_BUDGET_MB_PER_SECOND = 0
+SIM_IO_BUDGET_WRITE_FRACTION = 0
+
+# Number of seconds between checkpoints of a running simulation. Simulations that are started again
+# (e.g. after the server restarts) continue from their latest checkpoint. Zero disables checkpoints.
+SIM_CHECKPOINT_INTERVAL = 600
+
+# Maximum number of simulations that can run at the same time (zero means one per core). Simulations
+# that are started when the limit is reached are queued until another simulation stops. When pinning
+# is enabled, the cores of the server are split between the running simulations. A simulation that
+# starts while no other simulation is running is never pinned, so it can use every core (OpenCL and
+# the frame writers run on the CPU too).
+SIM_MAX_RUNNING_INSTANCES = 0
+SIM_PIN_INSTANCES_TO_CORES = False
+
+# Simulation processes are forked from a server process that has already imported these modules, which
+# saves some time every time a simulation starts. If the "forkserver" start method isn't available
+# (e.g. on Windows), every simulation is started in a new interpreter with "spawn".
+#
+# Don't preload pyopencl or CellModeller: OpenCL doesn't survive a fork, so they are imported by every
+# simulation process after it has started (batch runs spawn their workers for the same reason).
+SIM_PROCESS_START_METHOD = "forkserver"
+SIM_PRELOAD_MODULES = [
+	"numpy",
+	"simrunner.instances.siminstance",
+]
+
+# The newest viz frames of every running simulation are kept in shared memory, so live viewers don't
+# have to wait for them to be read back from the disk. Frames larger than the slot size are only
+# read from the disk. Every running simulation uses slots * slot size bytes of /dev/shm, and the
+# memory is only used while enough of /dev/shm stays free. Zero slots disables this.
+SIM_LIVE_FRAME_SLOTS = 2
+SIM_LIVE_FRAME_SLOT_SIZE = 2 * 1024 * 1024
+
 ALLOWED_HOSTS = ["*"]
 
 SITE_ID = 1
@@ -0,0 +1,251 @@
+import io
+import os
+import json
+import zlib
+import numpy
+import logging
+import struct
+import shutil
+import zipfile
+import tempfile
+
+from uuid import uuid4
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+
+from saveviewer import archiver
+from saveviewer import format as sv_format
+
+TEST_FRAME_COUNT = 3
+TEST_OUTPUT_STRIDE = 2
+
+def get_test_viz_data(frame):
+	return zlib.compress(f"viz-{frame}".encode())
+
+# A simulation in a temporary archive, with a few frames that were written every other step
+class _ArchivedSimulationTestCase(TestCase):
+	def setUp(self):
+		self.archive_root = tempfile.mkdtemp()
+
+		patches = [
+			mock.patch.object(archiver.global__archiver, "archive_root", self.archive_root),
+			mock.patch.object(archiver.global__archiver, "sim_data", {}),
+			mock.patch.object(archiver.global__archiver, "frame_data", {}),
+		]
+
+		for patch in patches:
+			patch.start()
+			self.addCleanup(patch.stop)
+
+		# Invalid requests are expected, so their warnings would only clutter the output
+		request_logger = logging.getLogger("django.request")
+		self.addCleanup(request_logger.setLevel, request_logger.level)
+		request_logger.setLevel(logging.ERROR)
+
+		self.user = User.objects.create_user("test-user", password="test-password")
+		self.client.force_login(self.user)
+
+		self.simulation = archiver.register_simulation(self.user, "Test simulation", "", 100, output_stride=TEST_OUTPUT_STRIDE)
+		self.index_path = os.path.join(self.simulation.save_location, archiver.INDEX_FILE_NAME)
+
+		archiver.write_empty_index_file(self.index_path, "CellModeller4")
+
+		for frame in range(TEST_FRAME_COUNT):
+			step_file = f"step-{frame + 1}.cm5_step"
+			viz_file = f"cache/step-{frame + 1}.cm5_viz"
+
+			sv_format.write_columns(os.path.join(self.simulation.save_location, step_file), {
+				"id": numpy.arange(2 + frame),
+				"cell_type": numpy.arange(2 + frame) % 2,
+				"volume": numpy.arange(2 + frame) + 1.0,
+			})
+
+			with open(os.path.join(self.simulation.save_location, viz_file), "wb") as out_file:
+				out_file.write(get_test_viz_data(frame))
+
+			archiver.write_entry_to_sim_index(self.index_path, step_file, viz_file, frame * TEST_OUTPUT_STRIDE, TEST_OUTPUT_STRIDE)
+
+		self.generation = archiver.get_simulation_run_generation(self.simulation.uuid)
+
+	def tearDown(self):
+		archiver.release_sim_index(self.index_path)
+		shutil.rmtree(self.archive_root)
+
+	def get(self, path, headers=None, **params):
+		return self.client.get(path, { "uuid": str(self.simulation.uuid), **params }, headers=headers)
+
+	def read_content(self, response):
+		return b"".join(response.streaming_content) if response.streaming else response.content
+
+class FrameCachingTests(_ArchivedSimulationTestCase):
+	def test_frames_are_revalidated_with_etags(self):
+		for path in [ "/api/vizdata", "/api/cellstates" ]:
+			response = self.get(path, index=1)
+			etag = f"\"{self.generation}-1\""
+
+			self.assertEqual(response.status_code, 200)
+			self.assertEqual(response["ETag"], etag)
+			self.assertEqual(response["Cache-Control"], "private, no-cache")
+			self.read_content(response)
+
+			response = self.get(path, index=1, headers={ "If-None-Match": etag })
+
+			self.assertEqual(response.status_code, 304)
+			self.assertEqual(response["ETag"], etag)
+
+			# A frame of another run doesn't match
+			response = self.get(path, index=1, headers={ "If-None-Match": "\"previous-run-1\"" })
+
+			self.assertEqual(response.status_code, 200)
+			self.read_content(response)
+
+	def test_frames_of_the_current_generation_are_immutable(self):
+		response = self.get("/api/vizdata", index=2, generation=self.generation)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response["Cache-Control"], "private, max-age=31536000, immutable")
+		self.assertEqual(response["X-Simulation-Step"], str(2 * TEST_OUTPUT_STRIDE))
+		self.assertEqual(response["X-Simulation-Stride"], str(TEST_OUTPUT_STRIDE))
+		self.assertEqual(self.read_content(response), get_test_viz_data(2))
+
+		# The viewer could still have the URL of a previous run
+		response = self.get("/api/cellstates", index=2, generation="previous-run")
+
+		self.assertEqual(response["Cache-Control"], "private, no-cache")
+		self.read_content(response)
+
+	def test_missing_frame(self):
+		self.assertEqual(self.get("/api/vizdata", index=TEST_FRAME_COUNT).status_code, 483)
+		self.assertEqual(self.get("/api/cellstates", index=TEST_FRAME_COUNT).status_code, 483)
+
+class VizFramesTests(_ArchivedSimulationTestCase):
+	def read_frames(self, response):
+		content = self.read_content(response)
+		header = struct.Struct("<IIII")
+		frames = []
+
+		while len(content) > 0:
+			(frame, step, stride, length) = header.unpack_from(content)
+			frames.append((frame, step, stride, content[header.size:header.size + length]))
+
+			content = content[header.size + length:]
+
+		return frames
+
+	def test_frame_stream(self):
+		response = self.get("/api/vizframes", first=1, count=2, generation=self.generation)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response["ETag"], f"\"{self.generation}-1-2\"")
+		self.assertEqual(response["Cache-Control"], "private, max-age=31536000, immutable")
+		self.assertEqual(self.read_frames(response), [
+			(1, 1 * TEST_OUTPUT_STRIDE, TEST_OUTPUT_STRIDE, get_test_viz_data(1)),
+			(2, 2 * TEST_OUTPUT_STRIDE, TEST_OUTPUT_STRIDE, get_test_viz_data(2)),
+		])
+
+		response = self.get("/api/vizframes", first=1, count=2, headers={ "If-None-Match": f"\"{self.generation}-1-2\"" })
+		self.assertEqual(response.status_code, 304)
+
+	def test_incomplete_range_is_not_cached(self):
+		response = self.get("/api/vizframes", first=2, count=5, generation=self.generation)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response["Cache-Control"], "no-store")
+		self.assertFalse(response.has_header("ETag"))
+		self.assertEqual([ frame[0] for frame in self.read_frames(response) ], [ 2 ])
+
+	def test_invalid_range(self):
+		self.assertEqual(self.get("/api/vizframes", first=-1, count=2).status_code, 400)
+		self.assertEqual(self.get("/api/vizframes", first=0, count=0).status_code, 400)
+
+class ExportFramesTests(_ArchivedSimulationTestCase):
+	def test_export_range(self):
+		archiver.write_sim_source_to_location(self.simulation.save_location, "# Test model")
+
+		response = self.get("/api/exportframes", first=1, count=2, viz=1, source=1, index=1)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response["Cache-Control"], "no-store")
+
+		with zipfile.ZipFile(io.BytesIO(self.read_content(response))) as archive:
+			self.assertEqual(sorted(archive.namelist()), [ "index.json", "source.py", "step-2.cm5_step", "step-3.cm5_step", "viz/step-2.cm5_viz", "viz/step-3.cm5_viz" ])
+			self.assertEqual(archive.read("viz/step-3.cm5_viz"), get_test_viz_data(2))
+			self.assertEqual(list(sv_format.read_columns_from_buffer(archive.read("step-3.cm5_step"))["id"]), [ 0, 1, 2, 3 ])
+
+			export_index = json.loads(archive.read("index.json"))
+
+		self.assertEqual([ (frame["frame"], frame["step"]) for frame in export_index["frames"] ], [ (1, 2), (2, 4) ])
+
+	def test_range_errors(self):
+		self.assertEqual(self.get("/api/exportframes", first=-1, count=1).status_code, 400)
+		self.assertEqual(self.get("/api/exportframes", first=0, count=0).status_code, 400)
+
+		# Every frame in the range has to exist
+		self.assertEqual(self.get("/api/exportframes", first=2, count=2).status_code, 483)
+
+		response = self.client.get("/api/exportframes", { "uuid": str(uuid4()), "first": 0, "count": 1 })
+		self.assertEqual(response.status_code, 483)
+
+class CellTrajectoryTests(_ArchivedSimulationTestCase):
+	def test_trajectory(self):
+		response = self.get("/api/celltrajectory", cellid=2, first=0, count=TEST_FRAME_COUNT, attributes="volume, cell_type")
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(json.loads(response.content), {
+			"cellId": 2,
+			"frames": [ 0, 1, 2 ],
+			"steps": [ 0, 2, 4 ],
+			"present": [ False, True, True ],
+			"attributes": { "volume": [ None, 3.0, 3.0 ], "cell_type": [ None, 0, 0 ] },
+		})
+
+		# Frames past the end of the run are left out
+		response = self.get("/api/celltrajectory", cellid=0, first=2, count=10)
+		self.assertEqual(json.loads(response.content)["frames"], [ 2 ])
+
+	def test_range_errors(self):
+		self.assertEqual(self.get("/api/celltrajectory", cellid=0, first=-1, count=1).status_code, 400)
+		self.assertEqual(self.get("/api/celltrajectory", cellid=0, first=0, count=0).status_code, 400)
+
+		response = self.client.get("/api/celltrajectory", { "uuid": str(uuid4()), "cellid": 0, "first": 0, "count": 1 })
+		self.assertEqual(response.status_code, 483)
+
+class FrameStatisticsTests(_ArchivedSimulationTestCase):
+	def test_statistics_of_the_whole_run(self):
+		response = self.get("/api/framestatistics")
+
+		self.assertEqual(response.status_code, 200)
+
+		content = json.loads(response.content)
+
+		self.assertEqual(content["frames"], [ 0, 1, 2 ])
+		self.assertEqual(content["steps"], [ 0, 2, 4 ])
+
+		groups = content["statistics"][2]["groups"]
+
+		self.assertEqual(groups["all"]["count"], 4)
+		self.assertEqual(groups["all"]["attributes"]["volume"]["mean"], 2.5)
+		self.assertEqual(groups["0"]["attributes"]["volume"]["mean"], 2.0)
+		self.assertEqual(groups["1"]["attributes"]["volume"]["mean"], 3.0)
+
+		# The statistics are cached for the next request
+		self.assertTrue(os.path.exists(os.path.join(self.simulation.save_location, archiver.STATISTICS_FILE_NAME)))
+		self.assertEqual(json.loads(self.get("/api/framestatistics").content), content)
+
+	def test_attribute_filter(self):
+		content = json.loads(self.get("/api/framestatistics", first=1, count=1, attributes="missing").content)
+
+		self.assertEqual(content["frames"], [ 1 ])
+		self.assertEqual(content["statistics"][0]["histogram_edges"], {})
+		self.assertEqual(content["statistics"][0]["groups"]["all"]["attributes"], {})
+
+	def test_range_errors(self):
+		self.assertEqual(self.get("/api/framestatistics", first=-1).status_code, 400)
+		self.assertEqual(self.get("/api/framestatistics", first=0, count=-1).status_code, 400)
+
+		# Frames past the end of the run are left out
+		self.assertEqual(json.loads(self.get("/api/framestatistics", first=TEST_FRAME_COUNT).content)["frames"], [])
+
+		response = self.client.get("/api/framestatistics", { "uuid": str(uuid4()) })
+		self.assertEqual(response.status_code, 483)
@@ -33,8 +33,12 @@ urlpatterns = [
     # APIs
     path("api/simheader", views.sim_header),
     path("api/vizdata", views.viz_data),
+    path("api/vizframes", views.viz_frames),
     path("api/cellstates", views.cell_states),
+    path("api/exportframes", views.export_frames),
     path("api/cellinfoindex", views.cell_info_from_index),
+    path("api/celltrajectory", views.cell_trajectory),
+    path("api/framestatistics", views.frame_statistics),
     path("api/shapelist", views.shape_list),
 
     path("api/listsimulations", views.list_owned_simulations),
@@ -48,7 +52,10 @@ urlpatterns = [
 
     path("api/createnewsimulation", views.create_new_simulation),
     path("api/stopsimulation", views.stop_simulation),
+    path("api/pausesimulation", views.pause_simulation),
+    path("api/resumesimulation", views.resume_simulation),
     path("api/deletesimulation", views.delete_simulation),
+    path("api/launchmetrics", views.instance_launch_metrics),
 
     path("api/userauth/", include("userauth.urls")),
 ]
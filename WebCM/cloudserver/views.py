@@ -1,5 +1,7 @@
-from django.http import HttpResponse, FileResponse, HttpResponseRedirect, HttpResponseBadRequest, HttpResponseNotAllowed
+from django.http import HttpResponse, FileResponse, StreamingHttpResponse, HttpResponseRedirect, HttpResponseBadRequest, HttpResponseNotAllowed, HttpResponseForbidden
 from django.template import RequestContext, Template
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header
 
 from django.contrib.auth.decorators import login_required
 
@@ -12,11 +14,15 @@ from rest_framework.permissions import IsAuthenticated
 from cloudserver import settings, models
 from saveviewer import archiver
 from saveviewer import format as sv_format
+from saveviewer import export as sv_export
+from saveviewer import trajectory as sv_trajectory
 from simrunner.instances import manager
+from simrunner.instances import launch_metrics
 
 from uuid import UUID, uuid4
 
 import json
+import struct
 
 class HttpResponseBackendError(HttpResponse):
 	status_code = 483 # Custom error code
@@ -56,6 +62,22 @@ def response_no_cache(response):
 		# This doesn't seem to be used anywhere else, so I think its ok if we set it here
 		self._has_been_logged = True
 
+# A frame never changes while the simulation stays on the same run (see 'get_simulation_run_generation').
+# Requests that include the current run generation can be cached for good, because they will ask
+# for a different URL once the generation changes. Other requests are revalidated with the ETag.
+def frame_etag(generation, index):
+	return f"\"{generation}-{int(index)}\""
+
+def response_cached_frame(request, response, generation, etag):
+	response["ETag"] = etag
+
+	if not generation is None and request.GET.get("generation", None) == generation:
+		response["Cache-Control"] = "private, max-age=31536000, immutable"
+	else:
+		response["Cache-Control"] = "private, no-cache"
+
+	return response
+
 # ####### Pages #######
 
 @login_required
@@ -148,6 +170,8 @@ def sim_header(request):
 		"name": simulation.title,
 		"frameCount": index_data["num_frames"],
 		"isOnline": is_online,
+		"status": manager.get_simulation_status(sim_id),
+		"runGeneration": index_data.get("run_generation"),
 		"crashMessage": index_data["crash_message"] if index_data.get("has_crashed") else None
 	})
 
@@ -167,13 +191,87 @@ def viz_data(request):
 	sim_id = request.GET["uuid"]
 	index = request.GET["index"]
 
-	files = archiver.get_simulation_step_files(UUID(sim_id), index)
-	if files is None: return HttpResponseBackendError(f"Index '{index}' in simulation '{sim_id}' does not exist")
+	# Recent frames of running simulations are served from shared memory. They are published there
+	# before they are written, so they might not be in the index yet.
+	live_frame = manager.read_live_frame(UUID(sim_id), int(index))
+
+	files = archiver.get_simulation_step_files(UUID(sim_id), index) if live_frame is None else None
+	if live_frame is None and files is None: return HttpResponseBackendError(f"Index '{index}' in simulation '{sim_id}' does not exist")
+
+	generation = archiver.get_simulation_run_generation(UUID(sim_id))
+	etag = frame_etag(generation, index)
+
+	not_modified = get_conditional_response(request, etag=etag)
+	if not not_modified is None: return response_cached_frame(request, not_modified, generation, etag)
+
+	# Frames are not necessarily written every step, so the viewer needs to know which step this is
+	if live_frame is None:
+		(step, stride) = archiver.get_simulation_frame_step(UUID(sim_id), index)
+		response = FileResponse(open(files[1], "rb"))
+	else:
+		(data, step, stride) = live_frame
+		response = HttpResponse(data)
 
-	response = FileResponse(open(files[1], "rb"))
 	response["Content-Encoding"] = "deflate"
+	response["X-Simulation-Step"] = str(step)
+	response["X-Simulation-Stride"] = str(stride)
 
-	return response_no_cache(response)
+	return response_cached_frame(request, response, generation, etag)
+
+# Maximum number of frames that can be requested from 'viz_frames' at once
+VIZ_FRAME_BATCH_LIMIT = 64
+
+# Every frame in the stream returned by 'viz_frames' starts with this header: frame index, simulation
+# step, output stride, and the length of the (deflate compressed) viz data that follows it
+VIZ_FRAME_BATCH_HEADER = struct.Struct("<IIII")
+
+# Returns a contiguous range of frames in a single response, so the viewer can load the frames ahead
+# of the one it is showing without a request per frame
+@authenticate_view(["GET"])
+def viz_frames(request):
+	if not "first" in request.GET or not "count" in request.GET:
+		return HttpResponseBadRequest("No frame range provided")
+
+	if not "uuid" in request.GET:
+		return HttpResponseBadRequest("No simulation UUID provided")
+
+	sim_id = UUID(request.GET["uuid"])
+	first = int(request.GET["first"])
+	count = min(int(request.GET["count"]), VIZ_FRAME_BATCH_LIMIT)
+
+	if first < 0 or count <= 0:
+		return HttpResponseBadRequest("Invalid frame range")
+
+	frames = archiver.get_simulation_frame_range(sim_id, first, count)
+	if frames is None: return HttpResponseBackendError(f"No simulation with UUID '{sim_id}' found")
+
+	# The frames are read one after the other, in the order they were written
+	def stream_frames():
+		for (frame, _, viz_file, step, stride) in frames:
+			live_frame = manager.read_live_frame(sim_id, frame)
+
+			if live_frame is None:
+				with open(viz_file, "rb") as viz_file_handle:
+					viz_data = viz_file_handle.read()
+			else:
+				viz_data = live_frame[0]
+
+			yield VIZ_FRAME_BATCH_HEADER.pack(frame, step, stride, len(viz_data))
+			yield viz_data
+
+	# The response for a range that isn't complete yet will change once the simulation writes the
+	# missing frames, so only complete ranges can be cached
+	if len(frames) < count:
+		return response_no_cache(StreamingHttpResponse(stream_frames(), content_type="application/octet-stream"))
+
+	generation = archiver.get_simulation_run_generation(sim_id)
+	etag = f"\"{generation}-{first}-{count}\""
+
+	not_modified = get_conditional_response(request, etag=etag)
+	if not not_modified is None: return response_cached_frame(request, not_modified, generation, etag)
+
+	response = StreamingHttpResponse(stream_frames(), content_type="application/octet-stream")
+	return response_cached_frame(request, response, generation, etag)
 
 @authenticate_view(["GET"])
 def cell_states(request):
@@ -190,7 +288,45 @@ def cell_states(request):
 	files = archiver.get_simulation_step_files(UUID(sim_id), index)
 	if files is None: return HttpResponseBackendError(f"Index '{index}' in simulation '{sim_id}' does not exist")
 
+	generation = archiver.get_simulation_run_generation(UUID(sim_id))
+	etag = frame_etag(generation, index)
+
+	not_modified = get_conditional_response(request, etag=etag)
+	if not not_modified is None: return response_cached_frame(request, not_modified, generation, etag)
+
 	response = FileResponse(open(files[0], "rb"))
+	return response_cached_frame(request, response, generation, etag)
+
+# Streams a ZIP archive with the step files of a range of frames. The archive is built while it is
+# being sent, so large ranges don't have to fit in memory (or in the browser).
+@authenticate_view(["GET"])
+def export_frames(request):
+	if not "first" in request.GET or not "count" in request.GET:
+		return HttpResponseBadRequest("No frame range provided")
+
+	if not "uuid" in request.GET:
+		return HttpResponseBadRequest("No simulation UUID provided")
+
+	sim_id = UUID(request.GET["uuid"])
+	first = int(request.GET["first"])
+	count = int(request.GET["count"])
+
+	if first < 0 or count <= 0:
+		return HttpResponseBadRequest("Invalid frame range")
+
+	simulation = models.lookup_simulation(sim_id)
+	if simulation is None: return HttpResponseBackendError(f"No simulation with UUID '{sim_id}' found")
+
+	frames = archiver.get_simulation_frame_range(sim_id, first, count)
+	if len(frames) < count: return HttpResponseBackendError(f"Frames {first} to {first + count - 1} in simulation '{sim_id}' do not exist")
+
+	include_viz = request.GET.get("viz", "0") == "1"
+	source = archiver.read_simulation_source(sim_id) if request.GET.get("source", "0") == "1" else None
+	index_data = archiver.get_instance_index_data(sim_id) if request.GET.get("index", "0") == "1" else None
+
+	response = StreamingHttpResponse(sv_export.generate_frames_zip(frames, include_viz, source, index_data), content_type="application/zip")
+	response["Content-Disposition"] = content_disposition_header(True, f"{simulation.title}.zip")
+
 	return response_no_cache(response)
 
 @authenticate_view(["GET"])
@@ -221,6 +357,94 @@ def cell_info_from_index(request):
 
 	return response_no_cache(response)
 
+# Returns per-frame aggregates (count, mean, min, max, quantiles and histograms) of the numeric cell
+# attributes, for all cells and grouped by cell type. Without a frame range, the whole run is returned.
+# 'attributes' is an optional comma separated list of the attributes to return.
+@authenticate_view(["GET"])
+def frame_statistics(request):
+	if not "uuid" in request.GET:
+		return HttpResponseBadRequest("No simulation UUID provided")
+
+	sim_id = UUID(request.GET["uuid"])
+
+	index_data = archiver.get_instance_index_data(sim_id)
+	if index_data is None: return HttpResponseBackendError(f"No simulation with UUID '{sim_id}' found")
+
+	first = int(request.GET.get("first", 0))
+	count = int(request.GET.get("count", index_data["num_frames"] - first))
+
+	if first < 0 or count < 0:
+		return HttpResponseBadRequest("Invalid frame range")
+
+	(frames, frame_statistics) = archiver.get_simulation_frame_statistics(sim_id, first, count)
+
+	if "attributes" in request.GET:
+		attributes = [ name.strip() for name in request.GET["attributes"].split(",") if name.strip() ]
+
+		for statistics in frame_statistics:
+			if statistics is None: continue
+
+			statistics["histogram_edges"] = { name: edges for (name, edges) in statistics["histogram_edges"].items() if name in attributes }
+
+			for group in statistics["groups"].values():
+				group["attributes"] = { name: values for (name, values) in group["attributes"].items() if name in attributes }
+
+	response_content = json.dumps({
+		"frames": [ entry[0] for entry in frames ],
+		"steps": [ entry[3] for entry in frames ],
+		"statistics": frame_statistics,
+	})
+
+	response = HttpResponse(response_content, content_type="application/json")
+	response["Content-Length"] = len(response_content)
+
+	return response_no_cache(response)
+
+# Maximum number of frames in a cell trajectory
+CELL_TRAJECTORY_FRAME_LIMIT = 10000
+
+# Returns the attributes of a single cell over a range of frames, as one column per attribute.
+# 'attributes' is a comma separated list of attribute names (e.g. "volume,species"), every
+# attribute is returned if it is not given.
+@authenticate_view(["GET"])
+def cell_trajectory(request):
+	if not "cellid" in request.GET:
+		return HttpResponseBadRequest("No cell index provided")
+
+	if not "first" in request.GET or not "count" in request.GET:
+		return HttpResponseBadRequest("No frame range provided")
+
+	if not "uuid" in request.GET:
+		return HttpResponseBadRequest("No simulation UUID provided")
+
+	sim_id = UUID(request.GET["uuid"])
+	cellid = int(request.GET["cellid"])
+	first = int(request.GET["first"])
+	count = min(int(request.GET["count"]), CELL_TRAJECTORY_FRAME_LIMIT)
+
+	if first < 0 or count <= 0:
+		return HttpResponseBadRequest("Invalid frame range")
+
+	attributes = [ name.strip() for name in request.GET["attributes"].split(",") if name.strip() ] if "attributes" in request.GET else None
+
+	frames = archiver.get_simulation_frame_range(sim_id, first, count)
+	if frames is None: return HttpResponseBackendError(f"No simulation with UUID '{sim_id}' found")
+
+	trajectory = sv_trajectory.read_cell_trajectory(frames, cellid, attributes)
+
+	response_content = json.dumps({
+		"cellId": cellid,
+		"frames": trajectory["frames"],
+		"steps": trajectory["steps"],
+		"present": trajectory["present"],
+		"attributes": trajectory["attributes"],
+	})
+
+	response = HttpResponse(response_content, content_type="application/json")
+	response["Content-Length"] = len(response_content)
+
+	return response_no_cache(response)
+
 @authenticate_view(["GET"])
 def shape_list(request):
 	if not "uuid" in request.GET:
@@ -244,7 +468,8 @@ def list_owned_simulations(request):
 	response_content = []
 	for sim in entries:
 		is_online = manager.is_simulation_running(sim.uuid)
-		response_content.append({ "uuid": str(sim.uuid), "title": sim.title, "desc": sim.description, "isOnline": is_online })
+		status = manager.get_simulation_status(sim.uuid)
+		response_content.append({ "uuid": str(sim.uuid), "title": sim.title, "desc": sim.description, "isOnline": is_online, "status": status })
 
 	return response_no_cache(HttpResponse(json.dumps(response_content), content_type="application/json"))
 
@@ -344,6 +569,13 @@ def create_new_simulation(request):
 
 	if not type(sim_backend) is str: return HttpResponseBadRequest(f"Invalid backend data type: {type(sim_backend)}")
 
+	# Optional output settings
+	output_stride = creation_parameters.get("outputStride", 0)
+	output_interval = creation_parameters.get("outputInterval", 0.0)
+
+	if not type(output_stride) is int or output_stride < 0: return HttpResponseBadRequest(f"Invalid output stride: {output_stride}")
+	if not type(output_interval) in [ int, float ] or output_interval < 0: return HttpResponseBadRequest(f"Invalid output interval: {output_interval}")
+
 	# Check the simulation name
 	sim_name = sim_name.strip()
 
@@ -357,7 +589,7 @@ def create_new_simulation(request):
 	user_settings = models.lookup_per_user_settings(request.user)
 	max_size = 0 if user_settings is None else int(user_settings.max_cell_count)
 
-	uuid = manager.create_simulation(request.user, sim_name, "", sim_source, sim_backend, max_size)
+	uuid = manager.create_simulation(request.user, sim_name, "", sim_source, sim_backend, max_size, output_stride, float(output_interval))
 
 	return HttpResponse(str(uuid))
 
@@ -375,6 +607,46 @@ def stop_simulation(request):
 
 	return HttpResponse()
 
+# Launch timings of the most recent simulations (only available to staff users)
+@authenticate_view(["GET"])
+def instance_launch_metrics(request):
+	if not request.user.is_staff:
+		return HttpResponseForbidden()
+
+	response_content = json.dumps(launch_metrics.get_launch_metrics())
+
+	return response_no_cache(HttpResponse(response_content, content_type="application/json"))
+
+@authenticate_view(["GET"])
+def pause_simulation(request):
+	if not "uuid" in request.GET:
+		return HttpResponseBadRequest("No simulation UUID provided")
+
+	sim_id = UUID(request.GET["uuid"])
+
+	if models.lookup_simulation(sim_id) is None:
+		return HttpResponseBackendError(f"Simulation '{sim_id}' does not exist")
+
+	if not manager.pause_simulation(sim_id):
+		return HttpResponseBackendError(f"Simulation '{sim_id}' is not running")
+
+	return HttpResponse()
+
+@authenticate_view(["GET"])
+def resume_simulation(request):
+	if not "uuid" in request.GET:
+		return HttpResponseBadRequest("No simulation UUID provided")
+
+	sim_id = UUID(request.GET["uuid"])
+
+	if models.lookup_simulation(sim_id) is None:
+		return HttpResponseBackendError(f"Simulation '{sim_id}' does not exist")
+
+	if not manager.resume_simulation(sim_id):
+		return HttpResponseBackendError(f"Simulation '{sim_id}' is not paused")
+
+	return HttpResponse()
+
 @authenticate_view(["GET"])
 def delete_simulation(request):
 	if not "uuid" in request.GET:
@@ -2,13 +2,31 @@ import os
 import json
 import pathlib
 import shutil
+import hashlib
+import threading
+import collections
+
+from saveviewer.frameindex import FrameIndex
+from saveviewer import statistics
 
 from uuid import UUID, uuid4
 
+INDEX_FILE_NAME = "index.json"
+FRAME_INDEX_FILE_NAME = "frames.sqlite3"
+CHECKPOINT_DIR_NAME = "checkpoints"
+STATISTICS_FILE_NAME = "statistics.sqlite3"
+
+# Number of frame index connections that are kept open. Every connection holds a file descriptor
+# and the WAL files of its database, so the least recently used ones are dropped.
+FRAME_INDEX_CACHE_SIZE = 32
+
 class SaveArchiver:
 	def __init__(self):
 		self.archive_root = "./save-archive/"
 		self.sim_data = {}
+		self.frame_data = {}
+		self.frame_indices = collections.OrderedDict()
+		self.frame_index_lock = threading.Lock()
 
 global__archiver = SaveArchiver()
 
@@ -18,7 +36,7 @@ def initialize_save_archiver():
 	# Create the root directory
 	pathlib.Path(global__archiver.archive_root).mkdir(parents=False, exist_ok=True)
 
-def register_simulation(user, sim_title, sim_desc, sim_max_size):
+def register_simulation(user, sim_title, sim_desc, sim_max_size, output_stride=0, output_interval=0.0):
 	# We don't want to import this globally because it causes problems
 	# when the archiver is imported from the simulation instance process
 	from cloudserver.models import SimulationEntry
@@ -28,7 +46,7 @@ def register_simulation(user, sim_title, sim_desc, sim_max_size):
 	sim_uuid = uuid4()
 	save_dir = os.path.join(global__archiver.archive_root, "simulation_" + str(sim_uuid))
 
-	entry = SimulationEntry(owner=user, title=sim_title, description=sim_desc, uuid=sim_uuid, save_location=save_dir, max_cell_count=sim_max_size)
+	entry = SimulationEntry(owner=user, title=sim_title, description=sim_desc, uuid=sim_uuid, save_location=save_dir, max_cell_count=sim_max_size, output_stride=output_stride, output_interval=output_interval)
 	entry.save()
 
 	os.mkdir(save_dir)
@@ -36,6 +54,24 @@ def register_simulation(user, sim_title, sim_desc, sim_max_size):
 
 	return entry
 
+# Adds a simulation that was run outside of the server (e.g. by 'runbatch') to the archive. The
+# directory is copied, so the original can be removed afterwards.
+def import_simulation(user, sim_title, sim_desc, source_dir, sim_max_size=0):
+	from cloudserver.models import SimulationEntry
+
+	global global__archiver
+
+	sim_uuid = uuid4()
+	save_dir = os.path.join(global__archiver.archive_root, "simulation_" + str(sim_uuid))
+
+	shutil.copytree(source_dir, save_dir)
+	pathlib.Path(os.path.join(save_dir, "cache")).mkdir(exist_ok=True)
+
+	entry = SimulationEntry(owner=user, title=sim_title, description=sim_desc, uuid=sim_uuid, save_location=save_dir, max_cell_count=sim_max_size)
+	entry.save()
+
+	return entry
+
 def remove_simulation(sim_uuid):
 	global global__archiver
 
@@ -44,6 +80,10 @@ def remove_simulation(sim_uuid):
 
 	entry.delete()
 
+	global__archiver.sim_data.pop(sim_uuid, None)
+	global__archiver.frame_data.pop(sim_uuid, None)
+
+	__close_frame_index(os.path.join(dir_path, INDEX_FILE_NAME))
 	shutil.rmtree(dir_path)
 
 def update_instance_index(uuid, data):
@@ -53,6 +93,26 @@ def update_instance_index(uuid, data):
 		raise Exception("Instance data must be a dictionary, not a string")
 
 	global__archiver.sim_data[uuid] = data
+	global__archiver.frame_data[uuid] = {}
+
+# Running simulations send the changes to their index instead of the whole index. These functions
+# apply those changes to the in-memory copy of the index.
+def update_instance_index_values(uuid, values):
+	global global__archiver
+
+	index_data = get_instance_index_data(uuid)
+	if index_data is None: return
+
+	index_data.update(values)
+
+def add_frame_to_instance_index(uuid, frame, step_file, viz_file, step, stride):
+	global global__archiver
+
+	index_data = get_instance_index_data(uuid)
+	if index_data is None: return
+
+	global__archiver.frame_data.setdefault(uuid, {})[frame] = (step_file, viz_file, step, stride)
+	index_data["num_frames"] = max(index_data["num_frames"], frame + 1)
 
 def get_instance_index_data(uuid):
 	assert type(uuid) is UUID
@@ -63,10 +123,7 @@ def get_instance_index_data(uuid):
 		sim = __get_simulation(uuid)
 		if sim is None: return None
 
-		index_path = os.path.join(sim.save_location, "index.json")
-
-		with open(index_path, "r") as index_file:
-			index_data = json.loads(index_file.read())
+		index_data = read_index_file(os.path.join(sim.save_location, INDEX_FILE_NAME))
 
 		global__archiver.sim_data[sim.uuid] = index_data
 
@@ -74,24 +131,92 @@ def get_instance_index_data(uuid):
 	else:
 		return global__archiver.sim_data.get(uuid, None)
 
+def __lookup_frame(uuid, index):
+	simulation = __get_simulation(uuid)
+	if simulation is None: return (None, None)
+
+	frame_entry = global__archiver.frame_data.get(uuid, {}).get(int(index), None)
+
+	if frame_entry is None:
+		frame_index = __get_frame_index(os.path.join(simulation.save_location, INDEX_FILE_NAME))
+		frame_entry = frame_index.lookup(int(index))
+
+	return (simulation, frame_entry)
+
 def get_simulation_step_files(uuid, index):
+	simulation, frame_entry = __lookup_frame(uuid, index)
+	if frame_entry is None: return None
+
+	step_frame = os.path.join(simulation.save_location, frame_entry[0])
+	viz_frame = os.path.join(simulation.save_location, frame_entry[1])
+
+	return (step_frame, viz_frame)
+
+# Returns the simulation step a frame was taken at, and the output stride that was used at the time
+def get_simulation_frame_step(uuid, index):
+	_, frame_entry = __lookup_frame(uuid, index)
+	if frame_entry is None: return None
+
+	return (frame_entry[2], frame_entry[3])
+
+# Returns (frame, step_file, viz_file, step, stride) for the frames in [first, first + count) that exist
+def get_simulation_frame_range(uuid, first, count):
+	simulation = __get_simulation(uuid)
+	if simulation is None: return None
+
+	frame_index = __get_frame_index(os.path.join(simulation.save_location, INDEX_FILE_NAME))
+
+	return [
+		(frame, os.path.join(simulation.save_location, step_file), os.path.join(simulation.save_location, viz_file), step, stride)
+		for (frame, step_file, viz_file, step, stride) in frame_index.lookup_range(first, count)
+	]
+
+# Returns the frame range and the aggregate statistics of every frame in it (see statistics.py)
+def get_simulation_frame_statistics(uuid, first, count):
 	simulation = __get_simulation(uuid)
 	if simulation is None: return None
 
+	frames = get_simulation_frame_range(uuid, first, count)
+	frame_statistics = statistics.read_frame_statistics(os.path.join(simulation.save_location, STATISTICS_FILE_NAME), get_simulation_run_generation(uuid), frames)
+
+	return (frames, frame_statistics)
+
+# The run generation identifies the current run of a simulation. Frame numbers start over when the
+# simulation is reloaded or rewound to a checkpoint, so a frame number only refers to the same frame
+# as long as the generation stays the same.
+def get_simulation_run_generation(uuid):
 	index_data = get_instance_index_data(uuid)
-	if index_data["num_frames"] <= int(index): return None
+	if index_data is None: return None
 
-	step_frame = os.path.join(simulation.save_location, index_data["stepframes"][index])
-	viz_frame = os.path.join(simulation.save_location, index_data["vizframes"][index])
+	return index_data.get("run_generation", None)
 
-	return (step_frame, viz_frame)
+# The frame entries are stored in a separate, append-only frame index (see frameindex.py). The
+# index file only contains the simulation's metadata, which rarely changes. 'num_frames' is not
+# stored in the file, it is always read from the frame index.
+def read_index_file(index_path):
+	frame_index = __get_frame_index(index_path)
+
+	with open(index_path, "r") as index_file:
+		index_data = json.loads(index_file.read())
+
+	index_data["num_frames"] = frame_index.frame_count()
+
+	# Simulations from before run generations were added get one the first time they are read
+	if not "run_generation" in index_data:
+		index_data["run_generation"] = __update_sim_index(index_path, __assign_run_generation)
+
+	return index_data
+
+def __new_run_generation():
+	return uuid4().hex
+
+def __assign_run_generation(sim_data):
+	return sim_data.setdefault("run_generation", __new_run_generation())
 
 def write_empty_index_file(path, backend_version):
 	init_index_data = {
-		"vizframes": {},
-		"stepframes": {},
-		"num_frames": 0,
 		"backend_version": backend_version,
+		"run_generation": __new_run_generation(),
 		"shape_list": [],
 		"has_crashed": False,
 		"crash_message": ""
@@ -102,9 +227,118 @@ def write_empty_index_file(path, backend_version):
 	with open(path, "w") as indexfile:
 		indexfile.write(sim_data_str)
 
+	__get_frame_index(path).clear()
+
+	# Checkpoints belong to the previous run of the simulation
+	shutil.rmtree(os.path.join(os.path.dirname(os.path.abspath(path)), CHECKPOINT_DIR_NAME), ignore_errors=True)
+
+	init_index_data["num_frames"] = 0
+
 	return init_index_data
 
+# Closes the frame index of a simulation that won't be accessed by this process anymore
+def release_sim_index(index_path):
+	__close_frame_index(index_path)
+
+def read_sim_frame_count(index_path):
+	return __get_frame_index(index_path).frame_count()
+
+def hash_simulation_source(source):
+	return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+# Returns the latest checkpoint of a simulation, if the simulation can be resumed from it. Simulations
+# that crashed, or whose source or backend changed since the checkpoint was taken, have to start over.
+def get_resumable_checkpoint(index_path, backend_version, source_hash):
+	if not os.path.exists(index_path):
+		return None
+
+	with open(index_path, "r") as index_file:
+		sim_data = json.loads(index_file.read())
+
+	checkpoint = sim_data.get("checkpoint", None)
+
+	if checkpoint is None or sim_data.get("has_crashed", False):
+		return None
+
+	if sim_data.get("backend_version") != backend_version or checkpoint["source_hash"] != source_hash:
+		return None
+
+	if not os.path.exists(os.path.join(os.path.dirname(os.path.abspath(index_path)), checkpoint["file"])):
+		return None
+
+	return checkpoint
+
+# Removes the frames that were written after the checkpoint was taken (they will be written again
+# once the simulation resumes) and returns the index data
+def rewind_index_to_checkpoint(index_path, checkpoint):
+	# The frames after the checkpoint are written again, and they won't necessarily be the same
+	def update_action(sim_data):
+		sim_data["run_generation"] = __new_run_generation()
+
+	__update_sim_index(index_path, update_action)
+	__get_frame_index(index_path).truncate(checkpoint["frame_count"])
+
+	return read_index_file(index_path)
+
+def __get_frame_index(index_path):
+	global global__archiver
+
+	frame_index_path = os.path.join(os.path.dirname(os.path.abspath(index_path)), FRAME_INDEX_FILE_NAME)
+
+	with global__archiver.frame_index_lock:
+		frame_index = global__archiver.frame_indices.get(frame_index_path, None)
+
+		if frame_index is None:
+			frame_index = FrameIndex(frame_index_path)
+			__import_legacy_frames(index_path, frame_index)
+
+			global__archiver.frame_indices[frame_index_path] = frame_index
+
+			# Other threads may still be using an index that is dropped, so it isn't closed here. Its
+			# connection is closed once the last reference to it goes away.
+			while len(global__archiver.frame_indices) > FRAME_INDEX_CACHE_SIZE:
+				global__archiver.frame_indices.popitem(last=False)
+		else:
+			global__archiver.frame_indices.move_to_end(frame_index_path)
+
+	return frame_index
+
+def __close_frame_index(index_path):
+	global global__archiver
+
+	frame_index_path = os.path.join(os.path.dirname(os.path.abspath(index_path)), FRAME_INDEX_FILE_NAME)
+
+	with global__archiver.frame_index_lock:
+		frame_index = global__archiver.frame_indices.pop(frame_index_path, None)
+
+	if not frame_index is None:
+		frame_index.close()
+
+# Older simulations store all of their frames in the index file. They are moved to the frame
+# index the first time the simulation is accessed.
+def __import_legacy_frames(index_path, frame_index):
+	if not os.path.exists(index_path):
+		return
+
+	with open(index_path, "r+") as index_file:
+		sim_data = json.loads(index_file.read())
+
+		if not "stepframes" in sim_data:
+			return
+
+		frame_count = sim_data.get("num_frames", len(sim_data["stepframes"]))
+		frame_index.extend([ (sim_data["stepframes"][str(it)], sim_data["vizframes"][str(it)]) for it in range(frame_count) ])
+
+		for key in [ "stepframes", "vizframes", "num_frames" ]:
+			sim_data.pop(key, None)
+
+		index_file.seek(0)
+		index_file.write(json.dumps(sim_data))
+		index_file.truncate()
+
 def __update_sim_index(index_path, callback):
+	frame_index = __get_frame_index(index_path)
+
 	with open(index_path, "r+") as index_file:
 		sim_data = json.loads(index_file.read())
 		return_value = callback(sim_data)
@@ -114,6 +348,8 @@ def __update_sim_index(index_path, callback):
 		index_file.write(sim_data_str)
 		index_file.truncate()
 
+	sim_data["num_frames"] = frame_index.frame_count()
+
 	return return_value
 
 def write_shapes_to_sim_index(index_path, shape_list):
@@ -124,14 +360,15 @@ def write_shapes_to_sim_index(index_path, shape_list):
 	
 	return __update_sim_index(index_path, update_action)
 
-def write_entry_to_sim_index(index_path, step_file, viz_bin_file):
+def write_entry_to_sim_index(index_path, step_file, viz_bin_file, step=None, stride=None):
+	return __get_frame_index(index_path).append(step_file, viz_bin_file, step, stride)
+
+def write_checkpoint_to_sim_index(index_path, checkpoint):
 	def update_action(sim_data):
-		frame_count = len(sim_data["vizframes"])
-		sim_data["vizframes"][frame_count] = viz_bin_file
-		sim_data["stepframes"][frame_count] = step_file
-		sim_data["num_frames"] = frame_count + 1
+		previous_checkpoint = sim_data.get("checkpoint", None)
+		sim_data["checkpoint"] = checkpoint
 
-		return (sim_data, frame_count)
+		return previous_checkpoint
 
 	return __update_sim_index(index_path, update_action)
 
@@ -0,0 +1,75 @@
+import json
+import zipfile
+
+# Files are copied into the archive in chunks of this size
+EXPORT_CHUNK_SIZE = 1024 * 1024
+
+# Collects the bytes 'ZipFile' writes, so they can be sent as soon as they are written. The stream
+# can't seek, so 'ZipFile' writes the sizes of every file after its data instead of going back
+# to its header.
+class _ChunkStream:
+	def __init__(self):
+		self.chunks = []
+
+	def write(self, data):
+		self.chunks.append(bytes(data))
+		return len(data)
+
+	def flush(self):
+		pass
+
+	# Returns everything written since the last call as a single chunk
+	def take_chunks(self):
+		chunks = self.chunks
+		self.chunks = []
+
+		return [ b"".join(chunks) ] if len(chunks) > 0 else []
+
+def get_export_step_file_name(frame):
+	return f"step-{frame + 1}.cm5_step"
+
+def get_export_viz_file_name(frame):
+	return f"viz/step-{frame + 1}.cm5_viz"
+
+# Generates a ZIP archive of a range of frames, piece by piece. 'frames' are the entries returned
+# by 'archiver.get_simulation_frame_range'. Step and viz files are already compressed, so they are
+# stored as they are. The index lists the exported frames by their names in the archive.
+def generate_frames_zip(frames, include_viz=False, source=None, index_data=None):
+	stream = _ChunkStream()
+
+	with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+		def write_file(name, path):
+			with open(path, "rb") as in_file, archive.open(name, "w") as out_file:
+				while True:
+					data = in_file.read(EXPORT_CHUNK_SIZE)
+					if not data: break
+
+					out_file.write(data)
+
+		if not source is None:
+			archive.writestr("source.py", source, compress_type=zipfile.ZIP_DEFLATED)
+
+		for (frame, step_file, viz_file, _, _) in frames:
+			write_file(get_export_step_file_name(frame), step_file)
+
+			if include_viz:
+				write_file(get_export_viz_file_name(frame), viz_file)
+
+			yield from stream.take_chunks()
+
+		if not index_data is None:
+			export_index = { key: value for (key, value) in index_data.items() if key != "checkpoint" }
+			export_index["frames"] = [
+				{
+					"frame": frame,
+					"step": step,
+					"stride": stride,
+					"step_file": get_export_step_file_name(frame),
+					"viz_file": get_export_viz_file_name(frame) if include_viz else None,
+				}
+				for (frame, _, _, step, stride) in frames
+			]
+
+			archive.writestr("index.json", json.dumps(export_index), compress_type=zipfile.ZIP_DEFLATED)
+
+	yield from stream.take_chunks()
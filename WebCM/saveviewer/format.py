@@ -1,7 +1,30 @@
 import zlib
+import struct
 import msgpack
 import numpy
 
+from collections.abc import Mapping
+
+# Step files start with a small fixed-size prefix (magic, format version, header size), followed
+# by a msgpack header, a sorted cell id -> row index and the cell attributes. Every attribute
+# is stored as a typed column, split into zlib-compressed chunks of 'STEP_CHUNK_ROWS' rows so
+# that a single cell can be decoded without decompressing the whole column.
+# Files written before the columnar layout (version 1) are a single zlib-compressed msgpack
+# object with one dictionary per cell. They don't have a prefix, so they are detected by the
+# missing magic value.
+STEP_FILE_MAGIC = b"CM5STEP\x00"
+STEP_FILE_VERSION = 3
+STEP_FILE_PREFIX = struct.Struct("<8sII")
+STEP_COMPRESSION_LEVEL = 2
+STEP_CHUNK_ROWS = 4096
+
+OBJECT_COLUMN_DTYPE = "msgpack"
+
+PACKED_CELL_ATTRIBUTES = [
+	"id", "position", "direction", "radius", "length", "growth_rate", "cell_age", "eff_growth", "cell_type",
+	"cell_adhesion", "target_volume", "volume", "strain_rate", "start_volume", "species", "signals",
+]
+
 class PackedCell:
 	def __init__(self):
 		self.id = 0
@@ -41,6 +64,27 @@ class PackedCell:
 
 		return dict(filter(lambda val: not val[1] is None, output.items()))
 
+	# Only called when an attribute has not been set on the instance. Cells created with
+	# 'from_columns' don't set any attributes, so they are read from the columns on first access.
+	def __getattr__(self, name):
+		columns = self.__dict__.get("columns")
+
+		if columns is None or not name in PACKED_CELL_ATTRIBUTES:
+			raise AttributeError(f"'PackedCell' object has no attribute '{name}'")
+
+		value = _value_to_python(columns[name][self.row]) if name in columns else None
+		setattr(self, name, value)
+
+		return value
+
+	@staticmethod
+	def from_columns(columns, row):
+		cell = PackedCell.__new__(PackedCell)
+		cell.columns = columns
+		cell.row = row
+
+		return cell
+
 	@staticmethod
 	def from_named_entries(entries):
 		cell = PackedCell()
@@ -131,80 +175,356 @@ def write_states(path, cell_states, id_attribute, attributes_to_pack):
 		out_file.write(buffer)
 
 def write_states_to_buffer(cell_states, id_attribute, attributes_to_pack):
-	key_mappings = { "id": 0 }
-	cell_objects = []
+	return write_columns_to_buffer(gather_state_columns(cell_states, id_attribute, attributes_to_pack))
+
+def write_columns(path, columns):
+	buffer = write_columns_to_buffer(columns)
 
-	for it in cell_states.keys():
-		state = cell_states[it]
-		state_variables = vars(state)
-		state_object = {}
+	with open(path, "wb") as out_file:
+		out_file.write(buffer)
 
-		# Write ID
-		state_object[0] = state_variables[id_attribute]
+# Copies the attributes of every cell into columns. The result does not reference the cell states,
+# so the simulation can keep modifying them while the columns are being compressed and written.
+def gather_state_columns(cell_states, id_attribute, attributes_to_pack):
+	states = list(cell_states.values())
+	columns = { "id": _gather_column(states, id_attribute) }
 
-		# Write customizable attributes
-		for (attr, standard_name) in attributes_to_pack:
-			if not attr in state_variables:
-				continue
+	# Write customizable attributes
+	for (attr, standard_name) in attributes_to_pack:
+		column = _gather_column(states, attr)
+		if column is None:
+			continue
 
-			if not standard_name in key_mappings:
-				# The ID attribute has a key id of zero, so we need to add one to all ids
-				# to prevent collisions
-				key_mappings[standard_name] = len(key_mappings)
+		columns[standard_name] = column
 
-			key_id = key_mappings[standard_name]
-			state_object[key_id] = state_variables[attr]
+	return columns
 
-		cell_objects.append(state_object)
+def write_columns_to_buffer(columns, chunk_rows=STEP_CHUNK_ROWS):
+	ids = numpy.asarray(columns["id"])
+	cell_count = len(ids)
 
-	output_object = { "key_mappings": key_mappings, "states": cell_objects }
+	data_blocks = []
+	data_size = 0
 
-	def default(obj):
-		if isinstance(obj, numpy.float32):
-			return float(obj)
-		elif isinstance(obj, numpy.ndarray):
-			return list(obj)
-		
-		raise TypeError(f"Could not pack type: {type(obj)}")
+	def append_block(block):
+		nonlocal data_size
 
-	packed_data = msgpack.packb(output_object, default=default)
-	return zlib.compress(packed_data, 2)
+		location = [ data_size, len(block) ]
+		data_blocks.append(block)
+		data_size += len(block)
 
+		return location
 
-def __read_state_internal(data_buffer, target_id):
-	# Decompress and unpack the file
-	raw_data = zlib.decompress(data_buffer)
-	unpacked_data = msgpack.unpackb(raw_data, strict_map_key=False)
+	# The sorted id -> row table is stored uncompressed so that it can be searched without
+	# having to decompress anything
+	sort_order = numpy.argsort(ids, kind="stable")
+	index_entry = {
+		"dtype": ids.dtype.str,
+		"ids": append_block(ids[sort_order].tobytes()),
+		"rows": append_block(sort_order.astype(numpy.uint32).tobytes()),
+	}
 
-	# Create reverse key mappings
-	reverse_key_mappings = { value:key for (key, value) in unpacked_data["key_mappings"].items() }
+	column_entries = []
 
-	if target_id is None:
-		unpacked_cells = []
+	for (name, column) in columns.items():
+		if isinstance(column, numpy.ndarray):
+			column = numpy.ascontiguousarray(column)
+			dtype = column.dtype.str
+			shape = list(column.shape[1:])
+		else:
+			# Columns that cannot be stored as a single typed array (e.g. species lists
+			# with different lengths) fall back to msgpack
+			dtype = OBJECT_COLUMN_DTYPE
+			shape = []
+
+		chunks = []
+
+		for chunk_start in range(0, cell_count, chunk_rows):
+			raw_data = _encode_column_chunk(column, chunk_start, min(chunk_start + chunk_rows, cell_count))
+			chunks.append(append_block(zlib.compress(raw_data, STEP_COMPRESSION_LEVEL)))
+
+		column_entries.append({ "name": name, "dtype": dtype, "shape": shape, "chunks": chunks })
+
+	header = msgpack.packb({ "cell_count": cell_count, "chunk_rows": chunk_rows, "index": index_entry, "columns": column_entries })
 
-		for state in unpacked_data["states"]:
-			unpacked_cells.append( PackedCell.from_named_entries({ reverse_key_mappings[key]:value for (key, value) in state.items() }) )
-		
-		return unpacked_cells
+	output = bytearray(STEP_FILE_PREFIX.pack(STEP_FILE_MAGIC, STEP_FILE_VERSION, len(header)))
+	output += header
+
+	for block in data_blocks:
+		output += block
+
+	return bytes(output)
+
+def _encode_column_chunk(column, start, end):
+	if isinstance(column, numpy.ndarray):
+		return column[start:end].tobytes()
 	else:
-		for state in unpacked_data["states"]:
-			if not state[0] == target_id:
-				continue
+		return msgpack.packb(column[start:end], default=_msgpack_default)
 
-			return PackedCell.from_named_entries({ reverse_key_mappings[key]:value for (key, value) in state.items() })
-			
+def _gather_column(states, attr):
+	if len(states) == 0:
+		return numpy.zeros(0, dtype=numpy.int64) if attr == "id" else None
+
+	if not hasattr(states[0], attr):
 		return None
 
+	return _to_column([ getattr(state, attr, None) for state in states ])
+
+def _to_column(values):
+	try:
+		column = numpy.asarray(values)
+	except ValueError:
+		# Ragged nested sequences
+		return [ _value_to_python(value) for value in values ]
+
+	return [ _value_to_python(value) for value in values ] if column.dtype == object else column
+
+def _msgpack_default(obj):
+	if isinstance(obj, numpy.generic):
+		return obj.item()
+	elif isinstance(obj, numpy.ndarray):
+		return obj.tolist()
+
+	raise TypeError(f"Could not pack type: {type(obj)}")
+
+def _value_to_python(value):
+	return value.tolist() if isinstance(value, (numpy.ndarray, numpy.generic)) else value
+
+def columns_to_structured_array(columns):
+	fields = []
+
+	for (name, column) in columns.items():
+		if isinstance(column, numpy.ndarray):
+			fields.append((name, column.dtype, column.shape[1:]))
+		else:
+			fields.append((name, object))
+
+	cell_count = len(next(iter(columns.values()))) if len(columns) > 0 else 0
+	output = numpy.empty(cell_count, dtype=fields)
+
+	for (name, column) in columns.items():
+		if isinstance(column, numpy.ndarray):
+			output[name] = column
+		else:
+			# Assigning the list directly would make NumPy try to broadcast the nested sequences
+			field = output[name]
+
+			for (row, value) in enumerate(column):
+				field[row] = value
+
+	return output
+
+
+def is_legacy_step_buffer(data_buffer):
+	return not bytes(data_buffer[:len(STEP_FILE_MAGIC)]) == STEP_FILE_MAGIC
+
+# Random access reader for step files. It accepts either a bytes-like object or a binary file
+# object. When given a file, only the parts that are needed are read from it, so looking up a
+# single cell reads the header, the id index and one chunk of each column.
+#
+# Legacy (version 1) files don't support random access. They are decoded completely when the
+# reader is created and then exposed through the same interface.
+class StepFileReader:
+	def __init__(self, source):
+		if hasattr(source, "read"):
+			self.file = source
+			self.buffer = None
+		else:
+			self.file = None
+			self.buffer = memoryview(source)
+
+		self.decoded_columns = {}
+		self.sorted_ids = None
+		self.sorted_rows = None
+
+		self.is_legacy = not self._read(0, len(STEP_FILE_MAGIC)) == STEP_FILE_MAGIC
+
+		if self.is_legacy:
+			self._load_legacy()
+		else:
+			self._load_header()
+
+	def _read(self, offset, size=None):
+		if self.file is None:
+			return bytes(self.buffer[offset:] if size is None else self.buffer[offset:offset + size])
+
+		self.file.seek(offset)
+		return self.file.read() if size is None else self.file.read(size)
+
+	def _read_block(self, location):
+		return self._read(self.data_offset + location[0], location[1])
+
+	def _load_header(self):
+		(_, version, header_size) = STEP_FILE_PREFIX.unpack(self._read(0, STEP_FILE_PREFIX.size))
+
+		if version != STEP_FILE_VERSION:
+			raise ValueError(f"Unsupported step file version: {version} (supported version is {STEP_FILE_VERSION})")
+
+		header = msgpack.unpackb(self._read(STEP_FILE_PREFIX.size, header_size))
+
+		self.version = version
+		self.data_offset = STEP_FILE_PREFIX.size + header_size
+		self.cell_count = header["cell_count"]
+		self.column_entries = { entry["name"]: entry for entry in header["columns"] }
+		self.column_names = list(self.column_entries.keys())
+		self.index_entry = header["index"]
+		self.chunk_rows = header["chunk_rows"]
+
+	def _load_legacy(self):
+		# Decompress and unpack the file
+		raw_data = zlib.decompress(self._read(0))
+		unpacked_data = msgpack.unpackb(raw_data, strict_map_key=False)
+		states = unpacked_data["states"]
+
+		self.version = 1
+		self.cell_count = len(states)
+		self.column_names = list(unpacked_data["key_mappings"].keys())
+		self.index_entry = None
+
+		for (name, key_id) in unpacked_data["key_mappings"].items():
+			self.decoded_columns[name] = _to_column([ state.get(key_id) for state in states ])
+
+	def _decode_chunk(self, entry, chunk_index):
+		raw_data = zlib.decompress(self._read_block(entry["chunks"][chunk_index]))
+
+		if entry["dtype"] == OBJECT_COLUMN_DTYPE:
+			return msgpack.unpackb(raw_data)
+
+		# The row count can't be inferred from the data of zero-width columns (e.g. cells without signals)
+		row_count = min(self.chunk_rows, self.cell_count - chunk_index * self.chunk_rows)
+
+		return numpy.frombuffer(raw_data, dtype=numpy.dtype(entry["dtype"])).reshape([ row_count ] + entry["shape"])
+
+	def read_column(self, name):
+		if name in self.decoded_columns:
+			return self.decoded_columns[name]
+
+		entry = self.column_entries[name]
+
+		if entry["dtype"] == OBJECT_COLUMN_DTYPE:
+			column = []
+
+			for chunk_index in range(len(entry["chunks"])):
+				column += self._decode_chunk(entry, chunk_index)
+		else:
+			raw_data = b"".join(zlib.decompress(self._read_block(location)) for location in entry["chunks"])
+			column = numpy.frombuffer(raw_data, dtype=numpy.dtype(entry["dtype"])).reshape([ self.cell_count ] + entry["shape"])
+
+		self.decoded_columns[name] = column
+		return column
+
+	def _load_index(self):
+		if not self.sorted_ids is None:
+			return
+
+		if self.index_entry is None:
+			# Legacy files don't have an index, so we need to build one from the id column
+			ids = numpy.asarray(self.read_column("id"))
+			self.sorted_rows = numpy.argsort(ids, kind="stable")
+			self.sorted_ids = ids[self.sorted_rows]
+		else:
+			self.sorted_ids = numpy.frombuffer(self._read_block(self.index_entry["ids"]), dtype=numpy.dtype(self.index_entry["dtype"]))
+			self.sorted_rows = numpy.frombuffer(self._read_block(self.index_entry["rows"]), dtype=numpy.uint32)
+
+	def find_row(self, cell_id):
+		self._load_index()
+
+		position = numpy.searchsorted(self.sorted_ids, cell_id)
+
+		if position >= len(self.sorted_ids) or not self.sorted_ids[position] == cell_id:
+			return None
+
+		return int(self.sorted_rows[position])
+
+	# Whether the column has a single number per cell, which can be checked without decoding it
+	def is_scalar_number_column(self, name):
+		if name in self.decoded_columns:
+			column = self.decoded_columns[name]
+
+			return isinstance(column, numpy.ndarray) and column.ndim == 1 and column.dtype.kind in "biuf"
+
+		entry = self.column_entries[name]
+
+		return not entry["dtype"] == OBJECT_COLUMN_DTYPE and len(entry["shape"]) == 0 and numpy.dtype(entry["dtype"]).kind in "biuf"
+
+	def read_columns(self, names=None):
+		names = self.column_names if names is None else [ name for name in names if name in self.column_names ]
+
+		return { name: self.read_column(name) for name in names }
+
+	# Only the chunks of the requested columns that contain the row are decompressed
+	def read_row(self, row, names=None):
+		assert 0 <= row < self.cell_count
+
+		names = self.column_names if names is None else [ name for name in names if name in self.column_names ]
+		entries = {}
+
+		for name in names:
+			if name in self.decoded_columns:
+				value = self.decoded_columns[name][row]
+			else:
+				entry = self.column_entries[name]
+				chunk = self._decode_chunk(entry, row // self.chunk_rows)
+				value = chunk[row % self.chunk_rows]
+
+			entries[name] = _value_to_python(value)
+
+		return entries
+
+	def read_cell(self, cell_id):
+		row = self.find_row(cell_id)
+		if row is None: return None
+
+		return PackedCell.from_named_entries(self.read_row(row))
+
+	def read_all_cells(self):
+		columns = StepColumnView(self)
+
+		return [ PackedCell.from_columns(columns, row) for row in range(self.cell_count) ]
+
+# Read-only mapping of column names to columns that only decodes a column when it is first used
+class StepColumnView(Mapping):
+	def __init__(self, reader):
+		self.reader = reader
+
+	def __getitem__(self, name):
+		if not name in self.reader.column_names:
+			raise KeyError(name)
+
+		return self.reader.read_column(name)
+
+	def __contains__(self, name):
+		return name in self.reader.column_names
+
+	def __iter__(self):
+		return iter(self.reader.column_names)
+
+	def __len__(self):
+		return len(self.reader.column_names)
+
+
+def __read_state_internal(source, target_id):
+	reader = StepFileReader(source)
+
+	if target_id is None:
+		return reader.read_all_cells()
+	else:
+		return reader.read_cell(target_id)
 
 def read_state_with_id(path, target_id):
 	assert not target_id is None
 
 	try:
 		with open(path, "rb") as in_file:
-			return __read_state_internal(in_file.read(), target_id)
+			return __read_state_internal(in_file, target_id)
 	except FileNotFoundError as e:
 		return None
 
+def read_state_with_id_from_buffer(data, target_id):
+	assert not target_id is None
+
+	return __read_state_internal(data, target_id)
+
 def read_all_states(path):
 	try:
 		with open(path, "rb") as in_file:
@@ -213,4 +533,22 @@ def read_all_states(path):
 		return None
 	
 def read_all_states_from_buffer(data):
-	return __read_state_internal(data, None)
\ No newline at end of file
+	return __read_state_internal(data, None)
+
+def read_columns(path, names=None):
+	try:
+		with open(path, "rb") as in_file:
+			return StepFileReader(in_file).read_columns(names)
+	except FileNotFoundError as e:
+		return None
+
+def read_columns_from_buffer(data, names=None):
+	return StepFileReader(data).read_columns(names)
+
+def read_structured_states(path, names=None):
+	columns = read_columns(path, names)
+
+	return None if columns is None else columns_to_structured_array(columns)
+
+def read_structured_states_from_buffer(data, names=None):
+	return columns_to_structured_array(read_columns_from_buffer(data, names))
\ No newline at end of file
@@ -0,0 +1,97 @@
+import sqlite3
+import threading
+
+# Append-only table of the step and viz files of every frame in a simulation. It lives in its own
+# SQLite database next to 'index.json', so adding a frame doesn't require rewriting the whole index.
+#
+# The database is written by the simulation process and read by the server at the same time. WAL
+# mode lets the server keep reading while the simulation appends new frames.
+#
+# Simulations don't necessarily write every step, so each frame also stores the simulation step it
+# was taken at (counting from one) and the output stride that was in effect at the time. Frames from
+# older simulations don't have these, they always wrote every step starting with the first one.
+class FrameIndex:
+	def __init__(self, path):
+		self.path = path
+		self.lock = threading.Lock()
+
+		# 'isolation_level=None' puts the connection in autocommit mode, so every statement that is
+		# not inside an explicit transaction is committed immediately
+		self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+		self.connection.execute("PRAGMA journal_mode=WAL")
+		self.connection.execute("PRAGMA synchronous=NORMAL")
+		self.connection.execute("CREATE TABLE IF NOT EXISTS frames (frame INTEGER PRIMARY KEY, step_file TEXT NOT NULL, viz_file TEXT NOT NULL, step INTEGER, stride INTEGER)")
+		self.upgrade_schema()
+
+	# Databases created before the step columns were added need to be upgraded. Both the server and the
+	# simulation may open the database at the same time, so the check is done inside a write transaction.
+	def upgrade_schema(self):
+		self.connection.execute("BEGIN IMMEDIATE")
+
+		try:
+			columns = [ row[1] for row in self.connection.execute("PRAGMA table_info(frames)") ]
+
+			for column in [ "step", "stride" ]:
+				if not column in columns:
+					self.connection.execute(f"ALTER TABLE frames ADD COLUMN {column} INTEGER")
+		except:
+			self.connection.execute("ROLLBACK")
+			raise
+
+		self.connection.execute("COMMIT")
+
+	def append(self, step_file, viz_file, step=None, stride=None):
+		with self.lock:
+			cursor = self.connection.execute(
+				"INSERT INTO frames (frame, step_file, viz_file, step, stride) VALUES ((SELECT COALESCE(MAX(frame) + 1, 0) FROM frames), ?, ?, ?, ?)",
+				(step_file, viz_file, step, stride)
+			)
+
+			return cursor.lastrowid
+
+	def extend(self, entries):
+		with self.lock:
+			self.connection.execute("BEGIN IMMEDIATE")
+
+			try:
+				first_frame = self.connection.execute("SELECT COALESCE(MAX(frame) + 1, 0) FROM frames").fetchone()[0]
+
+				self.connection.executemany(
+					"INSERT INTO frames (frame, step_file, viz_file) VALUES (?, ?, ?)",
+					((first_frame + offset, step_file, viz_file) for (offset, (step_file, viz_file)) in enumerate(entries))
+				)
+			except:
+				self.connection.execute("ROLLBACK")
+				raise
+
+			self.connection.execute("COMMIT")
+
+	# Returns (step_file, viz_file, step, stride)
+	def lookup(self, frame):
+		with self.lock:
+			return self.connection.execute("SELECT step_file, viz_file, COALESCE(step, frame + 1), COALESCE(stride, 1) FROM frames WHERE frame = ?", (frame,)).fetchone()
+
+	# Returns (frame, step_file, viz_file, step, stride) for every frame in [first, first + count)
+	def lookup_range(self, first, count):
+		with self.lock:
+			return self.connection.execute(
+				"SELECT frame, step_file, viz_file, COALESCE(step, frame + 1), COALESCE(stride, 1) FROM frames WHERE frame >= ? AND frame < ? ORDER BY frame",
+				(first, first + count)
+			).fetchall()
+
+	def frame_count(self):
+		with self.lock:
+			return self.connection.execute("SELECT COALESCE(MAX(frame) + 1, 0) FROM frames").fetchone()[0]
+
+	def clear(self):
+		with self.lock:
+			self.connection.execute("DELETE FROM frames")
+
+	# Removes every frame from 'frame_count' onwards
+	def truncate(self, frame_count):
+		with self.lock:
+			self.connection.execute("DELETE FROM frames WHERE frame >= ?", (frame_count,))
+
+	def close(self):
+		with self.lock:
+			self.connection.close()
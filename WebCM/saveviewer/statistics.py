@@ -0,0 +1,120 @@
+import json
+import numpy
+import sqlite3
+
+from saveviewer.format import StepFileReader
+from saveviewer.workers import map_frames
+
+# Aggregates of every numeric cell attribute in a frame, for all cells and for the cells of each
+# cell type:
+#
+#	{
+#		"groups": {
+#			"all": { "count": 120, "attributes": { "volume": { "mean", "min", "max", "quantiles", "histogram", "non_finite" }, ... } },
+#			"0": { ... },
+#		},
+#		"histogram_edges": { "volume": [ ... ], ... }
+#	}
+#
+# Histograms of the same attribute use the same bins in every group, so they can be compared.
+# NaN and infinite values (e.g. from a diverged simulation) are left out of the aggregates, and
+# 'non_finite' counts how many there were.
+STATISTICS_QUANTILES = [ 0.05, 0.25, 0.5, 0.75, 0.95 ]
+STATISTICS_HISTOGRAM_BINS = 20
+
+# Cached statistics with an older version are computed again
+STATISTICS_VERSION = 2
+
+# Attributes that are not aggregated ('cell_type' is used to group the cells)
+STATISTICS_EXCLUDED_ATTRIBUTES = [ "id", "cell_type" ]
+
+def __summarize_values(values, edges):
+	finite_values = values[numpy.isfinite(values)]
+	non_finite_count = len(values) - len(finite_values)
+
+	if len(finite_values) == 0:
+		return { "mean": None, "min": None, "max": None, "quantiles": [ None for _ in STATISTICS_QUANTILES ], "histogram": [ 0 ] * STATISTICS_HISTOGRAM_BINS, "non_finite": non_finite_count }
+
+	return {
+		"mean": float(numpy.mean(finite_values)),
+		"min": float(numpy.min(finite_values)),
+		"max": float(numpy.max(finite_values)),
+		"quantiles": numpy.quantile(finite_values, STATISTICS_QUANTILES).tolist(),
+		"histogram": numpy.histogram(finite_values, bins=edges)[0].tolist(),
+		"non_finite": non_finite_count,
+	}
+
+def compute_frame_statistics(step_file):
+	try:
+		with open(step_file, "rb") as in_file:
+			reader = StepFileReader(in_file)
+
+			names = [ name for name in reader.column_names if not name in STATISTICS_EXCLUDED_ATTRIBUTES and reader.is_scalar_number_column(name) ]
+			columns = { name: numpy.asarray(reader.read_column(name), dtype=numpy.float64) for name in names }
+
+			cell_types = numpy.asarray(reader.read_column("cell_type")) if "cell_type" in reader.column_names else None
+	except FileNotFoundError:
+		return None
+
+	histogram_edges = {}
+
+	for (name, values) in columns.items():
+		finite_values = values[numpy.isfinite(values)]
+
+		(low, high) = (float(numpy.min(finite_values)), float(numpy.max(finite_values))) if len(finite_values) > 0 else (0.0, 1.0)
+		histogram_edges[name] = numpy.histogram_bin_edges(finite_values, bins=STATISTICS_HISTOGRAM_BINS, range=(low, high)).tolist()
+
+	def summarize_group(mask):
+		return {
+			"count": int(numpy.count_nonzero(mask)) if not mask is None else reader.cell_count,
+			"attributes": { name: __summarize_values(values if mask is None else values[mask], histogram_edges[name]) for (name, values) in columns.items() },
+		}
+
+	groups = { "all": summarize_group(None) }
+
+	if not cell_types is None and cell_types.ndim == 1:
+		for cell_type in numpy.unique(cell_types):
+			groups[str(cell_type.item())] = summarize_group(cell_types == cell_type)
+
+	return { "groups": groups, "histogram_edges": histogram_edges }
+
+# Statistics are cached in a SQLite database next to the frame index. Each entry is tagged with the run
+# generation of the simulation, so the statistics of a previous run are never returned.
+def __open_statistics_cache(cache_path):
+	connection = sqlite3.connect(cache_path, timeout=10.0, isolation_level=None)
+	connection.execute("PRAGMA journal_mode=WAL")
+	connection.execute("CREATE TABLE IF NOT EXISTS statistics (frame INTEGER PRIMARY KEY, generation TEXT NOT NULL, version INTEGER NOT NULL, data TEXT NOT NULL)")
+
+	return connection
+
+# Returns the statistics of every frame (or None if its step file is missing). 'frames' are the entries
+# returned by 'archiver.get_simulation_frame_range'. Frames that are not in the cache are computed in
+# parallel and added to it.
+def read_frame_statistics(cache_path, generation, frames):
+	if len(frames) == 0:
+		return []
+
+	connection = __open_statistics_cache(cache_path)
+
+	try:
+		rows = connection.execute(
+			"SELECT frame, data FROM statistics WHERE frame >= ? AND frame <= ? AND generation = ? AND version = ?",
+			(frames[0][0], frames[-1][0], generation, STATISTICS_VERSION)
+		).fetchall()
+
+		statistics = { frame: json.loads(data) for (frame, data) in rows }
+
+		missing_frames = [ entry for entry in frames if not entry[0] in statistics ]
+		computed = map_frames(lambda entry: compute_frame_statistics(entry[1]), missing_frames)
+
+		new_rows = [ (entry[0], generation, STATISTICS_VERSION, json.dumps(frame_statistics)) for (entry, frame_statistics) in zip(missing_frames, computed) if not frame_statistics is None ]
+
+		if len(new_rows) > 0:
+			connection.executemany("INSERT OR REPLACE INTO statistics (frame, generation, version, data) VALUES (?, ?, ?, ?)", new_rows)
+
+		for (entry, frame_statistics) in zip(missing_frames, computed):
+			statistics[entry[0]] = frame_statistics
+	finally:
+		connection.close()
+
+	return [ statistics.get(entry[0]) for entry in frames ]
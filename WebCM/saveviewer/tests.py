@@ -0,0 +1,235 @@
+import os
+import json
+import zlib
+import numpy
+import shutil
+import msgpack
+import tempfile
+import unittest
+
+from saveviewer import archiver
+from saveviewer import format as sv_format
+from saveviewer.frameindex import FrameIndex
+
+# A cell from a model without signals or species, which is the usual case
+class _TestCellState:
+	def __init__(self, id):
+		self.id = id
+		self.volume = 1.0 + id
+		self.cellType = id % 2
+		self.signals = []
+		self.species = []
+
+TEST_ATTRIBUTES_TO_PACK = [ ("volume", "volume"), ("cellType", "cell_type"), ("signals", "signals"), ("species", "species") ]
+
+def create_test_states(cell_count):
+	return { id: _TestCellState(id) for id in range(cell_count) }
+
+class StepFileTests(unittest.TestCase):
+	def test_round_trip_without_signals(self):
+		# More cells than fit in a single chunk, so the last chunk is partial
+		cell_count = sv_format.STEP_CHUNK_ROWS + 10
+		data = sv_format.write_states_to_buffer(create_test_states(cell_count), "id", TEST_ATTRIBUTES_TO_PACK)
+
+		for cell_id in [ 0, sv_format.STEP_CHUNK_ROWS - 1, sv_format.STEP_CHUNK_ROWS, cell_count - 1 ]:
+			cell = sv_format.read_state_with_id_from_buffer(data, cell_id)
+
+			self.assertEqual(cell.id, cell_id)
+			self.assertEqual(cell.volume, 1.0 + cell_id)
+			self.assertEqual(list(cell.signals), [])
+			self.assertEqual(list(cell.species), [])
+
+		columns = sv_format.read_columns_from_buffer(data)
+
+		self.assertEqual(columns["signals"].shape, (cell_count, 0))
+		self.assertEqual(len(sv_format.read_all_states_from_buffer(data)), cell_count)
+
+	def test_unknown_version(self):
+		data = bytearray(sv_format.write_states_to_buffer(create_test_states(4), "id", TEST_ATTRIBUTES_TO_PACK))
+
+		for version in [ 2, sv_format.STEP_FILE_VERSION + 1 ]:
+			data[:sv_format.STEP_FILE_PREFIX.size] = sv_format.STEP_FILE_PREFIX.pack(sv_format.STEP_FILE_MAGIC, version, sv_format.STEP_FILE_PREFIX.unpack_from(data)[2])
+
+			with self.assertRaises(ValueError):
+				sv_format.StepFileReader(bytes(data))
+
+class StructuredStatesTests(unittest.TestCase):
+	def create_columns(self):
+		return {
+			"id": numpy.array([ 7, 3, 5 ]),
+			"position": numpy.array([ [ 0.0, 1.0, 2.0 ], [ 3.0, 4.0, 5.0 ], [ 6.0, 7.0, 8.0 ] ]),
+			"volume": numpy.array([ 1.5, 2.5, 3.5 ]),
+			# Different lengths can't be stored as a typed column
+			"species": [ [ 1.0 ], [], [ 2.0, 3.0 ] ],
+		}
+
+	def test_columns_to_structured_array(self):
+		data = sv_format.write_columns_to_buffer(self.create_columns())
+		states = sv_format.read_structured_states_from_buffer(data)
+
+		self.assertEqual(states.dtype.names, ("id", "position", "volume", "species"))
+		self.assertEqual(states["position"].shape, (3, 3))
+		self.assertEqual(list(states["id"]), [ 7, 3, 5 ])
+		self.assertEqual(list(states["position"][1]), [ 3.0, 4.0, 5.0 ])
+		self.assertEqual(list(states["species"][2]), [ 2.0, 3.0 ])
+
+		states = sv_format.read_structured_states_from_buffer(data, [ "volume", "missing" ])
+
+		self.assertEqual(states.dtype.names, ("volume",))
+		self.assertEqual(list(states["volume"]), [ 1.5, 2.5, 3.5 ])
+
+	def test_legacy_file(self):
+		# Legacy files map every attribute to a small key to keep the cell dictionaries short
+		key_mappings = { "id": 0, "position": 1, "volume": 2, "species": 3 }
+		columns = self.create_columns()
+
+		states = [ { key_id: sv_format._value_to_python(columns[name][row]) for (name, key_id) in key_mappings.items() } for row in range(3) ]
+		data = zlib.compress(msgpack.packb({ "states": states, "key_mappings": key_mappings }))
+
+		self.assertTrue(sv_format.is_legacy_step_buffer(data))
+
+		structured_states = sv_format.read_structured_states_from_buffer(data)
+
+		self.assertEqual(list(structured_states["id"]), [ 7, 3, 5 ])
+		self.assertEqual(list(structured_states["volume"]), [ 1.5, 2.5, 3.5 ])
+		self.assertEqual(list(structured_states["position"][2]), [ 6.0, 7.0, 8.0 ])
+		self.assertEqual(sv_format.read_state_with_id_from_buffer(data, 3).volume, 2.5)
+
+class FrameIndexTests(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.index_path = os.path.join(self.directory, archiver.INDEX_FILE_NAME)
+
+	def tearDown(self):
+		archiver.release_sim_index(self.index_path)
+		shutil.rmtree(self.directory)
+
+	def test_append_and_lookup(self):
+		frame_index = FrameIndex(os.path.join(self.directory, archiver.FRAME_INDEX_FILE_NAME))
+
+		self.assertEqual(frame_index.append("step-1", "viz-1", 1, 2), 0)
+		self.assertEqual(frame_index.append("step-3", "viz-3", 3, 2), 1)
+
+		# Frames from before steps were recorded
+		frame_index.extend([ ("step-4", "viz-4"), ("step-5", "viz-5") ])
+
+		self.assertEqual(frame_index.frame_count(), 4)
+		self.assertEqual(frame_index.lookup(1), ("step-3", "viz-3", 3, 2))
+		self.assertEqual(frame_index.lookup(3), ("step-5", "viz-5", 4, 1))
+		self.assertIsNone(frame_index.lookup(4))
+
+		self.assertEqual([ entry[0] for entry in frame_index.lookup_range(1, 10) ], [ 1, 2, 3 ])
+
+		frame_index.truncate(1)
+		self.assertEqual(frame_index.frame_count(), 1)
+		self.assertEqual(frame_index.append("step-2", "viz-2", 2, 1), 1)
+
+		frame_index.clear()
+		self.assertEqual(frame_index.frame_count(), 0)
+
+		frame_index.close()
+
+	def test_import_legacy_index(self):
+		with open(self.index_path, "w") as index_file:
+			index_file.write(json.dumps({
+				"backend_version": "CellModeller4",
+				"num_frames": 2,
+				"stepframes": { "0": "./step-00001.cm5_step", "1": "./step-00002.cm5_step", "2": "./step-00003.cm5_step" },
+				"vizframes": { "0": "cache/step-00001.cm5_viz", "1": "cache/step-00002.cm5_viz", "2": "cache/step-00003.cm5_viz" },
+			}))
+
+		index_data = archiver.read_index_file(self.index_path)
+
+		# Only the frames up to 'num_frames' were complete
+		self.assertEqual(index_data["num_frames"], 2)
+		self.assertFalse("stepframes" in index_data)
+
+		with open(self.index_path, "r") as index_file:
+			sim_data = json.loads(index_file.read())
+
+		self.assertFalse("stepframes" in sim_data or "vizframes" in sim_data)
+		self.assertEqual(sim_data["run_generation"], index_data["run_generation"])
+
+		frame_index = FrameIndex(os.path.join(self.directory, archiver.FRAME_INDEX_FILE_NAME))
+		self.assertEqual(frame_index.lookup(1), ("./step-00002.cm5_step", "cache/step-00002.cm5_viz", 2, 1))
+		frame_index.close()
+
+		# Reading it again doesn't import the frames twice
+		self.assertEqual(archiver.read_index_file(self.index_path)["num_frames"], 2)
+
+	def test_cached_indices_are_bounded(self):
+		directories = [ os.path.join(self.directory, str(it)) for it in range(archiver.FRAME_INDEX_CACHE_SIZE + 2) ]
+
+		for directory in directories:
+			os.mkdir(directory)
+			archiver.write_entry_to_sim_index(os.path.join(directory, archiver.INDEX_FILE_NAME), "step", "viz")
+
+		cached_paths = list(archiver.global__archiver.frame_indices.keys())
+
+		self.assertLessEqual(len(cached_paths), archiver.FRAME_INDEX_CACHE_SIZE)
+		self.assertFalse(os.path.join(os.path.abspath(directories[0]), archiver.FRAME_INDEX_FILE_NAME) in cached_paths)
+
+		for directory in directories:
+			archiver.release_sim_index(os.path.join(directory, archiver.INDEX_FILE_NAME))
+
+class CellTrajectoryTests(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_trajectory_without_signals(self):
+		from saveviewer import trajectory
+
+		frames = []
+
+		for frame in range(3):
+			path = os.path.join(self.directory, f"step-{frame}.cm5_step")
+			sv_format.write_states(path, create_test_states(4 + frame), "id", TEST_ATTRIBUTES_TO_PACK)
+
+			frames.append((frame, path, None, frame, 1))
+
+		result = trajectory.read_cell_trajectory(frames, 5)
+
+		self.assertEqual(result["present"], [ False, False, True ])
+		self.assertEqual(result["attributes"]["signals"], [ None, None, [] ])
+		self.assertEqual(result["attributes"]["volume"], [ None, None, 6.0 ])
+
+		result = trajectory.read_cell_trajectory(frames, 1, [ "signals", "species" ])
+
+		self.assertEqual(result["attributes"], { "signals": [ [], [], [] ], "species": [ [], [], [] ] })
+
+class FrameStatisticsTests(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_non_finite_values(self):
+		from saveviewer import statistics
+
+		path = os.path.join(self.directory, "step-0.cm5_step")
+		sv_format.write_columns(path, {
+			"id": numpy.arange(6),
+			"cell_type": numpy.array([ 0, 0, 0, 1, 1, 1 ]),
+			"growth_rate": numpy.array([ 1.0, 2.0, numpy.nan, numpy.inf, -numpy.inf, numpy.nan ]),
+			"volume": numpy.array([ 1.0, 2.0, 3.0, 4.0, 5.0, 6.0 ]),
+		})
+
+		frame_statistics = statistics.read_frame_statistics(os.path.join(self.directory, "statistics.sqlite3"), "generation", [ (0, path, None, 0, 1) ])[0]
+
+		# Must be valid JSON (no NaN or Infinity)
+		json.loads(json.dumps(frame_statistics), parse_constant=lambda constant: self.fail(f"Statistics contain {constant}"))
+
+		growth_rate = frame_statistics["groups"]["all"]["attributes"]["growth_rate"]
+		self.assertEqual(growth_rate["non_finite"], 4)
+		self.assertEqual(growth_rate["mean"], 1.5)
+		self.assertEqual(sum(growth_rate["histogram"]), 2)
+
+		growth_rate = frame_statistics["groups"]["1"]["attributes"]["growth_rate"]
+		self.assertEqual(growth_rate["non_finite"], 3)
+		self.assertIsNone(growth_rate["mean"])
+
+		self.assertEqual(frame_statistics["groups"]["1"]["attributes"]["volume"]["mean"], 5.0)
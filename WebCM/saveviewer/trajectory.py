@@ -0,0 +1,42 @@
+from saveviewer.format import StepFileReader
+from saveviewer.workers import map_frames
+
+# Looks up the cell in the id index of the step file, and only decodes the chunks that contain
+# its row. Returns None if the cell is not in the frame.
+def __read_cell_attributes(step_file, cell_id, attributes):
+	try:
+		with open(step_file, "rb") as in_file:
+			reader = StepFileReader(in_file)
+
+			row = reader.find_row(cell_id)
+			if row is None: return None
+
+			return reader.read_row(row, attributes)
+	except FileNotFoundError:
+		return None
+
+# Reads the attributes of a single cell in every frame. 'frames' are the entries returned by
+# 'archiver.get_simulation_frame_range'. Returns the time series as columns:
+#
+#	frames, steps: the frame index and simulation step of every frame
+#	present: whether the cell exists in the frame
+#	attributes: maps every attribute to its value in every frame (None where the cell doesn't exist)
+#
+# If 'attributes' is None, every attribute of the cell is returned.
+def read_cell_trajectory(frames, cell_id, attributes=None):
+	results = map_frames(lambda entry: __read_cell_attributes(entry[1], cell_id, attributes), frames)
+
+	if attributes is None:
+		attributes = []
+
+		for cell in results:
+			if cell is None: continue
+
+			attributes += [ name for name in cell.keys() if not name in attributes ]
+
+	return {
+		"frames": [ entry[0] for entry in frames ],
+		"steps": [ entry[3] for entry in frames ],
+		"present": [ not cell is None for cell in results ],
+		"attributes": { name: [ None if cell is None else cell.get(name) for cell in results ] for name in attributes },
+	}
@@ -0,0 +1,25 @@
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of threads that read frames for the API (trajectories, statistics). Most of the time is spent
+# reading and decompressing chunks, which releases the GIL.
+FRAME_WORKER_COUNT = min(8, os.cpu_count() or 1)
+
+global__frame_executor = None
+global__frame_executor_lock = threading.Lock()
+
+def __get_frame_executor():
+	global global__frame_executor
+	global global__frame_executor_lock
+
+	with global__frame_executor_lock:
+		if global__frame_executor is None:
+			global__frame_executor = ThreadPoolExecutor(max_workers=FRAME_WORKER_COUNT, thread_name_prefix="frame-reader")
+
+		return global__frame_executor
+
+# Calls 'function' on every frame entry in parallel, and returns the results in the same order
+def map_frames(function, frames):
+	return list(__get_frame_executor().map(function, frames))
@@ -11,6 +11,36 @@ class BackendParameters:
 		self.cache_dir = None
 		self.cache_relative_prefix = None
 
+# Data for a single frame, captured from the simulation right after a step. Writing a frame may
+# happen on a different thread while the simulation is already taking the next step, so frames
+# must not reference any state that the simulation modifies.
+class StepFrame:
+	# The compressed contents of the viz file, if the frame keeps them after writing it
+	viz_data = None
+
+	# Called with the compressed viz data as soon as it is ready, before any file is written, so the
+	# frame can be published to live viewers without waiting for the disk
+	viz_data_callback = None
+
+	def publish_viz_data(self, viz_data):
+		self.viz_data = viz_data
+
+		if not self.viz_data_callback is None:
+			self.viz_data_callback(viz_data)
+
+	# Writes the step and viz files and returns their paths, relative to the simulation directory
+	def write(self):
+		raise NotImplementedError()
+
+# Used by backends that cannot separate capturing a frame from writing it
+class WrittenStepFrame(StepFrame):
+	def __init__(self, step_path, viz_path):
+		self.step_path = step_path
+		self.viz_path = viz_path
+
+	def write(self):
+		return self.step_path, self.viz_path
+
 class SimulationBackend:
 	STEP_COMPRESSION_LEVEL_ZLIB = 2
 
@@ -37,9 +67,32 @@ class SimulationBackend:
 	def get_signals_grid(self):
 		return None
 
+	# The number of steps between frames requested by the model itself, or None if the model
+	# doesn't specify one
+	def get_model_output_stride(self):
+		return None
+
 	def write_step_pickle(self):
 		return ""
 
+	def write_step_files(self):
+		raise NotImplementedError()
+
+	def capture_step_frame(self):
+		return WrittenStepFrame(*self.write_step_files())
+
+	# Checkpoints contain the full state of the simulation, so that it can be resumed later (e.g.
+	# after the server restarts). They are only taken if the backend supports them.
+	def supports_checkpoints(self):
+		return False
+
+	def write_checkpoint(self, path):
+		raise NotImplementedError()
+
+	# Called after 'initialize', instead of starting the simulation from the first step
+	def restore_checkpoint(self, path):
+		raise NotImplementedError()
+
 	def compress_step(self, data):
 		return zlib.compress(data, self.STEP_COMPRESSION_LEVEL_ZLIB)
 
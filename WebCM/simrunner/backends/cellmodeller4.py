@@ -1,14 +1,47 @@
-from .backend import SimulationBackend
+from .backend import SimulationBackend, StepFrame
 
 from saveviewer import format as svformat
 
 import io
 import os
+import pickle
+import hashlib
 import struct
 import inspect
+import operator
+import itertools
+import numpy
 
 import importlib
 
+STEP_ATTRIBUTES_TO_PACK = [
+	("pos", "position"),
+	("dir", "direction"),
+	("radius", "radius"),
+	("length", "length"),
+	("growthRate", "growth_rate"),
+	("cellAge", "cell_age"),
+	("effGrowth", "eff_growth"),
+	("cellType", "cell_type"),
+	("cellAdh", "cell_adhesion"),
+	("targetVol", "target_volume"),
+	("volume", "volume"),
+	("strainRate", "strain_rate"),
+	("startVol", "start_volume"),
+	("species", "species"),
+	("signals", "signals"),
+]
+
+# Per-cell layout of the viz frame. This has to match what 'pushFrameData' in viewer-render.js expects.
+# Positions and directions are stored as (x, z, y) because the viewer uses Y as the up axis.
+VIZ_CELL_DTYPE = numpy.dtype([
+	("position", "<f4", (3,)),
+	("direction", "<f4", (3,)),
+	("length", "<f4"),
+	("radius", "<f4"),
+	("color", "<u4"),
+])
+
 def pack_norm_color(red, green, blue, alpha=1.0):
 	color_r = max(min(int(255.0 * red), 255), 0)
 	color_g = max(min(int(255.0 * green), 255), 0)
@@ -16,6 +49,110 @@ def pack_norm_color(red, green, blue, alpha=1.0):
 	color_a = max(min(int(255.0 * alpha), 255), 0)
 	return (color_a << 24) | (color_b << 16) | (color_g << 8) | color_r
 
+# Vectorized version of 'pack_norm_color'. 'colors' is an array of shape (..., 4) with RGBA values
+def pack_norm_colors(colors):
+	channels = numpy.clip(numpy.trunc(255.0 * numpy.asarray(colors, dtype=numpy.float64)), 0, 255).astype(numpy.uint32)
+	return (channels[..., 3] << 24) | (channels[..., 2] << 16) | (channels[..., 1] << 8) | channels[..., 0]
+
+def pack_viz_cell_data(cell_states):
+	states = list(cell_states.values())
+	cell_count = len(states)
+
+	cell_data = numpy.empty(cell_count, dtype=VIZ_CELL_DTYPE)
+	cell_ids = numpy.empty(cell_count, dtype="<u8")
+
+	if cell_count == 0:
+		return cell_data, cell_ids
+
+	positions = _gather_vectors(states, "pos", 3)
+	directions = _gather_vectors(states, "dir", 3)
+	lengths = numpy.fromiter((state.length for state in states), dtype=numpy.float64, count=cell_count)
+	radii = numpy.fromiter((state.radius for state in states), dtype=numpy.float64, count=cell_count)
+
+	colors = numpy.ones((cell_count, 4), dtype=numpy.float64)
+	colors[:, :3] = _gather_vectors(states, "color", 3)
+
+	cell_data["position"] = positions[:, [ 0, 2, 1 ]]
+	cell_data["direction"] = directions[:, [ 0, 2, 1 ]]
+
+	# The length is computed differenty in CellModeller4 and CellModeller5. The front-end 
+	# expects that the length will be calculated based on how its done in CM5.
+	cell_data["length"] = numpy.maximum(lengths + 1.0 - 2.0 * radii, 0)
+	cell_data["radius"] = radii
+	cell_data["color"] = pack_norm_colors(colors)
+
+	cell_ids[:] = numpy.fromiter((int(state.id) for state in states), dtype=numpy.uint64, count=cell_count)
+
+	return cell_data, cell_ids
+
+# Converts a signals grid to the packed RGBA colors the viewer expects. The output is ordered with
+# the Y axis of the simulation first and the X axis last (i.e. voxels[x][z][y] for z, y, x)
+def pack_signal_voxels(voxels, cell_count):
+	densities = numpy.asarray(voxels, dtype=numpy.float64)[:cell_count[0], :cell_count[1], :cell_count[2]]
+	densities = numpy.clip(numpy.trunc(255.0 * densities), 0, 255).astype(numpy.uint32)
+
+	# Red and alpha both store the density
+	colors = (densities << 24) | densities
+
+	return numpy.ascontiguousarray(colors.transpose(1, 2, 0), dtype="<u4")
+
+# Gathers the first 'width' components of a per-cell vector attribute into an (N, width) array
+def _gather_vectors(states, attr, width):
+	get_attr = operator.attrgetter(attr)
+	values = itertools.chain.from_iterable(get_attr(state)[:width] for state in states)
+
+	return numpy.fromiter(values, dtype=numpy.float64, count=width * len(states)).reshape(-1, width)
+
+class CellModeller4StepFrame(StepFrame):
+	def __init__(self):
+		self.step_path = None
+		self.viz_bin_path = None
+		self.step_file_relative = None
+		self.cached_file_relative = None
+		self.compress = None
+
+		self.state_columns = None
+		self.cell_data = None
+		self.cell_ids = None
+		self.signals = None
+
+	def _pack_viz_frame(self):
+		byte_buffer = io.BytesIO()
+
+		# Write cell data and cell IDs
+		byte_buffer.write(struct.pack("<i", len(self.cell_data)))
+		byte_buffer.write(self.cell_data)
+		byte_buffer.write(self.cell_ids)
+
+		# Write signals 
+		if self.signals:
+			(origin, cell_size, cell_count, colors) = self.signals
+
+			byte_buffer.write(struct.pack("<?", True))
+
+			byte_buffer.write(struct.pack("<fff", *origin))
+			byte_buffer.write(struct.pack("<fff", *cell_size))
+			byte_buffer.write(struct.pack("<iii", *cell_count))
+
+			byte_buffer.write(colors)
+		else:
+			byte_buffer.write(struct.pack("<?", False))
+
+		return self.compress(byte_buffer.getbuffer())
+
+	def write(self):
+		# The viz data is what live viewers are waiting for, so it is published before anything is written
+		self.publish_viz_data(self._pack_viz_frame())
+
+		# Write step file
+		svformat.write_columns(self.step_path, self.state_columns)
+
+		# Write binary file
+		with open(self.viz_bin_path, "wb") as out_file:
+			out_file.write(self.viz_data)
+
+		return self.step_file_relative, self.cached_file_relative
+
 class CellModeller4Backend(SimulationBackend):
 	def __init__(self, params):
 		super().__init__(params)
@@ -24,6 +161,11 @@ class CellModeller4Backend(SimulationBackend):
 		self.simulation = None
 		self.sim_module = None
 		self.render_module = None
+
+		# The signals grid often doesn't change between frames, so we keep a digest of the
+		# last grid and reuse its packed colors if it stays the same
+		self.last_signal_digest = None
+		self.last_signal_colors = None
 	
 	def initialize(self):
 		# We cannot import CellModeller the traditional way because we want the users to be able to run
@@ -71,93 +213,89 @@ class CellModeller4Backend(SimulationBackend):
 
 		return None if not renderer else renderer.getSignalsGrid()
 
-	def _write_step_frame(self, path):
-		ATTRIBUTES_TO_PACK = [
-			("pos", "position"),
-			("dir", "direction"),
-			("radius", "radius"),
-			("length", "length"),
-			("growthRate", "growth_rate"),
-			("cellAge", "cell_age"),
-			("effGrowth", "eff_growth"),
-			("cellType", "cell_type"),
-			("cellAdh", "cell_adhesion"),
-			("targetVol", "target_volume"),
-			("volume", "volume"),
-			("strainRate", "strain_rate"),
-			("startVol", "start_volume"),
-			("species", "species"),
-			("signals", "signals"),
-		]
-
-		svformat.write_states(path, self.simulation.cellStates, "id", ATTRIBUTES_TO_PACK)
-
-	def _write_viz_frame(self, path):
-		cell_states = self.simulation.cellStates
+	def get_model_output_stride(self):
+		# CellModeller models can set 'sim.pickleSteps' in their setup function. Every simulator has this
+		# attribute, so we only treat it as requested by the model if it differs from the default value.
+		pickle_steps = getattr(self.simulation, "pickleSteps", None)
+		if pickle_steps is None: return None
 
-		byte_buffer = io.BytesIO()
+		default_parameter = inspect.signature(self.sim_module.Simulator.__init__).parameters.get("pickleSteps", None)
 
-		# Write cell data
-		byte_buffer.write(struct.pack("<i", len(cell_states)))
+		if not default_parameter is None and default_parameter.default == pickle_steps:
+			return None
 
-		for it in cell_states.keys():
-			state = cell_states[it]
+		return int(pickle_steps)
 
-			packed_color = pack_norm_color(state.color[0], state.color[1], state.color[2], 1.0)
+	def _capture_signals(self):
+		signals = self.get_signals_grid()
+		if not signals: return None
 
-			# The length is computed differenty in CellModeller4 and CellModeller5. The front-end 
-			# expects that the length will be calculated based on how its done in CM5.
-			final_length = max(state.length + 1.0 - 2.0 * state.radius, 0)
+		origin = (signals.origin[0], signals.origin[2], signals.origin[1])
+		cell_size = (signals.cell_size[0], signals.cell_size[2], signals.cell_size[1])
+		cell_count = (signals.cell_count[0], signals.cell_count[2], signals.cell_count[1])
 
-			byte_buffer.write(struct.pack("<fff", state.pos[0], state.pos[2], state.pos[1]))
-			byte_buffer.write(struct.pack("<fff", state.dir[0], state.dir[2], state.dir[1]))
-			byte_buffer.write(struct.pack("<ffI", final_length, state.radius, packed_color))
+		return (origin, cell_size, cell_count, self._pack_signal_colors(signals))
 
-		# Write cell IDs
-		for it in cell_states.keys():
-			state = cell_states[it]
+	def _pack_signal_colors(self, signals):
+		# This doesn't copy the grid if it already is a contiguous array
+		voxels = numpy.ascontiguousarray(signals.voxels)
+		cell_count = tuple(signals.cell_count)
 
-			byte_buffer.write(struct.pack("<Q", int(state.id)))
+		digest = (cell_count, voxels.dtype.str, voxels.shape, hashlib.blake2b(voxels, digest_size=16).digest())
 
-		# Write signals 
-		signals = self.get_signals_grid()
+		if digest != self.last_signal_digest:
+			self.last_signal_digest = digest
+			self.last_signal_colors = pack_signal_voxels(voxels, cell_count)
 
-		if signals:
-			byte_buffer.write(struct.pack("<?", True))
+		return self.last_signal_colors
 
-			byte_buffer.write(struct.pack("<fff", signals.origin[0], signals.origin[2], signals.origin[1]))
-			byte_buffer.write(struct.pack("<fff", signals.cell_size[0], signals.cell_size[2], signals.cell_size[1]))
-			byte_buffer.write(struct.pack("<iii", signals.cell_count[0], signals.cell_count[2], signals.cell_count[1]))
+	def capture_step_frame(self):
+		base_file_name = "step-%05i" % self.simulation.stepNum
 
-			for z in range(signals.cell_count[1]):
-				for y in range(signals.cell_count[2]):
-					for x in range(signals.cell_count[0]):
-						density = signals.voxels[x][z][y]
-						color = [ density, 0.0, 0.0, density ]
+		frame = CellModeller4StepFrame()
+		frame.step_path = os.path.join(self.simulation.outputDirPath, f"{base_file_name}.cm5_step")
+		frame.viz_bin_path = os.path.join(self.params.cache_dir, f"{base_file_name}.cm5_viz")
+		frame.step_file_relative = os.path.join(".", f"{base_file_name}.cm5_step")
+		frame.cached_file_relative = os.path.join(self.params.cache_relative_prefix, f"{base_file_name}.cm5_viz")
+		frame.compress = self.compress_step
 
-						byte_buffer.write(struct.pack("<I", pack_norm_color(color[0], color[1], color[2], color[3])))
-		else:
-			byte_buffer.write(struct.pack("<?", False))
+		frame.state_columns = svformat.gather_state_columns(self.simulation.cellStates, "id", STEP_ATTRIBUTES_TO_PACK)
+		frame.cell_data, frame.cell_ids = pack_viz_cell_data(self.simulation.cellStates)
+		frame.signals = self._capture_signals()
 
-		with open(path, "wb") as out_file:
-			out_file.write(self.compress_step(byte_buffer.getbuffer()))
+		return frame
 
 	def write_step_files(self):
-		base_file_name = "step-%05i" % self.simulation.stepNum
+		return self.capture_step_frame().write()
+
+	def supports_checkpoints(self):
+		# Older versions of CellModeller cannot load their own pickles
+		return hasattr(self.simulation, "loadFromPickle")
+
+	def write_checkpoint(self, path):
+		# This is the same data that 'Simulator.writePickle' saves, which is what 'loadFromPickle' expects
+		data = {
+			"cellStates": self.simulation.cellStates,
+			"stepNum": self.simulation.stepNum,
+			"lineage": getattr(self.simulation, "lineage", {}),
+			"moduleStr": self.simulation.moduleOutput,
+			"moduleName": getattr(self.simulation, "moduleName", self.params.name),
+		}
 
-		pickle_path = os.path.join(self.simulation.outputDirPath, f"{base_file_name}.cm5_step")
-		viz_bin_path = os.path.join(self.params.cache_dir, f"{base_file_name}.cm5_viz")
+		integrator = getattr(self.simulation, "integ", None)
 
-		pickle_file_relative = os.path.join(".", f"{base_file_name}.cm5_step")
-		cached_file_relative = os.path.join(self.params.cache_relative_prefix, f"{base_file_name}.cm5_viz")
+		if integrator:
+			data["specData"] = integrator.levels
+			data["sigData"] = integrator.cellSigLevels
 
-		# Write pickle
-		self._write_step_frame(pickle_path)
+		with open(path, "wb") as checkpoint_file:
+			pickle.dump(data, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
 
-		# Write binary finle
-		self._write_viz_frame(viz_bin_path)
+	def restore_checkpoint(self, path):
+		with open(path, "rb") as checkpoint_file:
+			data = pickle.load(checkpoint_file)
 
-		return pickle_file_relative, cached_file_relative
+		self.simulation.loadFromPickle(data)
 
 	def shutdown(self):
 		del self.simulation
@@ -0,0 +1,215 @@
+import os
+import sys
+import ast
+import json
+import itertools
+import traceback
+import multiprocessing as mp
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from saveviewer import archiver
+
+from simrunner.backends.backend import BackendParameters
+from simrunner.instances.siminstance import create_instance_from_name, create_output_schedule
+from simrunner.instances.frame_writer import FrameWriter
+
+# Runs many variants of a simulation script without the server (see the 'runbatch' command). Every
+# variant is written to its own directory, using the same layout as the simulations in the save
+# archive, so that the variants can be imported into the server afterwards ('importbatch').
+
+BATCH_MANIFEST_FILE_NAME = "batch.json"
+
+class BatchVariant:
+	def __init__(self):
+		self.index = 0
+		self.parameters = {}
+		self.directory = ""
+		self.source = ""
+		self.backend = "CellModeller4"
+		self.step_count = 0
+		self.max_cell_count = 0
+		self.output_stride = 0
+		self.output_interval = 0.0
+		self.frame_writer_threads = 2
+		self.frame_queue_depth = 4
+		self.io_budget_bytes_per_second = 0.0
+		self.io_budget_write_fraction = 0.0
+
+# Returns every combination of the values in 'grid', which maps parameter names to lists of values
+def expand_parameter_grid(grid):
+	names = list(grid)
+
+	return [ dict(zip(names, values)) for values in itertools.product(*[ grid[name] for name in names ]) ]
+
+# Replaces the values of top-level assignments (e.g. 'max_cells = 2**15') in a simulation script
+def apply_parameters_to_source(source, parameters):
+	source_bytes = source.encode("utf-8")
+	tree = ast.parse(source_bytes)
+
+	line_offsets = [ 0 ]
+	for line in source_bytes.splitlines(keepends=True):
+		line_offsets.append(line_offsets[-1] + len(line))
+
+	replacements = []
+	found_names = set()
+
+	for node in tree.body:
+		if isinstance(node, ast.Assign) and len(node.targets) == 1:
+			target = node.targets[0]
+		elif isinstance(node, ast.AnnAssign) and not node.value is None:
+			target = node.target
+		else:
+			continue
+
+		if not isinstance(target, ast.Name) or not target.id in parameters:
+			continue
+
+		# AST column offsets are in bytes, not characters
+		start = line_offsets[node.value.lineno - 1] + node.value.col_offset
+		end = line_offsets[node.value.end_lineno - 1] + node.value.end_col_offset
+
+		replacements.append((start, end, repr(parameters[target.id]).encode("utf-8")))
+		found_names.add(target.id)
+
+	missing_names = [ name for name in parameters if not name in found_names ]
+	if len(missing_names) > 0:
+		raise ValueError(f"Parameters without a top-level assignment in the script: {', '.join(missing_names)}")
+
+	for (start, end, value) in reversed(replacements):
+		source_bytes = source_bytes[:start] + value + source_bytes[end:]
+
+	return source_bytes.decode("utf-8")
+
+# Runs a single variant. This is called in one of the batch's worker processes.
+def run_variant(variant):
+	os.makedirs(os.path.join(variant.directory, "cache"), exist_ok=True)
+	archiver.write_sim_source_to_location(variant.directory, variant.source)
+
+	index_path = os.path.join(variant.directory, archiver.INDEX_FILE_NAME)
+	archiver.write_empty_index_file(index_path, variant.backend)
+
+	# Like the simulation instances, each variant gets its own log file
+	out_stream = sys.stdout
+	err_stream = sys.stderr
+	initial_cwd = os.getcwd()
+
+	log_stream = open(os.path.join(variant.directory, "log.txt"), "w")
+	sys.stdout = log_stream
+	sys.stderr = log_stream
+
+	output_schedule = None
+
+	def commit_frame(step_path, viz_bin_path, step, stride, write_seconds):
+		archiver.write_entry_to_sim_index(index_path, step_path, viz_bin_path, step, stride)
+
+		byte_count = sum([ os.path.getsize(os.path.join(variant.directory, path)) for path in [ step_path, viz_bin_path ] ])
+		output_schedule.on_frame_written(byte_count, write_seconds)
+
+	frame_writer = FrameWriter(commit_frame, variant.frame_writer_threads, variant.frame_queue_depth)
+	backend = None
+
+	try:
+		os.chdir(variant.directory)
+
+		params = BackendParameters()
+		params.source = variant.source
+		params.sim_root_dir = variant.directory
+		params.cache_relative_prefix = "cache"
+		params.cache_dir = os.path.join(params.sim_root_dir, params.cache_relative_prefix)
+		params.max_cell_count = variant.max_cell_count
+
+		backend = create_instance_from_name(variant.backend, params)
+		backend.initialize()
+
+		archiver.write_shapes_to_sim_index(index_path, backend.get_shape_list())
+
+		output_schedule = create_output_schedule(variant, backend)
+
+		while backend.is_running() and output_schedule.steps_taken < variant.step_count:
+			backend.step()
+
+			if output_schedule.step_completed():
+				frame_writer.submit(backend.capture_step_frame(), output_schedule.current_step(), output_schedule.step_stride)
+
+		if output_schedule.has_unwritten_step():
+			frame_writer.submit(backend.capture_step_frame(), output_schedule.current_step(), output_schedule.step_stride)
+
+		frame_writer.flush()
+
+		return (variant.index, None)
+	except Exception:
+		exc_message = traceback.format_exc()
+		print(exc_message)
+
+		frame_writer.close()
+		archiver.write_crash_to_sim_index(index_path, exc_message)
+
+		return (variant.index, exc_message)
+	finally:
+		frame_writer.close()
+
+		if not backend is None:
+			backend.shutdown()
+
+		# Closing the frame index merges its write-ahead log, so the directory can be copied safely
+		archiver.release_sim_index(index_path)
+
+		os.chdir(initial_cwd)
+
+		sys.stdout = out_stream
+		sys.stderr = err_stream
+		log_stream.close()
+
+def write_batch_manifest(output_dir, manifest):
+	with open(os.path.join(output_dir, BATCH_MANIFEST_FILE_NAME), "w") as manifest_file:
+		manifest_file.write(json.dumps(manifest, indent=4))
+
+def read_batch_manifest(output_dir):
+	with open(os.path.join(output_dir, BATCH_MANIFEST_FILE_NAME), "r") as manifest_file:
+		return json.loads(manifest_file.read())
+
+# 'template' holds the settings shared by every variant. A worker count of zero uses all cores.
+def run_batch(source, grid, output_dir, template, worker_count=0, progress_callback=None):
+	output_dir = os.path.abspath(output_dir)
+	os.makedirs(output_dir, exist_ok=True)
+
+	variants = []
+
+	for (index, parameters) in enumerate(expand_parameter_grid(grid)):
+		variant = BatchVariant()
+		variant.__dict__.update(template.__dict__)
+		variant.index = index
+		variant.parameters = parameters
+		variant.directory = os.path.join(output_dir, "variant-%04i" % index)
+		variant.source = apply_parameters_to_source(source, parameters)
+
+		variants.append(variant)
+
+	manifest = {
+		"backend_version": template.backend,
+		"step_count": template.step_count,
+		"variants": [ { "directory": os.path.basename(variant.directory), "parameters": variant.parameters, "status": "pending" } for variant in variants ]
+	}
+
+	write_batch_manifest(output_dir, manifest)
+
+	if worker_count <= 0:
+		worker_count = os.cpu_count() or 1
+
+	# Simulations may use OpenCL, which doesn't survive a fork, so workers are always spawned
+	with ProcessPoolExecutor(max_workers=min(worker_count, len(variants)), mp_context=mp.get_context("spawn")) as executor:
+		futures = [ executor.submit(run_variant, variant) for variant in variants ]
+
+		for future in as_completed(futures):
+			(index, error) = future.result()
+
+			manifest["variants"][index]["status"] = "finished" if error is None else "failed"
+			if not error is None: manifest["variants"][index]["error"] = error
+
+			write_batch_manifest(output_dir, manifest)
+
+			if not progress_callback is None:
+				progress_callback(manifest["variants"][index])
+
+	return manifest
@@ -42,12 +42,16 @@ class UserCommsConsumer(WebsocketConsumer):
 			self.send_sim_header()
 		elif msg_data["action"] == "stop":
 			manager.kill_simulation(self.sim_uuid)
-		elif msg_data["action"] == "reload":
+		elif msg_data["action"] == "pause":
+			manager.pause_simulation(self.sim_uuid)
+		elif msg_data["action"] == "resume":
+			manager.resume_simulation(self.sim_uuid)
+		elif msg_data["action"] == "reload" or msg_data["action"] == "continue":
 			if self.is_reloading:
 				return
 			
 			self.is_reloading = True
-			cold_restart = self.handle_reload_action()
+			cold_restart = self.handle_reload_action(msg_data["action"] == "continue")
 			self.is_reloading = False
 
 			if cold_restart:
@@ -58,12 +62,17 @@ class UserCommsConsumer(WebsocketConsumer):
 	def disconnect(self, close_code):
 		wsgroups.remove_websocket_from_group(f"simcomms/{self.sim_uuid}", self)
 
-	def handle_reload_action(self):
+	# Reloading always starts the simulation over from step 0. An offline simulation can also be
+	# continued from its latest checkpoint (if it has one it can resume from).
+	def handle_reload_action(self, resume):
 		if manager.is_simulation_running(self.sim_uuid):
-			manager.reload_simulation(self.sim_uuid)
+			# A running simulation has nothing to continue from
+			if not resume:
+				manager.reload_simulation(self.sim_uuid)
+
 			return False
 		else:
-			manager.resurrect_simulation(self.sim_uuid)
+			manager.resurrect_simulation(self.sim_uuid, resume)
 			return True
 
 	def send_sim_header(self):
@@ -77,6 +86,8 @@ class UserCommsConsumer(WebsocketConsumer):
 			"maxSimSize": simulation.max_cell_count,
 			"frameCount": index_data["num_frames"],
 			"isOnline": is_online,
+			"status": manager.get_simulation_status(self.sim_uuid),
+			"runGeneration": index_data.get("run_generation"),
 			"crashMessage": index_data["crash_message"] if index_data.get("has_crashed") else None
 		}
 
@@ -84,11 +95,13 @@ class UserCommsConsumer(WebsocketConsumer):
 
 	def send_client_message(self, message):
 		if type(message) == clientmessages.NewFrame:
-			self.send_message_data("newframe", { "frameCount": message.frame_count })
+			self.send_message_data("newframe", { "frameCount": message.frame_count, "runGeneration": archiver.get_simulation_run_generation(self.sim_uuid) })
 		elif type(message) == clientmessages.NewShape:
 			self.send_message_data("newshape", "")
 		elif type(message) == clientmessages.ErrorMessage:
 			self.send_message_data("error_message", message.message)
+		elif type(message) == clientmessages.StatusChanged:
+			self.send_message_data("simstatus", message.status)
 
 	def send_message_data(self, action, data):
 		self.send(text_data=json.dumps({ "action": action, "data": data }))
@@ -8,4 +8,8 @@ class NewShape:
 
 class ErrorMessage:
     def __init__(self, message):
-        self.message = message
\ No newline at end of file
+        self.message = message
+
+class StatusChanged:
+    def __init__(self, status):
+        self.status = status
\ No newline at end of file
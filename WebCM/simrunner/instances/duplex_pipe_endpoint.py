@@ -1,6 +1,10 @@
+import sys
 import threading
 import queue
 import traceback
+import multiprocessing as mp
+import multiprocessing.connection as mp_connection
+import msgpack
 
 from enum import Enum
 
@@ -11,6 +15,69 @@ class PipeEndpointSignal(Enum):
 	# notification and has closed iteself successfully
 	CLOSE_CONFIRMATION = 2
 
+# 'mp_connection.wait' can only wait on this many objects at once on Windows (WaitForMultipleObjects).
+# Zero means there is no limit.
+PIPE_WAIT_HANDLE_LIMIT = 63 if sys.platform == "win32" else 0
+
+# When a hub has more connections than it can wait on at once, it only sleeps on the first group of
+# connections, and checks the others again after this long (in seconds)
+PIPE_HUB_POLL_PERIOD = 0.01
+
+# Signals are sent as a msgpack extension type, so they can be in the same batch as regular messages
+PIPE_SIGNAL_EXT_CODE = 1
+
+def _encode_pipe_item(item):
+	if isinstance(item, PipeEndpointSignal):
+		return msgpack.ExtType(PIPE_SIGNAL_EXT_CODE, bytes([ item.value ]))
+
+	raise TypeError(f"Could not pack type: {type(item)}")
+
+def _decode_pipe_ext(code, data):
+	if code == PIPE_SIGNAL_EXT_CODE:
+		return PipeEndpointSignal(data[0])
+
+	return msgpack.ExtType(code, data)
+
+# Every write to the pipe is a single msgpack array containing all the items that were queued
+# since the last write. This is sent with 'send_bytes', so the connection doesn't pickle it again.
+def encode_pipe_batch(items):
+	return msgpack.packb(items, default=_encode_pipe_item)
+
+def decode_pipe_batch(data):
+	return msgpack.unpackb(data, ext_hook=_decode_pipe_ext)
+
+# Wakes up a thread that is blocked in 'mp_connection.wait'. The waiting thread should include
+# 'reader' in the objects it waits on and call 'clear' once it wakes up. 'pending' makes sure that
+# only one wakeup byte is written until the waiting thread has handled it, so the pipe can't fill up.
+class PipeWaker:
+	def __init__(self):
+		self.reader, self.writer = mp.Pipe(duplex=False)
+		self.pending = False
+		self.closed = False
+		self.lock = threading.Lock()
+
+	def wake(self):
+		with self.lock:
+			if self.pending or self.closed:
+				return
+
+			self.pending = True
+			self.writer.send_bytes(b"")
+
+	def clear(self):
+		with self.lock:
+			while self.reader.poll():
+				self.reader.recv_bytes()
+
+			self.pending = False
+
+	def close(self):
+		with self.lock:
+			self.closed = True
+
+			self.reader.close()
+			self.writer.close()
+
 # Used to send and receive messages accross a pipe. You cannot read and write to the
 # same 'Connection' object returned by 'mp.Pipe()' at the same time. This means that
 # you cannot have a listener thread that's always receiving data from the pipe, and also
@@ -18,68 +85,104 @@ class PipeEndpointSignal(Enum):
 # but they both seem like inefficient solutions.
 #
 # 'DuplexPipeEndpoint' allows you to both read and write at the same time using only one pipe.
-# Instead of waiting for messages to be received constantly, it will do so periodically. This
-# way, it can send messages down the pipe without there being a chance of data corruption
+# All reads and writes happen on a single thread, which sleeps until either the pipe has data to
+# read, or another thread queues a message to send. Queuing a message wakes the thread up through
+# a second, internal pipe, so messages are handled as soon as they arrive. Messages that are queued
+# while the thread is busy are sent together, in one write (see 'encode_pipe_batch'). Because of
+# this, items must be made up of types that msgpack can pack (or be a 'PipeEndpointSignal').
+#
+# By default, every endpoint has its own thread. If a 'PipeHub' is provided, the hub's thread
+# services the endpoint instead, together with all the other endpoints that use the same hub.
 class DuplexPipeEndpoint:
-	def __init__(self, conn, receive_callback, close_callback=None, poll_period=0.1):
+	def __init__(self, conn, receive_callback, close_callback=None, hub=None):
 		self.connection = conn
 		self.receive_callback = receive_callback
 		self.close_callback = close_callback
 
 		self.msg_queue = queue.Queue()
-		self.poll_period = poll_period
+
+		self.hub = hub
+		self.waker = PipeWaker() if hub is None else None
+		self.needs_service = False
+		self.finished = threading.Event()
 
 		self.auto_shutdown = False
 		self.running = False
 		self.was_broken = False
-		self.thread = threading.Thread(target=self.run)
-		self.queue_cond = threading.Condition()
+		self.thread = threading.Thread(target=self.run) if hub is None else None
 
 		self.close_confirmed = False
 		self.shutdown_cond = threading.Condition()
 
+	def wakeup(self):
+		if self.hub is None:
+			self.waker.wake()
+		else:
+			self.needs_service = True
+			self.hub.wakeup()
+
 	def run(self):
 		while self.running:
-			# Wait for either the queue to not be empty or until the timeout expires
-			def wait_predicate():
-				return not self.msg_queue.empty()
+			# Wait until there is either something to read or something to send
+			ready = mp_connection.wait([ self.connection, self.waker.reader ])
 
-			self.queue_cond.acquire()
-			self.queue_cond.wait_for(wait_predicate, timeout=self.poll_period)
+			if self.waker.reader in ready:
+				self.waker.clear()
 
-			try:
-				# Receive items
-				while self.connection.poll():
-					item = self.connection.recv()
+			self.service()
+
+		self.waker.close()
+		self.finish()
+
+	# Handles all the received messages and sends all the queued ones. This must only ever be
+	# called from the thread that services the endpoint
+	def service(self):
+		try:
+			# Receive items
+			while self.running and self.connection.poll():
+				for item in decode_pipe_batch(self.connection.recv_bytes()):
 					self.receive_message(item)
 
-				# Send items
-				while not self.msg_queue.empty():
-					item = self.msg_queue.get()
-					self.connection.send(item)
+			# Send items
+			batch = []
 
-					self.msg_queue.task_done()
+			while not self.msg_queue.empty():
+				batch.append(self.msg_queue.get())
+				self.msg_queue.task_done()
 
-				# We want to send the close notification
-				if self.auto_shutdown:
-					self.connection.send(PipeEndpointSignal.CLOSE_CONFIRMATION)
-					self.running = False
-			except BrokenPipeError as e:
+			# We want to send the close notification
+			if self.auto_shutdown:
+				batch.append(PipeEndpointSignal.CLOSE_CONFIRMATION)
 				self.running = False
-				self.was_broken = True
-			except Exception as e:
-				print(traceback.format_exc())
 
-			self.queue_cond.release()
+			if len(batch) > 0:
+				self.connection.send_bytes(encode_pipe_batch(batch))
+		except (OSError, EOFError) as e:
+			# 'EOFError' is raised when we try to read from a pipe that was closed on the other end, and
+			# 'OSError' when the connection was closed on this end (or broke in some other way)
+			self.running = False
+			self.was_broken = True
+		except Exception as e:
+			print(traceback.format_exc())
 
+	def finish(self):
 		if self.close_callback:
 			self.close_callback()
 
-		return
+		self.finished.set()
+
+	def is_service_thread(self):
+		current_thread = threading.current_thread()
+
+		return current_thread is (self.thread if self.hub is None else self.hub.thread)
 
 	def start(self):
 		self.running = True
-		self.thread.start()
+
+		if self.hub is None:
+			self.thread.start()
+		else:
+			self.hub.add_endpoint(self)
 	
 	def close(self):
 		if not self.running:
@@ -91,7 +194,10 @@ class DuplexPipeEndpoint:
 		# self.msg_queue.join()
 
 		self.running = False
-		self.thread.join()
+		self.wakeup()
+
+		if not self.is_service_thread():
+			self.finished.wait()
 
 	# Use this to gracefully close both endpoints of the pipe
 	def shutdown(self, block_timeout=1.0):
@@ -113,9 +219,8 @@ class DuplexPipeEndpoint:
 		if self.was_broken: raise BrokenPipeError("The pipe has been ended")
 		if not self.running: return
 
-		with self.queue_cond:
-			self.msg_queue.put(item)
-			self.queue_cond.notify_all()
+		self.msg_queue.put(item)
+		self.wakeup()
 
 	def receive_message(self, msg):
 		if isinstance(msg, PipeEndpointSignal):
@@ -130,3 +235,94 @@ class DuplexPipeEndpoint:
 
 	def is_alive(self):
 		return self.running
+
+# Services any number of 'DuplexPipeEndpoint's from a single thread. The thread waits on the
+# connections of all the endpoints at once, so the number of threads stays the same no matter
+# how many endpoints there are.
+class PipeHub:
+	def __init__(self):
+		self.endpoints = []
+		self.lock = threading.Lock()
+		self.waker = PipeWaker()
+
+		self.thread = threading.Thread(target=self.run, daemon=True)
+		self.thread.start()
+
+	def add_endpoint(self, endpoint):
+		with self.lock:
+			self.endpoints.append(endpoint)
+
+		self.waker.wake()
+
+	def wakeup(self):
+		self.waker.wake()
+
+	# Waits on a group of connections. If the wait fails (e.g. a connection was closed while we were
+	# waiting on it), the connections are checked one by one, and the ones that fail are returned as
+	# ready so that their endpoints run into the error themselves.
+	def wait_for_connections(self, connections, timeout=None):
+		try:
+			return mp_connection.wait(connections, timeout)
+		except Exception:
+			ready = []
+
+			for connection in connections:
+				try:
+					if len(mp_connection.wait([ connection ], 0)) > 0:
+						ready.append(connection)
+				except Exception:
+					ready.append(connection)
+
+			return ready
+
+	def wait_for_ready(self, endpoints):
+		connections = [ self.waker.reader ] + [ endpoint.connection for endpoint in endpoints ]
+
+		if PIPE_WAIT_HANDLE_LIMIT == 0 or len(connections) <= PIPE_WAIT_HANDLE_LIMIT:
+			return self.wait_for_connections(connections)
+
+		groups = [ connections[start:start + PIPE_WAIT_HANDLE_LIMIT] for start in range(0, len(connections), PIPE_WAIT_HANDLE_LIMIT) ]
+
+		while True:
+			ready = []
+
+			for group in groups:
+				ready += self.wait_for_connections(group, 0)
+
+			if len(ready) > 0:
+				return ready
+
+			# The first group contains the waker, so new endpoints and queued messages still wake us up immediately
+			ready = self.wait_for_connections(groups[0], PIPE_HUB_POLL_PERIOD)
+
+			if len(ready) > 0:
+				return ready
+
+	def run(self):
+		while True:
+			with self.lock:
+				endpoints = list(self.endpoints)
+
+			ready = self.wait_for_ready(endpoints)
+
+			if self.waker.reader in ready:
+				self.waker.clear()
+
+			for endpoint in endpoints:
+				try:
+					if endpoint.connection in ready or endpoint.needs_service:
+						endpoint.needs_service = False
+						endpoint.service()
+
+					if not endpoint.running:
+						with self.lock:
+							self.endpoints.remove(endpoint)
+
+						endpoint.finish()
+				except Exception as e:
+					# One misbehaving endpoint shouldn't take down all the others
+					print(traceback.format_exc())
+
+	def endpoint_count(self):
+		with self.lock:
+			return len(self.endpoints)
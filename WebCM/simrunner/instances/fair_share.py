@@ -0,0 +1,115 @@
+import os
+import math
+import time
+import threading
+import traceback
+
+# How often (in seconds) the scheduler decides which instances are allowed to step
+FAIR_SHARE_PERIOD = 1.0
+
+# Recent CPU usage decays with this half-life (in seconds), so old usage counts for less
+FAIR_SHARE_USAGE_HALF_LIFE = 60.0
+
+# Users are only held back if their recent usage is this much over their share
+FAIR_SHARE_TOLERANCE = 1.1
+
+# Shares are only enforced when the running instances want at least this fraction of the cores
+FAIR_SHARE_CONTENTION = 0.8
+
+# How often (in seconds) the CPU time of every user is written to the database
+CPU_ACCOUNTING_FLUSH_PERIOD = 30.0
+
+def get_core_count():
+	return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+# Divides the cores between the users that have running simulations, in proportion to their CPU
+# share. Instances report the CPU time they used (see 'instance_control_thread'), and when the cores
+# are contended, the instances of users that used more than their share recently are paused (their
+# step gate is closed) until the other users have caught up.
+#
+# 'get_running_instances' returns the launched instances, 'get_user_share' returns the CPU share of
+# a user and 'store_usage' is called with the CPU seconds used by each user since the last call.
+class FairShareScheduler:
+	def __init__(self, get_running_instances, get_user_share, store_usage):
+		self.get_running_instances = get_running_instances
+		self.get_user_share = get_user_share
+		self.store_usage = store_usage
+		self.core_count = get_core_count()
+
+		self.lock = threading.Lock()
+		self.interval_usage = {}
+		self.unstored_usage = {}
+		self.recent_usage = {}
+		self.instance_demand = {}
+
+		self.thread = threading.Thread(target=self.run, daemon=True)
+		self.thread.start()
+
+	def add_usage(self, sim_instance, seconds):
+		with self.lock:
+			self.interval_usage[sim_instance.uuid] = self.interval_usage.get(sim_instance.uuid, 0.0) + seconds
+			self.unstored_usage[sim_instance.owner_id] = self.unstored_usage.get(sim_instance.owner_id, 0.0) + seconds
+
+	def run(self):
+		last_store_time = time.monotonic()
+
+		while True:
+			time.sleep(FAIR_SHARE_PERIOD)
+
+			try:
+				self.update()
+
+				if time.monotonic() - last_store_time >= CPU_ACCOUNTING_FLUSH_PERIOD:
+					last_store_time = time.monotonic()
+					self.flush_usage()
+			except Exception:
+				print(traceback.format_exc())
+
+	def flush_usage(self):
+		with self.lock:
+			usage = self.unstored_usage
+			self.unstored_usage = {}
+
+		if len(usage) > 0:
+			self.store_usage(usage)
+
+	def update(self):
+		instances = self.get_running_instances()
+
+		with self.lock:
+			interval_usage = self.interval_usage
+			self.interval_usage = {}
+
+		decay = math.pow(0.5, FAIR_SHARE_PERIOD / FAIR_SHARE_USAGE_HALF_LIFE)
+
+		for owner_id in list(self.recent_usage):
+			self.recent_usage[owner_id] *= decay
+
+		# The demand of an instance is the rate at which it used CPU time the last time it was allowed to
+		# run, so that pausing an instance doesn't make it look like the cores are no longer contended
+		for sim_instance in instances:
+			seconds = interval_usage.get(sim_instance.uuid, 0.0)
+			self.recent_usage[sim_instance.owner_id] = self.recent_usage.get(sim_instance.owner_id, 0.0) + seconds
+
+			if not sim_instance.is_throttled:
+				self.instance_demand[sim_instance.uuid] = seconds / FAIR_SHARE_PERIOD
+
+		running_ids = set([ sim_instance.uuid for sim_instance in instances ])
+		self.instance_demand = { uuid: demand for (uuid, demand) in self.instance_demand.items() if uuid in running_ids }
+
+		owner_ids = set([ sim_instance.owner_id for sim_instance in instances ])
+		is_contended = len(owner_ids) > 1 and sum(self.instance_demand.values()) >= self.core_count * FAIR_SHARE_CONTENTION
+
+		shares = { owner_id: max(self.get_user_share(owner_id), 0.0) for owner_id in owner_ids }
+		total_share = sum(shares.values())
+		total_usage = sum([ self.recent_usage.get(owner_id, 0.0) for owner_id in owner_ids ])
+
+		for sim_instance in instances:
+			should_throttle = False
+
+			if is_contended and total_share > 0.0:
+				fair_usage = total_usage * shares[sim_instance.owner_id] / total_share
+				should_throttle = self.recent_usage.get(sim_instance.owner_id, 0.0) > fair_usage * FAIR_SHARE_TOLERANCE
+
+			if should_throttle != sim_instance.is_throttled:
+				sim_instance.set_throttled(should_throttle)
@@ -0,0 +1,84 @@
+import threading
+import queue
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Writes captured step frames on a pool of worker threads, so that the simulation can take its
+# next step while the previous frames are being serialized, compressed and written to disk.
+#
+# Frames may finish writing in any order, but 'commit_callback' is always called in the order
+# the frames were submitted (on a separate commit thread), so the index never skips a frame. It
+# receives the paths returned by the frame's 'write', any extra arguments given to 'submit' and
+# the number of seconds it took to write the frame.
+# At most 'queue_depth' frames can be in flight. When the limit is reached, 'submit' blocks until
+# the oldest frame has been committed, which stops a fast simulation from running ahead of the disk.
+def write_timed_frame(frame):
+	start_time = time.perf_counter()
+	written_paths = frame.write()
+
+	return (written_paths, time.perf_counter() - start_time)
+
+class FrameWriter:
+	def __init__(self, commit_callback, worker_count=2, queue_depth=4):
+		assert worker_count > 0
+		assert queue_depth > 0
+
+		self.commit_callback = commit_callback
+		self.executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="frame-writer")
+
+		self.free_slots = threading.Semaphore(queue_depth)
+		self.pending_frames = queue.Queue()
+		self.error = None
+		self.is_closed = False
+
+		self.commit_thread = threading.Thread(target=self.run_commits, daemon=True)
+		self.commit_thread.start()
+
+	def run_commits(self):
+		while True:
+			pending_frame = self.pending_frames.get()
+
+			try:
+				if pending_frame is None:
+					return
+
+				# Once a frame has failed, we don't commit any of the later ones, otherwise
+				# there would be a gap in the index
+				if self.error is None:
+					(future, commit_args) = pending_frame
+					(written_paths, write_seconds) = future.result()
+
+					self.commit_callback(*written_paths, *commit_args, write_seconds)
+			except Exception as e:
+				self.error = e
+			finally:
+				self.free_slots.release()
+				self.pending_frames.task_done()
+
+	def raise_pending_error(self):
+		if not self.error is None:
+			raise self.error
+
+	def submit(self, frame, *commit_args):
+		self.raise_pending_error()
+
+		self.free_slots.acquire()
+		self.pending_frames.put((self.executor.submit(write_timed_frame, frame), commit_args))
+
+	# Blocks until every submitted frame has been committed
+	def flush(self):
+		self.pending_frames.join()
+		self.raise_pending_error()
+
+	def close(self):
+		if self.is_closed:
+			return
+
+		self.is_closed = True
+
+		self.free_slots.acquire()
+		self.pending_frames.put(None)
+		self.commit_thread.join()
+
+		self.executor.shutdown(wait=True)
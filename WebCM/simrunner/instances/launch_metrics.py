@@ -0,0 +1,43 @@
+import threading
+import statistics
+
+from collections import deque
+
+# Number of launches that are kept for each metric
+LAUNCH_METRICS_HISTORY = 100
+
+# Timings of the most recent simulation launches (in seconds):
+#  - "process_start": from 'launch' until the instance process is running
+#  - "backend_initialize": time spent in the backend's 'initialize' (e.g. importing CellModeller)
+#  - "first_frame": from 'launch' until the server receives the first frame
+global__launch_metrics = {}
+global__launch_metrics_lock = threading.Lock()
+
+def record_launch_metric(name, seconds):
+	global global__launch_metrics
+	global global__launch_metrics_lock
+
+	with global__launch_metrics_lock:
+		global__launch_metrics.setdefault(name, deque(maxlen=LAUNCH_METRICS_HISTORY)).append(seconds)
+
+def get_launch_metrics():
+	global global__launch_metrics
+	global global__launch_metrics_lock
+
+	with global__launch_metrics_lock:
+		samples = { name: list(values) for (name, values) in global__launch_metrics.items() }
+
+	summary = {}
+
+	for (name, values) in samples.items():
+		ordered = sorted(values)
+
+		summary[name] = {
+			"count": len(values),
+			"last": values[-1],
+			"mean": statistics.fmean(values),
+			"p50": ordered[len(ordered) // 2],
+			"p95": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+		}
+
+	return summary
@@ -0,0 +1,143 @@
+import os
+import errno
+import struct
+import threading
+
+from multiprocessing import shared_memory
+
+# The newest viz frames of a running simulation are published in a ring buffer in shared memory, so
+# that the server can send them to live viewers without reading them back from the disk.
+#
+# Layout:
+#	header: slot count (u32), slot size (u32), latest frame (i64)
+#	slots: sequence (u64), frame (i64), step (i64), stride (i64), length (u64), data (slot size bytes)
+#
+# There is a single writing process (the simulation) and any number of readers. Its frame writer threads
+# publish frames as soon as they are compressed, so publishing is serialized with a lock and frames may
+# be published out of order. Every slot is protected by a sequence number, which is odd while the slot
+# is being written. A reader copies the slot and then
+# checks that the sequence number didn't change, otherwise the copy might be torn and is discarded.
+# Frames that don't fit in a slot are not published (they can still be read from the disk).
+LIVE_FRAME_HEADER = struct.Struct("<IIq")
+LIVE_FRAME_SLOT_HEADER = struct.Struct("<Qqqqq")
+
+NO_FRAME = -1
+
+# Shared memory on Linux lives in this tmpfs
+SHARED_MEMORY_PATH = "/dev/shm"
+
+# A ring is only created if at least this fraction of the shared memory filesystem remains free
+# afterwards, so that the rings don't use up the memory other processes need (e.g. OpenCL drivers)
+SHARED_MEMORY_MIN_FREE_FRACTION = 0.5
+
+class LiveFrameRing:
+	def __init__(self, memory, is_owner):
+		self.memory = memory
+		self.is_owner = is_owner
+		self.publish_lock = threading.Lock()
+
+		(self.slot_count, self.slot_size, _) = LIVE_FRAME_HEADER.unpack_from(self.memory.buf, 0)
+
+	# Raises OSError if there isn't enough shared memory for the ring
+	@staticmethod
+	def create(slot_count, slot_size):
+		size = LIVE_FRAME_HEADER.size + slot_count * (LIVE_FRAME_SLOT_HEADER.size + slot_size)
+
+		if hasattr(os, "statvfs") and os.path.isdir(SHARED_MEMORY_PATH):
+			stats = os.statvfs(SHARED_MEMORY_PATH)
+
+			if stats.f_bavail * stats.f_frsize - size < stats.f_blocks * stats.f_frsize * SHARED_MEMORY_MIN_FREE_FRACTION:
+				raise OSError(errno.ENOSPC, f"Not enough free space in {SHARED_MEMORY_PATH} for {size} bytes")
+
+		memory = shared_memory.SharedMemory(create=True, size=size)
+
+		# tmpfs only allocates pages when they are first written, and writing a page that can't be
+		# allocated kills the process with SIGBUS. Allocating every page now turns that into an OSError.
+		if hasattr(os, "posix_fallocate") and os.path.isdir(SHARED_MEMORY_PATH):
+			try:
+				memory_fd = os.open(os.path.join(SHARED_MEMORY_PATH, memory.name), os.O_RDWR)
+
+				try:
+					os.posix_fallocate(memory_fd, 0, size)
+				finally:
+					os.close(memory_fd)
+			except OSError:
+				memory.close()
+				memory.unlink()
+				raise
+
+		LIVE_FRAME_HEADER.pack_into(memory.buf, 0, slot_count, slot_size, NO_FRAME)
+
+		ring = LiveFrameRing(memory, True)
+		ring.clear()
+
+		return ring
+
+	# The process that created the ring is responsible for removing it. Instance processes share the
+	# resource tracker of the server, so the attached memory must not be unregistered here (that would
+	# also drop the registration of the server).
+	@staticmethod
+	def attach(name):
+		return LiveFrameRing(shared_memory.SharedMemory(name=name), False)
+
+	@property
+	def name(self):
+		return self.memory.name
+
+	def _slot_offset(self, frame):
+		return LIVE_FRAME_HEADER.size + (frame % self.slot_count) * (LIVE_FRAME_SLOT_HEADER.size + self.slot_size)
+
+	def latest_frame(self):
+		return LIVE_FRAME_HEADER.unpack_from(self.memory.buf, 0)[2]
+
+	def publish(self, frame, data, step, stride):
+		if len(data) > self.slot_size:
+			return False
+
+		with self.publish_lock:
+			offset = self._slot_offset(frame)
+			sequence = LIVE_FRAME_SLOT_HEADER.unpack_from(self.memory.buf, offset)[0]
+
+			data_offset = offset + LIVE_FRAME_SLOT_HEADER.size
+
+			LIVE_FRAME_SLOT_HEADER.pack_into(self.memory.buf, offset, sequence + 1, NO_FRAME, 0, 0, 0)
+			self.memory.buf[data_offset:data_offset + len(data)] = data
+			LIVE_FRAME_SLOT_HEADER.pack_into(self.memory.buf, offset, sequence + 2, frame, step, stride, len(data))
+
+			if frame > self.latest_frame():
+				LIVE_FRAME_HEADER.pack_into(self.memory.buf, 0, self.slot_count, self.slot_size, frame)
+
+		return True
+
+	# Returns (data, step, stride) of the frame, or None if the frame is not in the ring (anymore)
+	def read(self, frame):
+		offset = self._slot_offset(frame)
+		(sequence, slot_frame, step, stride, length) = LIVE_FRAME_SLOT_HEADER.unpack_from(self.memory.buf, offset)
+
+		if sequence % 2 == 1 or slot_frame != frame:
+			return None
+
+		data_offset = offset + LIVE_FRAME_SLOT_HEADER.size
+		data = bytes(self.memory.buf[data_offset:data_offset + length])
+
+		if LIVE_FRAME_SLOT_HEADER.unpack_from(self.memory.buf, offset)[0] != sequence:
+			return None
+
+		return (data, step, stride)
+
+	# Removes every frame, e.g. when the simulation is reloaded and starts numbering its frames from zero
+	def clear(self):
+		with self.publish_lock:
+			for slot in range(self.slot_count):
+				offset = LIVE_FRAME_HEADER.size + slot * (LIVE_FRAME_SLOT_HEADER.size + self.slot_size)
+				sequence = LIVE_FRAME_SLOT_HEADER.unpack_from(self.memory.buf, offset)[0]
+
+				LIVE_FRAME_SLOT_HEADER.pack_into(self.memory.buf, offset, sequence + (sequence % 2) + 2, NO_FRAME, 0, 0, 0)
+
+			LIVE_FRAME_HEADER.pack_into(self.memory.buf, 0, self.slot_count, self.slot_size, NO_FRAME)
+
+	def close(self):
+		self.memory.close()
+
+		if self.is_owner:
+			self.memory.unlink()
@@ -1,6 +1,14 @@
+import os
+import itertools
 import threading
 
-from simrunner.instances.siminstance import SimulationInstance
+from cloudserver import settings
+
+from simrunner import websocket_groups as wsgroups
+from simrunner.instances import clientmessages
+from simrunner.instances.siminstance import SimulationInstance, prewarm_instance_processes
+from simrunner.instances.duplex_pipe_endpoint import PipeHub
+from simrunner.instances.fair_share import FairShareScheduler
 
 from saveviewer import archiver
 from uuid import UUID
@@ -11,24 +19,208 @@ from uuid import UUID
 # client connection.
 # I'm going to give it a bit of an unorthodox name so that is doesn't get used somewhere else accidentally
 global__active_instances = {}
-global__instance_lock = threading.Lock()
+# This is reentrant because closing an instance admits the next queued instance, which can happen
+# while the lock is already held (e.g. in 'kill_simulation')
+global__instance_lock = threading.RLock()
+
+# Instances that are waiting for a free slot (see 'get_max_running_instances'), as (priority, launch
+# order, instance, CPU share) tuples. Instances with a lower priority are launched first. Between
+# instances with the same priority, the instance of the user with the fewest running instances (relative
+# to their CPU share) goes first, and then the one that was created first. Instances that are closed
+# while queued are skipped. The CPU share is looked up when the instance is queued, so that admitting
+# instances doesn't query the database while the instance lock is held.
+global__pending_instances = []
+global__launch_counter = itertools.count()
+
+# Instances whose process has been launched and hasn't stopped yet. A stopped instance only leaves
+# this set once its process is gone, so the next instance can't start while it is still running.
+# Paused instances leave it too (their process doesn't take any steps), and have to wait in
+# 'global__pending_instances' again when they are resumed.
+global__launched_instances = set()
+
+# When instances are pinned to cores, every running instance occupies one of these slots
+global__core_slots = None
+global__free_core_slots = None
+
+# All simulation instances share a single thread that handles the communication with their processes.
+# It is created when the first simulation is launched.
+global__pipe_hub = None
+
+# Keeps every user within their CPU share while their simulations are running (see fair_share.py)
+global__fair_share_scheduler = None
+
+def get_pipe_hub():
+	global global__pipe_hub
+	global global__instance_lock
+
+	with global__instance_lock:
+		if global__pipe_hub is None:
+			global__pipe_hub = PipeHub()
+
+		return global__pipe_hub
+
+def get_fair_share_scheduler():
+	from cloudserver.models import lookup_user_cpu_share, add_user_cpu_seconds
+
+	global global__fair_share_scheduler
+	global global__instance_lock
+
+	with global__instance_lock:
+		if global__fair_share_scheduler is None:
+			global__fair_share_scheduler = FairShareScheduler(get_running_instances, lookup_user_cpu_share, add_user_cpu_seconds)
+
+		return global__fair_share_scheduler
+
+def get_running_instances():
+	global global__active_instances
+	global global__instance_lock
+
+	with global__instance_lock:
+		return [ instance for instance in global__active_instances.values() if instance.is_launched and not instance.is_closed() ]
+
+def get_max_running_instances():
+	return settings.SIM_MAX_RUNNING_INSTANCES if settings.SIM_MAX_RUNNING_INSTANCES > 0 else (os.cpu_count() or 1)
+
+# Splits the cores this process may run on into one group per instance slot. If there are more slots
+# than cores, cores are shared between the slots.
+def __create_core_slots():
+	cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+	slot_count = get_max_running_instances()
+
+	if slot_count >= len(cores):
+		return [ [ cores[it % len(cores)] ] for it in range(slot_count) ]
+
+	cores_per_slot = len(cores) // slot_count
+
+	return [ cores[it * cores_per_slot:(it + 1) * cores_per_slot] for it in range(slot_count) ]
+
+def __running_instance_count():
+	global global__launched_instances
+
+	with global__instance_lock:
+		return len(global__launched_instances)
+
+# Returns the cores the instance should be pinned to, or None. Must be called with 'global__instance_lock' held.
+def __assign_core_slot(sim_instance):
+	global global__core_slots
+	global global__free_core_slots
+
+	# Pinning only helps when simulations compete for the cores
+	if not settings.SIM_PIN_INSTANCES_TO_CORES or len(global__launched_instances) == 0:
+		return None
+
+	if global__core_slots is None:
+		global__core_slots = __create_core_slots()
+		global__free_core_slots = list(reversed(range(len(global__core_slots))))
+
+	if len(global__free_core_slots) == 0:
+		return None
+
+	sim_instance.core_slot = global__free_core_slots.pop()
+
+	return global__core_slots[sim_instance.core_slot]
+
+# Frees the slot (and the cores) of an instance that has stopped or was paused.
+# Must be called with 'global__instance_lock' held.
+def __release_instance_slot(sim_instance):
+	global global__free_core_slots
+	global global__launched_instances
+
+	global__launched_instances.discard(sim_instance)
+
+	if not sim_instance.core_slot is None:
+		global__free_core_slots.append(sim_instance.core_slot)
+		sim_instance.core_slot = None
+
+# Must be called with 'global__instance_lock' held
+def __launch_instance(sim_instance):
+	cpu_affinity = __assign_core_slot(sim_instance)
+
+	# Paused instances that were waiting for a slot to be resumed already have a process
+	if sim_instance.is_launched:
+		sim_instance.resume(cpu_affinity)
+	else:
+		sim_instance.launch(get_pipe_hub(), cpu_affinity)
+
+	global__launched_instances.add(sim_instance)
+
+# Must be called with 'global__instance_lock' held
+def __admit_pending_instances():
+	global global__pending_instances
+
+	global__pending_instances = [ entry for entry in global__pending_instances if not entry[2].is_closed() ]
+
+	while len(global__pending_instances) > 0 and __running_instance_count() < get_max_running_instances():
+		running_counts = {}
+
+		for instance in global__launched_instances:
+			running_counts[instance.owner_id] = running_counts.get(instance.owner_id, 0) + 1
+
+		def admission_order(entry):
+			(priority, launch_order, instance, cpu_share) = entry
+
+			return (priority, running_counts.get(instance.owner_id, 0) / max(cpu_share, 1e-6), launch_order)
+
+		next_entry = min(global__pending_instances, key=admission_order)
+		global__pending_instances.remove(next_entry)
+
+		sim_instance = next_entry[2]
+
+		__launch_instance(sim_instance)
+
+		wsgroups.send_message_to_websocket_group(f"simcomms/{str(sim_instance.uuid)}", clientmessages.StatusChanged("running"))
+
+# Must be called with 'global__instance_lock' held
+def __is_instance_pending(sim_instance):
+	return any([ entry[2] is sim_instance for entry in global__pending_instances ])
+
+# Called when a queued instance is closed, or when the process of a launched instance has stopped
+def __on_instance_closed(sim_instance):
+	global global__instance_lock
+
+	with global__instance_lock:
+		__release_instance_slot(sim_instance)
+
+		if sim_instance.is_launched:
+			__admit_pending_instances()
+
+# Must be called without 'global__instance_lock' held, because it queries the database
+def __lookup_cpu_share(owner_id):
+	from cloudserver.models import lookup_user_cpu_share
 
-def create_simulation(user, sim_title, sim_desc, sim_source, sim_version, sim_max_size):
+	return 1.0 if owner_id is None else lookup_user_cpu_share(owner_id)
+
+# Launches the instance if there is a free slot, otherwise it is queued. Lower priorities are launched first.
+# Must be called with 'global__instance_lock' held.
+def __schedule_instance(sim_instance, cpu_share, resume=False, priority=0):
+	global global__active_instances
+	global global__pending_instances
+
+	sim_instance.closed_callback = __on_instance_closed
+	sim_instance.cpu_time_callback = get_fair_share_scheduler().add_usage
+	sim_instance.priority = priority
+	sim_instance.prepare(resume)
+
+	global__active_instances[sim_instance.uuid] = sim_instance
+
+	global__pending_instances.append((priority, next(global__launch_counter), sim_instance, cpu_share))
+	__admit_pending_instances()
+
+def create_simulation(user, sim_title, sim_desc, sim_source, sim_version, sim_max_size, output_stride=0, output_interval=0.0, priority=0):
 	global global__active_instances
 	global global__instance_lock
 
 	assert type(sim_max_size) is int
 
-	sim_entry = archiver.register_simulation(user, sim_title, sim_desc, sim_max_size)
+	sim_entry = archiver.register_simulation(user, sim_title, sim_desc, sim_max_size, output_stride, output_interval)
 	sim_uuid = sim_entry.uuid
+	cpu_share = __lookup_cpu_share(user.id)
 
 	with global__instance_lock:
 		archiver.write_sim_source_to_location(sim_entry.save_location, sim_source)
 
-		sim_instance = SimulationInstance(sim_uuid, sim_version, sim_entry.save_location, sim_max_size)
-		sim_instance.launch()
-
-		global__active_instances[sim_uuid] = sim_instance
+		sim_instance = SimulationInstance(sim_uuid, sim_version, sim_entry.save_location, sim_max_size, output_stride, output_interval, user.id)
+		__schedule_instance(sim_instance, cpu_share, priority=priority)
 
 	return sim_uuid
 
@@ -67,6 +259,94 @@ def is_simulation_running(uuid):
 		process = global__active_instances[uuid]
 		return not process.is_closed() if not process is None else True
 
+# Returns "running", "paused", "queued" or "offline"
+def get_simulation_status(uuid):
+	assert type(uuid) is UUID
+
+	global global__active_instances
+	global global__instance_lock
+
+	with global__instance_lock:
+		sim_instance = global__active_instances.get(uuid, None)
+
+		if sim_instance is None or sim_instance.is_closed():
+			return "offline"
+
+		if sim_instance.is_queued() or __is_instance_pending(sim_instance):
+			return "queued"
+
+		return "paused" if sim_instance.is_paused else "running"
+
+# Paused simulations keep their process, but stop taking steps until they are resumed. They give up their
+# slot (and cores), so the next queued simulation can run in the meantime.
+def pause_simulation(uuid):
+	assert type(uuid) is UUID
+
+	global global__active_instances
+	global global__pending_instances
+	global global__instance_lock
+
+	with global__instance_lock:
+		sim_instance = global__active_instances.get(uuid, None)
+
+		if sim_instance is None:
+			return False
+
+		# A paused simulation that is still waiting for a slot to be resumed stays paused
+		if sim_instance.is_launched and __is_instance_pending(sim_instance):
+			global__pending_instances = [ entry for entry in global__pending_instances if not entry[2] is sim_instance ]
+			sim_instance.send_message_to_clients(clientmessages.StatusChanged("paused"))
+
+			return True
+
+		if not sim_instance.pause():
+			return False
+
+		__release_instance_slot(sim_instance)
+		__admit_pending_instances()
+
+	return True
+
+# A resumed simulation is queued like a new one, and continues once it gets a slot
+def resume_simulation(uuid):
+	assert type(uuid) is UUID
+
+	global global__active_instances
+	global global__pending_instances
+	global global__instance_lock
+
+	with global__instance_lock:
+		sim_instance = global__active_instances.get(uuid, None)
+
+	if sim_instance is None:
+		return False
+
+	cpu_share = __lookup_cpu_share(sim_instance.owner_id)
+
+	with global__instance_lock:
+		if not sim_instance.is_paused or sim_instance.is_closed() or __is_instance_pending(sim_instance):
+			return False
+
+		global__pending_instances.append((sim_instance.priority, next(global__launch_counter), sim_instance, cpu_share))
+		__admit_pending_instances()
+
+		if __is_instance_pending(sim_instance):
+			sim_instance.send_message_to_clients(clientmessages.StatusChanged("queued"))
+
+	return True
+
+# Returns the compressed viz data of a frame of a running simulation, if it is still in shared memory
+def read_live_frame(uuid, frame):
+	assert type(uuid) is UUID
+
+	global global__active_instances
+	global global__instance_lock
+
+	with global__instance_lock:
+		sim_instance = global__active_instances.get(uuid, None)
+
+	return None if sim_instance is None else sim_instance.read_live_frame(frame)
+
 def reload_simulation(uuid):
 	assert type(uuid) is UUID
 
@@ -83,7 +363,8 @@ def reload_simulation(uuid):
 	
 	sim_instance.reload_simulation()
 
-def resurrect_simulation(uuid):
+# If the simulation has a checkpoint, it continues from there instead of starting over
+def resurrect_simulation(uuid, resume=False, priority=0):
 	assert type(uuid) is UUID
 
 	global global__active_instances
@@ -93,9 +374,8 @@ def resurrect_simulation(uuid):
 
 	index_data = archiver.get_instance_index_data(uuid)
 	simulation = lookup_simulation(uuid)
+	cpu_share = __lookup_cpu_share(simulation.owner_id)
 
 	with global__instance_lock:
-		sim_instance = SimulationInstance(uuid, index_data["backend_version"], simulation.save_location, simulation.max_cell_count)
-		sim_instance.launch()
-
-		global__active_instances[uuid] = sim_instance
\ No newline at end of file
+		sim_instance = SimulationInstance(uuid, index_data["backend_version"], simulation.save_location, simulation.max_cell_count, simulation.output_stride, simulation.output_interval, simulation.owner_id)
+		__schedule_instance(sim_instance, cpu_share, resume, priority)
\ No newline at end of file
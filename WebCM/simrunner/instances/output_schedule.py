@@ -0,0 +1,125 @@
+import math
+import time
+import threading
+
+# How often (in seconds) the I/O usage is compared against the budget
+IO_BUDGET_WINDOW = 5.0
+
+# Below this fraction of the budget, the output frequency is raised again
+IO_BUDGET_RELAX_THRESHOLD = 0.5
+
+# Measures how much of an I/O budget the frames of a simulation are using. The budget can be given
+# as a write bandwidth (bytes per second), as a fraction of wall time spent writing frames, or both.
+# A limit of zero disables that part of the budget.
+class IOBudget:
+	def __init__(self, max_bytes_per_second=0.0, max_write_fraction=0.0, window=IO_BUDGET_WINDOW):
+		self.max_bytes_per_second = max(float(max_bytes_per_second), 0.0)
+		self.max_write_fraction = max(float(max_write_fraction), 0.0)
+		self.window = window
+
+		self.window_start = time.monotonic()
+		self.window_bytes = 0
+		self.window_write_seconds = 0.0
+
+	def is_enabled(self):
+		return self.max_bytes_per_second > 0.0 or self.max_write_fraction > 0.0
+
+	# Returns the fraction of the budget used during the last window (1.0 means the budget was used
+	# exactly), or None if the current window hasn't ended yet
+	def record_frame(self, byte_count, write_seconds):
+		self.window_bytes += byte_count
+		self.window_write_seconds += write_seconds
+
+		now = time.monotonic()
+		elapsed = now - self.window_start
+
+		if elapsed < self.window:
+			return None
+
+		usage = 0.0
+
+		if self.max_bytes_per_second > 0.0:
+			usage = max(usage, self.window_bytes / elapsed / self.max_bytes_per_second)
+
+		if self.max_write_fraction > 0.0:
+			usage = max(usage, self.window_write_seconds / elapsed / self.max_write_fraction)
+
+		self.window_start = now
+		self.window_bytes = 0
+		self.window_write_seconds = 0.0
+
+		return usage
+
+# Decides which steps of a simulation are written out as frames. A step is written if it is a
+# multiple of 'step_stride' (counting from the first step, which is always a candidate) and if at
+# least 'min_interval' seconds have passed since the last written frame. Setting 'step_stride' to
+# one and 'min_interval' to N gives a purely wall-clock based schedule (at most one frame every
+# N seconds).
+#
+# If an I/O budget is given, the stride is multiplied by a decimation factor that grows when the
+# written frames exceed the budget, and shrinks back once they are comfortably below it.
+#
+# 'steps_taken' is the number of steps the simulation has already taken (e.g. when it is resumed
+# from a checkpoint).
+class OutputSchedule:
+	def __init__(self, step_stride=1, min_interval=0.0, io_budget=None, steps_taken=0):
+		self.base_stride = max(int(step_stride), 1)
+		self.step_stride = self.base_stride
+		self.min_interval = max(float(min_interval), 0.0)
+		self.io_budget = io_budget if not io_budget is None and io_budget.is_enabled() else None
+
+		self.steps_taken = steps_taken
+		self.last_frame_time = None
+		self.last_step_written = False
+
+		# 'on_frame_written' is called from the frame writer's commit thread
+		self.decimation = 1
+		self.decimation_lock = threading.Lock()
+
+	# Should be called after every step. Returns True if the step should be written
+	def step_completed(self):
+		step_index = self.steps_taken
+		self.steps_taken += 1
+
+		with self.decimation_lock:
+			self.step_stride = self.base_stride * self.decimation
+
+		self.last_step_written = self._should_write(step_index)
+
+		if self.last_step_written:
+			self.last_frame_time = time.monotonic()
+
+		return self.last_step_written
+
+	# The number of the most recent step (i.e. the one 'step_completed' was last called for), counting
+	# from one. This is the step number of the backend (e.g. 'stepNum' in CellModeller), which its step
+	# files are named after.
+	def current_step(self):
+		return self.steps_taken
+
+	def _should_write(self, step_index):
+		if step_index % self.step_stride != 0:
+			return False
+
+		if self.min_interval > 0.0 and not self.last_frame_time is None:
+			return time.monotonic() - self.last_frame_time >= self.min_interval
+
+		return True
+
+	def has_unwritten_step(self):
+		return self.steps_taken > 0 and not self.last_step_written
+
+	def on_frame_written(self, byte_count, write_seconds):
+		if self.io_budget is None:
+			return
+
+		with self.decimation_lock:
+			usage = self.io_budget.record_frame(byte_count, write_seconds)
+			if usage is None: return
+
+			if usage > 1.0:
+				self.decimation *= math.ceil(usage)
+				print(f"Frame output exceeds the I/O budget ({usage:.0%}), output stride is now {self.base_stride * self.decimation}")
+			elif usage < IO_BUDGET_RELAX_THRESHOLD and self.decimation > 1:
+				self.decimation = max(self.decimation // 2, 1)
+				print(f"Frame output is below the I/O budget ({usage:.0%}), output stride is now {self.base_stride * self.decimation}")
@@ -1,6 +1,7 @@
 import multiprocessing as mp
 import traceback
-import json
+import threading
+import time
 import sys, os
 
 from cloudserver import settings
@@ -13,41 +14,111 @@ from simrunner.backends.cellmodeller4 import CellModeller4Backend
 from simrunner.backends.cellmodeller5 import CellModeller5Backend
 
 from simrunner.instances import clientmessages
+from simrunner.instances.launch_metrics import record_launch_metric
+from simrunner.instances.live_frames import LiveFrameRing
 from simrunner.instances.duplex_pipe_endpoint import DuplexPipeEndpoint
+from simrunner.instances.frame_writer import FrameWriter
+from simrunner.instances.output_schedule import OutputSchedule, IOBudget
+
+# Instances report the CPU time they used to the server at most this often (in seconds)
+CPU_TIME_REPORT_PERIOD = 1.0
+
+# How often a paused simulation checks whether it has been stopped or reloaded (in seconds)
+STEP_GATE_POLL_PERIOD = 0.25
+
+# All instances are started with the same multiprocessing context (see 'get_instance_process_context')
+global__process_context = None
+global__process_context_lock = threading.Lock()
 
 class _InstanceProcessParams:
 	root_dir = ""
 	source_path = ""
 	backend = ""
 	max_cell_count = 0
-
-# Encoding/decoding with JSON because its (probably) faster than the pickle-ing that
-# Pytohn's pipe (might) be doing
+	frame_writer_threads = 2
+	frame_queue_depth = 4
+	output_stride = 0
+	output_interval = 0.0
+	io_budget_bytes_per_second = 0.0
+	io_budget_write_fraction = 0.0
+	checkpoint_interval = 0.0
+	checkpoint = None
+	cpu_affinity = None
+	live_frame_memory = None
+
+# Messages are dictionaries with a single key (the action). They are serialized, together with
+# any other messages that are waiting to be sent, by the 'DuplexPipeEndpoint' (with msgpack)
 def encode_pipe_message(message):
-	return json.dumps(message)
+	assert type(message) is dict and len(message) == 1
+
+	return message
 
 def decode_pipe_message(message):
-	message_json = json.loads(message)
-	message_key = list(message_json)[0]
-	message_value = message_json[message_key]
+	message_key = list(message)[0]
+	message_value = message[message_key]
 
 	return (message_key, message_value)
 
 class SimulationInstance:
-	def __init__(self, uuid, version, root_path, max_cell_count=0):
+	def __init__(self, uuid, version, root_path, max_cell_count=0, output_stride=0, output_interval=0.0, owner_id=None):
 		self.uuid = uuid
 		self.backend_version = version
 		self.root_path = os.path.abspath(root_path)
 		self.is_alive = True
 		self.max_cell_count = max_cell_count
+		self.output_stride = output_stride
+		self.output_interval = output_interval
+		self.owner_id = owner_id
+
+		# Set by the fair-share scheduler (see fair_share.py)
+		self.is_throttled = False
+		self.cpu_time_callback = None
+
+		# Paused instances keep their process (and the simulation's state), but don't take any steps
+		self.is_paused = False
+
+		self.launch_time = None
+		self.has_received_frame = False
+
+		# Shared memory with the newest viz frames (see live_frames.py). Frames in it are announced to
+		# the viewers before they are added to the index, and aren't announced again after that.
+		self.live_frames = None
+		self.live_frame_lock = threading.Lock()
+		self.announced_frame = -1
+
+		# Instances may be queued by the scheduler (see manager.py) before they are launched
+		self.is_launched = False
+		self.is_prepared = False
+		self.checkpoint = None
+		self.core_slot = None
+		self.priority = 0
+		self.closed_callback = None
 	
 	def __del__(self):
 		self.close()
 
-	def launch(self):
-		# Setup the simulation directory
-		index_data = archiver.write_empty_index_file(os.path.join(self.root_path, "index.json"), self.backend_version)
+	# Sets up the simulation directory. This is separate from 'launch' so that the index is ready
+	# while the instance is waiting in the scheduler's queue.
+	def prepare(self, resume=False):
+		index_path = os.path.join(self.root_path, archiver.INDEX_FILE_NAME)
+		self.checkpoint = None
+
+		if resume:
+			source_hash = archiver.hash_simulation_source(archiver.read_sim_source_from_location(self.root_path))
+			self.checkpoint = archiver.get_resumable_checkpoint(index_path, self.backend_version, source_hash)
+
+		# When resuming, we keep the frames up to the checkpoint
+		if self.checkpoint is None:
+			index_data = archiver.write_empty_index_file(index_path, self.backend_version)
+		else:
+			index_data = archiver.rewind_index_to_checkpoint(index_path, self.checkpoint)
+
 		archiver.update_instance_index(self.uuid, index_data)
+		self.is_prepared = True
+
+	def launch(self, pipe_hub=None, cpu_affinity=None):
+		if not self.is_prepared:
+			self.prepare()
 
 		# Launch the simulation process
 		params = _InstanceProcessParams()
@@ -55,11 +126,25 @@ class SimulationInstance:
 		params.source_path = self.get_source_file_path()
 		params.backend = self.backend_version
 		params.max_cell_count = self.max_cell_count
-
-		# The "spawn" context will start a completely new process of the python
-		# interpeter. This is also the only context type that is supported on both
-		# Unix and Windows systems.
-		ctx = mp.get_context("spawn")
+		params.frame_writer_threads = settings.SIM_FRAME_WRITER_THREADS
+		params.frame_queue_depth = settings.SIM_FRAME_QUEUE_DEPTH
+		params.output_stride = self.output_stride
+		params.output_interval = self.output_interval
+		params.io_budget_bytes_per_second = settings.SIM_IO_BUDGET_MB_PER_SECOND * 1024 * 1024
+		params.io_budget_write_fraction = settings.SIM_IO_BUDGET_WRITE_FRACTION
+		params.checkpoint_interval = settings.SIM_CHECKPOINT_INTERVAL
+		params.checkpoint = self.checkpoint
+		params.cpu_affinity = cpu_affinity
+
+		if settings.SIM_LIVE_FRAME_SLOTS > 0:
+			try:
+				self.live_frames = LiveFrameRing.create(settings.SIM_LIVE_FRAME_SLOTS, settings.SIM_LIVE_FRAME_SLOT_SIZE)
+				params.live_frame_memory = self.live_frames.name
+			except OSError as e:
+				print(f"Simulation {self.uuid}: Could not create live frame memory ({e}), frames will be read from the disk")
+
+		ctx = get_instance_process_context()
+		self.launch_time = time.monotonic()
 
 		# We need to create a pipe to communicate with the child process. 'mp.Pipe()' creates
 		# two 'Connection' objects. Each of the 'Connection' objects represents one of the two
@@ -73,31 +158,73 @@ class SimulationInstance:
 		self.process = ctx.Process(target=instance_control_thread, args=(child_pipe, params), daemon=True)
 		self.process.start()
 
-		# We also need to create a thread to communicate with the instance process
-		self.endpoint = DuplexPipeEndpoint(parent_pipe, self.recv_message_from_instance, self.on_endpoint_closed)
+		# We also need an endpoint to communicate with the instance process. If a hub is provided, the
+		# hub's thread handles the endpoint, otherwise the endpoint creates a thread of its own
+		self.endpoint = DuplexPipeEndpoint(parent_pipe, self.recv_message_from_instance, self.on_endpoint_closed, hub=pipe_hub)
 		self.endpoint.start()
 
+		self.is_launched = True
+
 	def recv_message_from_instance(self, message):
 		(action, data) = decode_pipe_message(message)
 
-		if action == "newframe":
+		if action == "liveframe":
+			self.announce_frame(data["frame"])
+		elif action == "newframe":
+			archiver.add_frame_to_instance_index(self.uuid, data["frame"], data["step_file"], data["viz_file"], data["step"], data["stride"])
+
+			if not self.has_received_frame:
+				self.has_received_frame = True
+				self.record_launch_time("first_frame")
+
+			self.announce_frame(data["frame"])
+		elif action == "resetindex":
 			archiver.update_instance_index(self.uuid, data["new_data"])
+			self.announced_frame = -1
 
-			self.send_message_to_clients(clientmessages.NewFrame(data["frame_count"]))
+			self.send_message_to_clients(clientmessages.NewFrame(0))
 		elif action == "newshape":
-			archiver.update_instance_index(self.uuid, data["new_data"])
+			archiver.update_instance_index_values(self.uuid, { "shape_list": data["shape_list"] })
 
 			self.send_message_to_clients(clientmessages.NewShape())
 		elif action == "error_message":
-			archiver.update_instance_index(self.uuid, data["new_data"])
+			archiver.update_instance_index_values(self.uuid, { "has_crashed": True, "crash_message": data["crash_message"] })
 			
-			self.send_message_to_clients(clientmessages.ErrorMessage(data["new_data"]["crash_message"]))
+			self.send_message_to_clients(clientmessages.ErrorMessage(data["crash_message"]))
+		elif action == "started":
+			self.record_launch_time("process_start")
+		elif action == "initialized":
+			record_launch_metric("backend_initialize", data["seconds"])
+		elif action == "cputime":
+			if self.cpu_time_callback:
+				self.cpu_time_callback(self, data["seconds"])
 		elif action == "close":
 			self._cleanup()
 
 	def send_message_to_instance(self, message):
 		self.endpoint.send_item(encode_pipe_message(message))
 
+	def announce_frame(self, frame):
+		if frame <= self.announced_frame:
+			return
+
+		self.announced_frame = frame
+		self.send_message_to_clients(clientmessages.NewFrame(frame))
+
+	# Returns (viz data, step, stride) of a frame if it is still in the live frame memory, or None
+	def read_live_frame(self, frame):
+		with self.live_frame_lock:
+			if self.live_frames is None:
+				return None
+
+			return self.live_frames.read(frame)
+
+	def record_launch_time(self, metric_name):
+		seconds = time.monotonic() - self.launch_time
+		record_launch_metric(metric_name, seconds)
+
+		print(f"Simulation {self.uuid}: {metric_name} after {seconds:.3f}s")
+
 	# This is not needed. All messages coming from clients are handled by the WebSocket consumers
 	# def recv_message_from_clients(self, data):
 	# 	pass
@@ -116,9 +243,22 @@ class SimulationInstance:
 
 		self.is_alive = False
 
+		# Launched instances keep their slot until their process has stopped (see 'on_endpoint_closed')
+		if self.closed_callback and not self.is_launched:
+			self.closed_callback(self)
+
+	# Called once the process has closed its end of the pipe, which it does right before it exits
 	def on_endpoint_closed(self):
 		self._cleanup()
 
+		if self.closed_callback:
+			self.closed_callback(self)
+
+		with self.live_frame_lock:
+			if not self.live_frames is None:
+				self.live_frames.close()
+				self.live_frames = None
+
 		self.pipes[0].close()
 		self.pipes[1].close()
 		
@@ -128,19 +268,85 @@ class SimulationInstance:
 
 		return
 
+	# A throttled instance doesn't take any more steps until it is released again
+	def set_throttled(self, throttled):
+		self.is_throttled = throttled
+
+		if self.is_launched and self.is_alive:
+			self.send_message_to_instance({ "throttle": { "paused": throttled } })
+
+	def pause(self):
+		if not self.is_launched or not self.is_alive or self.is_paused:
+			return False
+
+		self.is_paused = True
+		self.send_message_to_instance({ "pause": "" })
+		self.send_message_to_clients(clientmessages.StatusChanged("paused"))
+
+		return True
+
+	# Paused instances give up their cores, so the scheduler may assign them different cores when they
+	# are resumed (None if the instance isn't pinned anymore)
+	def resume(self, cpu_affinity=None):
+		if not self.is_launched or not self.is_alive or not self.is_paused:
+			return False
+
+		self.is_paused = False
+		self.send_message_to_instance({ "resume": { "cpu_affinity": cpu_affinity } })
+		self.send_message_to_clients(clientmessages.StatusChanged("running"))
+
+		return True
+
 	def reload_simulation(self):
+		# Queued instances start from the beginning anyway
+		if not self.is_launched:
+			return
+
 		self.send_message_to_instance({ "reload": "" })
 
 	def close(self):
 		if not self.is_alive:
 			return
 
-		self.send_message_to_instance({ "stop": "" })
+		if self.is_launched:
+			self.send_message_to_instance({ "stop": "" })
+
 		self._cleanup()
 
 	def is_closed(self):
 		return not self.is_alive
 
+	def is_queued(self):
+		return self.is_alive and not self.is_launched
+
+# The "spawn" context starts a completely new python interpreter, which then has to import everything
+# again. Where it is available, a forkserver with the modules in 'SIM_PRELOAD_MODULES' already imported
+# is used instead. Modules that cannot be imported (e.g. if CellModeller isn't installed) are skipped.
+def get_instance_process_context():
+	global global__process_context
+	global global__process_context_lock
+
+	with global__process_context_lock:
+		if global__process_context is None:
+			start_method = settings.SIM_PROCESS_START_METHOD
+
+			if not start_method in mp.get_all_start_methods():
+				start_method = "spawn"
+
+			global__process_context = mp.get_context(start_method)
+
+			if start_method == "forkserver":
+				global__process_context.set_forkserver_preload(settings.SIM_PRELOAD_MODULES)
+
+		return global__process_context
+
+# Starts the forkserver (if it is used) in the background, so that the first simulation doesn't have to
+# wait for it
+def prewarm_instance_processes():
+	if get_instance_process_context().get_start_method() == "forkserver":
+		from multiprocessing import forkserver
+		forkserver.ensure_running()
+
 def create_instance_from_name(backend_name, params):
 	if backend_name == "CellModeller5":
 		if not settings.ENABLE_CELLMODELLER5:
@@ -152,6 +358,18 @@ def create_instance_from_name(backend_name, params):
 	
 	raise Exception(f"Backend type '{backend_name}' is not supported")
 
+# An output stride of zero means that the stride requested by the model should be used, or
+# that every step should be written if the model doesn't request one
+def create_output_schedule(instance_params, backend, steps_taken=0):
+	step_stride = instance_params.output_stride
+
+	if step_stride <= 0:
+		step_stride = backend.get_model_output_stride() or 1
+
+	io_budget = IOBudget(instance_params.io_budget_bytes_per_second, instance_params.io_budget_write_fraction)
+
+	return OutputSchedule(step_stride, instance_params.output_interval, io_budget, steps_taken)
+
 # This is what actually runs the simulation
 # !!! It runs in a child process !!!
 def instance_control_thread(pipe, instance_params):
@@ -194,6 +412,37 @@ def instance_control_thread(pipe, instance_params):
 		elif action == "reload":
 			nonlocal needs_reload
 			needs_reload = True
+		elif action == "throttle":
+			nonlocal is_throttled
+			is_throttled = data["paused"]
+			update_step_gate()
+		elif action == "pause":
+			nonlocal is_paused
+			is_paused = True
+			update_step_gate()
+		elif action == "resume":
+			nonlocal requested_cpu_affinity
+			requested_cpu_affinity = (data["cpu_affinity"],)
+
+			is_paused = False
+			update_step_gate()
+
+	# The simulation only steps while the gate is open. It is closed while the simulation is paused by
+	# the user or throttled by the fair-share scheduler.
+	step_gate = threading.Event()
+	step_gate.set()
+
+	is_paused = False
+	is_throttled = False
+
+	# Set (as a tuple) when the simulation is resumed, see 'set_cpu_affinity'
+	requested_cpu_affinity = None
+
+	def update_step_gate():
+		if is_paused or is_throttled:
+			step_gate.clear()
+		else:
+			step_gate.set()
 
 	endpoint = DuplexPipeEndpoint(pipe, recv_message_from_control, endpoint_callback)
 	endpoint.start()
@@ -201,13 +450,118 @@ def instance_control_thread(pipe, instance_params):
 	def send_message_to_control(message):
 		endpoint.send_item(encode_pipe_message(message))
 
+	send_message_to_control({ "started": "" })
+
+	# Keep the simulation on the cores the scheduler assigned to it. The affinity only applies to the
+	# calling thread (and the threads it starts afterwards), so it is always set from this thread. When the
+	# simulation is resumed, the new affinity is put in 'requested_cpu_affinity' until the next step.
+	unpinned_cpu_affinity = os.sched_getaffinity(0) if hasattr(os, "sched_setaffinity") else None
+
+	def set_cpu_affinity(cpu_affinity):
+		if unpinned_cpu_affinity is None:
+			return
+
+		os.sched_setaffinity(0, cpu_affinity if cpu_affinity else unpinned_cpu_affinity)
+		print(f"CPU affinity: {sorted(os.sched_getaffinity(0))}")
+
+	if instance_params.cpu_affinity:
+		set_cpu_affinity(instance_params.cpu_affinity)
+
 	print(f"Root directory: {instance_params.root_dir}")
 	print(f"Initial CWD: {os.getcwd()}")
 
 	os.chdir(instance_params.root_dir)
 	print(f"CWD changed to: {os.getcwd()}")
 
-	index_path = "index.json"
+	index_path = archiver.INDEX_FILE_NAME
+
+	# Its better if we update the index file from the simulation process because, otherwise,
+	# some message might get lost when closing the pipe and some step files might not get added
+	# to the index file
+	#
+	# Only the new entry is sent to the server, which adds it to its own copy of the index
+	output_schedule = None
+
+	live_frames = None if instance_params.live_frame_memory is None else LiveFrameRing.attach(instance_params.live_frame_memory)
+
+	# Frames are committed in the order they are submitted, so the frame number of every frame is known
+	# as soon as it is submitted. This lets it be published to live viewers before it is in the index.
+	next_frame = 0
+
+	def publish_live_frame(frame, step, stride, viz_data):
+		if live_frames.publish(frame, viz_data, step, stride):
+			send_message_to_control({ "liveframe": { "frame": frame } })
+
+	def commit_frame(step_path, viz_bin_path, step, stride, write_seconds):
+		frame = archiver.write_entry_to_sim_index(index_path, step_path, viz_bin_path, step, stride)
+
+		# Let the schedule know how much I/O the frame took, so it can stay within the I/O budget
+		byte_count = sum([ os.path.getsize(os.path.join(instance_params.root_dir, path)) for path in [ step_path, viz_bin_path ] ])
+		output_schedule.on_frame_written(byte_count, write_seconds)
+
+		send_message_to_control({ "newframe": { "frame": frame, "step_file": step_path, "viz_file": viz_bin_path, "step": step, "stride": stride } })
+
+	frame_writer = FrameWriter(commit_frame, instance_params.frame_writer_threads, instance_params.frame_queue_depth)
+
+	def submit_frame(step_frame):
+		nonlocal next_frame
+
+		frame = next_frame
+		next_frame += 1
+
+		(step, stride) = (output_schedule.current_step(), output_schedule.step_stride)
+
+		if not live_frames is None:
+			step_frame.viz_data_callback = lambda viz_data: publish_live_frame(frame, step, stride, viz_data)
+
+		frame_writer.submit(step_frame, step, stride)
+
+	# 'process_time' includes the CPU time of every thread in the process (e.g. the frame writers)
+	last_cpu_time = time.process_time()
+	last_cpu_report_time = time.monotonic()
+
+	def report_cpu_time():
+		nonlocal last_cpu_time
+		nonlocal last_cpu_report_time
+
+		if time.monotonic() - last_cpu_report_time < CPU_TIME_REPORT_PERIOD:
+			return
+
+		cpu_time = time.process_time()
+		send_message_to_control({ "cputime": { "seconds": cpu_time - last_cpu_time } })
+
+		last_cpu_time = cpu_time
+		last_cpu_report_time = time.monotonic()
+
+	# A checkpoint is only useful together with the frames before it, so all pending frames are
+	# committed first. The checkpoint is written to a temporary file and then moved into place, so
+	# the index never points to a partially written checkpoint.
+	def write_checkpoint(backend, source_hash):
+		frame_writer.flush()
+
+		checkpoint_dir = os.path.join(instance_params.root_dir, archiver.CHECKPOINT_DIR_NAME)
+		os.makedirs(checkpoint_dir, exist_ok=True)
+
+		checkpoint_file = os.path.join(archiver.CHECKPOINT_DIR_NAME, "checkpoint-%06i.pickle" % output_schedule.steps_taken)
+		checkpoint_path = os.path.join(instance_params.root_dir, checkpoint_file)
+
+		backend.write_checkpoint(checkpoint_path + ".tmp")
+		os.replace(checkpoint_path + ".tmp", checkpoint_path)
+
+		previous_checkpoint = archiver.write_checkpoint_to_sim_index(index_path, {
+			"file": checkpoint_file,
+			"steps_taken": output_schedule.steps_taken,
+			"frame_count": archiver.read_sim_frame_count(index_path),
+			"source_hash": source_hash,
+		})
+
+		if not previous_checkpoint is None and previous_checkpoint["file"] != checkpoint_file:
+			try:
+				os.remove(os.path.join(instance_params.root_dir, previous_checkpoint["file"]))
+			except FileNotFoundError:
+				pass
+
+		print(f"Wrote checkpoint at step {output_schedule.steps_taken}")
 
 	# This is more of a "sanity try-catch". It is here to make sure that
 	# if any exceptions occur, we still properly clean up the simulation instance
@@ -218,35 +572,72 @@ def instance_control_thread(pipe, instance_params):
 		params.cache_dir = os.path.join(params.sim_root_dir, params.cache_relative_prefix)
 		params.max_cell_count = instance_params.max_cell_count
 		
-		index_path = os.path.join(params.sim_root_dir, "index.json")
+		index_path = os.path.join(params.sim_root_dir, archiver.INDEX_FILE_NAME)
+
+		# Only the first run can be resumed. Reloading always starts the simulation over.
+		checkpoint = instance_params.checkpoint
 
 		while True:
 			# Read source file
 			with open(instance_params.source_path, "rt") as srcfile:
 				params.source = srcfile.read()
 
+			source_hash = archiver.hash_simulation_source(params.source)
+
 			# Create backend
+			initialize_start_time = time.perf_counter()
+
 			backend = create_instance_from_name(instance_params.backend, params)
 			backend.initialize()
 
+			send_message_to_control({ "initialized": { "seconds": time.perf_counter() - initialize_start_time } })
+
+			steps_taken = 0
+
+			if not checkpoint is None:
+				print(f"Resuming from checkpoint at step {checkpoint['steps_taken']}")
+
+				backend.restore_checkpoint(os.path.join(params.sim_root_dir, checkpoint["file"]))
+				steps_taken = checkpoint["steps_taken"]
+				checkpoint = None
+
 			# Write shapes
-			index_data = archiver.write_shapes_to_sim_index(index_path, backend.get_shape_list())
+			shape_list = backend.get_shape_list()
+			archiver.write_shapes_to_sim_index(index_path, shape_list)
 			
-			send_message_to_control({ "newshape": { "new_data": index_data } })
+			send_message_to_control({ "newshape": { "shape_list": shape_list } })
+
+			output_schedule = create_output_schedule(instance_params, backend, steps_taken)
+			next_frame = archiver.read_sim_frame_count(index_path)
+			print(f"Output schedule: every {output_schedule.step_stride} step(s), at least {output_schedule.min_interval}s apart")
+
+			use_checkpoints = instance_params.checkpoint_interval > 0 and backend.supports_checkpoints()
+			last_checkpoint_time = time.monotonic()
 
 			while running and backend.is_running() and not needs_reload:
+				# Wait while the simulation is paused or throttled
+				while not step_gate.wait(STEP_GATE_POLL_PERIOD) and running and not needs_reload:
+					pass
+
+				if not running or needs_reload:
+					break
+
+				if not requested_cpu_affinity is None:
+					set_cpu_affinity(requested_cpu_affinity[0])
+					requested_cpu_affinity = None
+
 				# Take another step in the simulation
 				backend.step()
+				report_cpu_time()
 
-				# Write step files
-				step_path, viz_bin_path = backend.write_step_files()
+				# Capture the frame and hand it off to the frame writer. The step files are written
+				# and added to the index in the background while the next step runs.
+				if output_schedule.step_completed():
+					submit_frame(backend.capture_step_frame())
 
-				# Its better if we update the index file from the simulation process because, otherwise,
-				# some message might get lost when closing the pipe and some step files might not get added
-				# to the index file
-				index_data, frame_count = archiver.write_entry_to_sim_index(index_path, step_path, viz_bin_path)
-
-				send_message_to_control({ "newframe": { "frame_count": frame_count, "new_data": index_data } })
+				if use_checkpoints and time.monotonic() - last_checkpoint_time >= instance_params.checkpoint_interval:
+					write_checkpoint(backend, source_hash)
+					last_checkpoint_time = time.monotonic()
 
 				# NOTE(Jason): The stream won't write the results to a file immediately after getting some data.
 				# If we close Django from the terminal (with Ctrl+C or Ctrl+Break), then the simulation
@@ -256,15 +647,26 @@ def instance_control_thread(pipe, instance_params):
 				sys.stdout.flush()
 				sys.stderr.flush()
 
+			# If the simulation finished by itself, we always want to have its final state
+			if running and not needs_reload and output_schedule.has_unwritten_step():
+				submit_frame(backend.capture_step_frame())
+
+			# Make sure all the frames of this run are in the index before it gets reset
+			frame_writer.flush()
+
 			backend.shutdown()
 
 			# Handle simulation reload
 			if needs_reload:
 				needs_reload = False
 
+				# The new run numbers its frames from zero again
+				if not live_frames is None:
+					live_frames.clear()
+
 				index_data = archiver.write_empty_index_file(index_path, instance_params.backend)
 
-				send_message_to_control({ "newframe": { "frame_count": 0, "new_data": index_data } })
+				send_message_to_control({ "resetindex": { "new_data": index_data } })
 
 				continue
 
@@ -278,11 +680,18 @@ def instance_control_thread(pipe, instance_params):
 		exc_message = traceback.format_exc()
 		print(exc_message)
 
-		index_data = archiver.write_crash_to_sim_index(index_path, str(exc_message))
-		send_message_to_control({ "error_message": { "new_data": index_data } })
+		# Let the frames that are still being written finish before we write to the index
+		frame_writer.close()
+
+		archiver.write_crash_to_sim_index(index_path, str(exc_message))
+		send_message_to_control({ "error_message": { "crash_message": str(exc_message) } })
 		send_message_to_control({ "close": { "abrupt": True } })
 	finally:
+		frame_writer.close()
 		endpoint.shutdown()
 
+		if not live_frames is None:
+			live_frames.close()
+
 	if redirect_io_to_file:
 		log_stream.close()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from cloudserver.models import lookup_simulation_by_name
+from saveviewer import archiver
+from simrunner import batch
+
+# Imports the variants of a batch run (see 'runbatch') into the server, so that they can be viewed
+# like any other simulation. The variants are named '<title> #<index> (<parameters>)'.
+class Command(BaseCommand):
+	help = "Imports the variants of a batch run into the save archive"
+
+	def add_arguments(self, parser):
+		parser.add_argument("directory", help="Output directory of the batch run")
+		parser.add_argument("--owner", required=True, help="Username of the owner of the imported simulations")
+		parser.add_argument("--title", help="Title prefix of the imported simulations (defaults to the directory name)")
+		parser.add_argument("--include-failed", action="store_true", help="Also import the variants that failed")
+
+	def handle(self, *args, **options):
+		try:
+			owner = get_user_model().objects.get(username=options["owner"])
+		except get_user_model().DoesNotExist:
+			raise CommandError(f"User '{options['owner']}' does not exist")
+
+		batch_dir = os.path.abspath(options["directory"])
+		manifest = batch.read_batch_manifest(batch_dir)
+		title = options["title"] or os.path.basename(batch_dir)
+
+		archiver.initialize_save_archiver()
+
+		for (index, variant) in enumerate(manifest["variants"]):
+			if variant["status"] == "pending" or (variant["status"] == "failed" and not options["include_failed"]):
+				continue
+
+			parameters = ", ".join([ f"{name}={value}" for (name, value) in variant["parameters"].items() ])
+			sim_title = f"{title} #{index} ({parameters})"
+
+			if not lookup_simulation_by_name(sim_title) is None:
+				self.stdout.write(f"Skipping '{sim_title}', a simulation with that name already exists")
+				continue
+
+			entry = archiver.import_simulation(owner, sim_title, "", os.path.join(batch_dir, variant["directory"]))
+			self.stdout.write(f"Imported '{sim_title}' as {entry.uuid}")
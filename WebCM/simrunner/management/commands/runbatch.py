@@ -0,0 +1,72 @@
+import ast
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from simrunner import batch
+
+# Runs every combination of a set of parameters of a simulation script, without the server. For example:
+#
+#	python manage.py runbatch ../Examples/ex2_constGene.py --param "max_cells=[1024, 4096]" --steps 200 --output ./batch-output
+#
+# Parameters replace the values of top-level assignments in the script. The results can be imported
+# into the server with 'importbatch'.
+class Command(BaseCommand):
+	help = "Runs a parameter sweep of a simulation script on a pool of worker processes"
+
+	def add_arguments(self, parser):
+		parser.add_argument("source", help="Path to the simulation script")
+		parser.add_argument("--output", required=True, help="Directory the variants are written to")
+		parser.add_argument("--steps", type=int, required=True, help="Number of steps each variant runs for")
+		parser.add_argument("--param", action="append", default=[], help="A parameter and the list of values it takes, e.g. \"max_cells=[1024, 4096]\"")
+		parser.add_argument("--grid", help="JSON file that maps parameter names to lists of values")
+		parser.add_argument("--backend", default="CellModeller4", help="Backend version used to run the variants")
+		parser.add_argument("--workers", type=int, default=0, help="Number of worker processes (defaults to the number of cores)")
+		parser.add_argument("--stride", type=int, default=0, help="Number of steps between frames (defaults to the stride set by the script)")
+		parser.add_argument("--max-cells", type=int, default=0, help="Maximum number of cells in a variant")
+
+	def handle(self, *args, **options):
+		with open(options["source"], "rt") as source_file:
+			source = source_file.read()
+
+		grid = {}
+
+		if options["grid"]:
+			with open(options["grid"], "r") as grid_file:
+				grid.update(json.loads(grid_file.read()))
+
+		for param in options["param"]:
+			(name, separator, values) = param.partition("=")
+
+			try:
+				values = ast.literal_eval(values)
+			except (ValueError, SyntaxError):
+				raise CommandError(f"Invalid values for parameter '{name}': {values}")
+
+			if not separator or not type(values) is list:
+				raise CommandError(f"Parameters must be given as name=[values], not '{param}'")
+
+			grid[name.strip()] = values
+
+		template = batch.BatchVariant()
+		template.backend = options["backend"]
+		template.step_count = options["steps"]
+		template.max_cell_count = options["max_cells"]
+		template.output_stride = options["stride"]
+		template.frame_writer_threads = settings.SIM_FRAME_WRITER_THREADS
+		template.frame_queue_depth = settings.SIM_FRAME_QUEUE_DEPTH
+
+		try:
+			# Check the parameters before starting any workers
+			batch.apply_parameters_to_source(source, { name: values[0] for (name, values) in grid.items() if len(values) > 0 })
+		except ValueError as e:
+			raise CommandError(str(e))
+
+		def on_variant_done(variant):
+			self.stdout.write(f"{variant['directory']}: {variant['status']} {variant['parameters']}")
+
+		manifest = batch.run_batch(source, grid, options["output"], template, options["workers"], on_variant_done)
+
+		failed_count = len([ variant for variant in manifest["variants"] if variant["status"] == "failed" ])
+		self.stdout.write(f"Finished {len(manifest['variants']) - failed_count} of {len(manifest['variants'])} variants")
@@ -0,0 +1,716 @@
+import io
+import os
+import numpy
+import contextlib
+import types
+import uuid
+import queue
+import struct
+import shutil
+import tempfile
+import threading
+import unittest
+import unittest.mock as mock
+import multiprocessing as mp
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+
+from cloudserver import settings
+from saveviewer import archiver
+from simrunner import websocket_groups as wsgroups
+from saveviewer.frameindex import FrameIndex
+from simrunner.backends.backend import BackendParameters
+from simrunner.backends.cellmodeller4 import CellModeller4Backend, pack_norm_color, pack_viz_cell_data
+from simrunner.instances import manager
+from simrunner.instances import clientmessages
+from simrunner.instances import duplex_pipe_endpoint
+from simrunner.instances import output_schedule
+from simrunner.instances.siminstance import SimulationInstance, _InstanceProcessParams, create_output_schedule
+from simrunner.instances.frame_writer import FrameWriter
+from simrunner.instances.duplex_pipe_endpoint import DuplexPipeEndpoint, PipeEndpointSignal, PipeHub, PipeWaker, encode_pipe_batch, decode_pipe_batch
+from simrunner.instances.output_schedule import OutputSchedule, IOBudget
+
+# A frame that only finishes writing once it is released
+class _TestFrame:
+	def __init__(self, name):
+		self.name = name
+		self.release_event = threading.Event()
+
+	def write(self):
+		assert self.release_event.wait(10.0)
+
+		return (f"{self.name}.step", f"{self.name}.viz")
+
+class FrameWriterTests(unittest.TestCase):
+	def setUp(self):
+		self.commits = []
+
+	def commit_frame(self, step_path, viz_path, frame, write_seconds):
+		self.commits.append((step_path, viz_path, frame))
+
+	def test_commits_in_submission_order(self):
+		frames = [ _TestFrame(f"frame-{it}") for it in range(4) ]
+		writer = FrameWriter(self.commit_frame, worker_count=4, queue_depth=4)
+
+		for (index, frame) in enumerate(frames):
+			writer.submit(frame, index)
+
+		# The frames finish writing in reverse order
+		for frame in reversed(frames):
+			frame.release_event.set()
+
+		writer.flush()
+		writer.close()
+
+		self.assertEqual(self.commits, [ (f"frame-{it}.step", f"frame-{it}.viz", it) for it in range(4) ])
+
+	def test_submit_blocks_when_queue_is_full(self):
+		frames = [ _TestFrame(f"frame-{it}") for it in range(3) ]
+		writer = FrameWriter(self.commit_frame, worker_count=2, queue_depth=2)
+
+		writer.submit(frames[0], 0)
+		writer.submit(frames[1], 1)
+
+		submitted_event = threading.Event()
+
+		def submit_last_frame():
+			writer.submit(frames[2], 2)
+			submitted_event.set()
+
+		submit_thread = threading.Thread(target=submit_last_frame, daemon=True)
+		submit_thread.start()
+
+		# Both slots are taken by frames that haven't been committed
+		self.assertFalse(submitted_event.wait(0.2))
+
+		# A frame that is written but waits for an older frame to be committed still holds its slot
+		frames[1].release_event.set()
+		self.assertFalse(submitted_event.wait(0.2))
+
+		frames[0].release_event.set()
+		self.assertTrue(submitted_event.wait(10.0))
+
+		frames[2].release_event.set()
+		writer.close()
+
+		self.assertEqual([ commit[2] for commit in self.commits ], [ 0, 1, 2 ])
+
+	def test_failed_frame_stops_later_commits(self):
+		class _FailingFrame:
+			def write(self):
+				raise OSError("Disk full")
+
+		frame = _TestFrame("frame-1")
+		frame.release_event.set()
+
+		writer = FrameWriter(self.commit_frame, worker_count=2, queue_depth=4)
+		writer.submit(_FailingFrame(), 0)
+		writer.submit(frame, 1)
+
+		with self.assertRaises(OSError):
+			writer.flush()
+
+		writer.close()
+
+		self.assertEqual(self.commits, [])
+
+class _TestCellModellerState:
+	def __init__(self, id, pos, dir, length, radius, color):
+		self.id = id
+		self.pos = pos
+		self.dir = dir
+		self.length = length
+		self.radius = radius
+		self.color = color
+
+class VizCellDataTests(unittest.TestCase):
+	def test_matches_per_cell_layout(self):
+		states = {
+			4: _TestCellModellerState(4, [ 1.0, 2.0, 3.0 ], [ 0.0, 0.0, 1.0 ], 3.0, 0.5, [ 1.0, 0.5, 0.0 ]),
+			9: _TestCellModellerState(9, [ -1.0, 0.5, 8.0 ], [ 1.0, 0.0, 0.0 ], 0.2, 0.5, [ 0.0, 2.0, -1.0 ]),
+		}
+
+		(cell_data, cell_ids) = pack_viz_cell_data(states)
+
+		# This is how every cell used to be packed, one at a time
+		expected_data = b""
+
+		for state in states.values():
+			expected_data += struct.pack("<fff", state.pos[0], state.pos[2], state.pos[1])
+			expected_data += struct.pack("<fff", state.dir[0], state.dir[2], state.dir[1])
+			expected_data += struct.pack("<ffI", max(state.length + 1.0 - 2.0 * state.radius, 0), state.radius, pack_norm_color(*state.color[:3], 1.0))
+
+		self.assertEqual(cell_data.tobytes(), expected_data)
+		self.assertEqual(cell_ids.tobytes(), struct.pack("<QQ", 4, 9))
+
+	def test_no_cells(self):
+		(cell_data, cell_ids) = pack_viz_cell_data({})
+
+		self.assertEqual(len(cell_data.tobytes()) + len(cell_ids.tobytes()), 0)
+
+class SignalGridTests(unittest.TestCase):
+	def test_packed_colors_follow_grid_changes(self):
+		backend = CellModeller4Backend(BackendParameters())
+
+		# CellModeller updates the grid in place
+		voxels = numpy.zeros((4, 5, 6), dtype=numpy.float32)
+		signals = types.SimpleNamespace(voxels=voxels, cell_count=[ 4, 5, 6 ])
+
+		colors = backend._pack_signal_colors(signals)
+		self.assertIs(backend._pack_signal_colors(signals), colors)
+
+		voxels[1, 2, 3] = 0.5
+		changed_colors = backend._pack_signal_colors(signals)
+
+		self.assertIsNot(changed_colors, colors)
+		self.assertEqual(changed_colors[2, 3, 1], (127 << 24) | 127)
+
+class PipeEndpointTests(unittest.TestCase):
+	def test_waker_writes_once_until_cleared(self):
+		waker = PipeWaker()
+
+		waker.wake()
+		waker.wake()
+
+		self.assertTrue(waker.reader.poll())
+		waker.reader.recv_bytes()
+		self.assertFalse(waker.reader.poll())
+
+		waker.clear()
+		waker.wake()
+		self.assertTrue(waker.reader.poll())
+
+		waker.clear()
+		waker.close()
+
+		# Waking a closed waker does nothing
+		waker.wake()
+
+	def test_messages_are_handled_as_they_arrive(self):
+		(connection, other_connection) = mp.Pipe()
+		received_event = threading.Event()
+		received = []
+
+		def receive_message(message):
+			received.append(message)
+			received_event.set()
+
+		endpoint = DuplexPipeEndpoint(connection, receive_message)
+		endpoint.start()
+
+		try:
+			other_connection.send_bytes(encode_pipe_batch([ { "step": 1 } ]))
+			self.assertTrue(received_event.wait(1.0))
+			self.assertEqual(received, [ { "step": 1 } ])
+
+			# Queued messages wake the endpoint up and are sent right away
+			endpoint.send_item({ "reply": "" })
+
+			self.assertTrue(other_connection.poll(1.0))
+			self.assertEqual(decode_pipe_batch(other_connection.recv_bytes()), [ { "reply": "" } ])
+		finally:
+			endpoint.close()
+			other_connection.close()
+
+		self.assertFalse(endpoint.is_alive())
+
+# A hub that only services its endpoints when asked to
+class _TestPipeHub:
+	def __init__(self):
+		self.thread = None
+		self.endpoints = []
+
+	def add_endpoint(self, endpoint):
+		self.endpoints.append(endpoint)
+
+	def wakeup(self):
+		pass
+
+class PipeBatchTests(unittest.TestCase):
+	def test_batch_round_trip(self):
+		items = [ { "newframe": { "frame": 3, "step_file": "./step-00004.cm5_step" } }, { "data": b"\x00\x01" }, PipeEndpointSignal.CLOSE_NOTIFICATION ]
+
+		self.assertEqual(decode_pipe_batch(encode_pipe_batch(items)), items)
+
+	def test_queued_items_are_sent_in_one_write(self):
+		(connection, other_connection) = mp.Pipe()
+
+		endpoint = DuplexPipeEndpoint(connection, None, hub=_TestPipeHub())
+		endpoint.start()
+
+		for frame in range(3):
+			endpoint.send_item({ "newframe": { "frame": frame } })
+
+		endpoint.service()
+
+		self.assertEqual(decode_pipe_batch(other_connection.recv_bytes()), [ { "newframe": { "frame": frame } } for frame in range(3) ])
+		self.assertFalse(other_connection.poll())
+
+		# Signals go out in the same batch as the items queued before them
+		endpoint.send_item({ "close": "" })
+		endpoint.send_item(PipeEndpointSignal.CLOSE_NOTIFICATION)
+		endpoint.service()
+
+		self.assertEqual(decode_pipe_batch(other_connection.recv_bytes()), [ { "close": "" }, PipeEndpointSignal.CLOSE_NOTIFICATION ])
+
+		connection.close()
+		other_connection.close()
+
+class PipeHubTests(unittest.TestCase):
+	def test_hub_services_every_endpoint(self):
+		self.check_hub()
+
+	# Windows can only wait on a few handles at once, so the hub waits on groups of connections
+	def test_hub_with_wait_handle_limit(self):
+		with mock.patch.object(duplex_pipe_endpoint, "PIPE_WAIT_HANDLE_LIMIT", 2):
+			self.check_hub()
+
+	def check_hub(self):
+		hub = PipeHub()
+		received = { it: queue.Queue() for it in range(3) }
+
+		pipes = [ mp.Pipe() for _ in range(3) ]
+		endpoints = [ DuplexPipeEndpoint(pipes[it][0], received[it].put, hub=hub) for it in range(3) ]
+
+		for endpoint in endpoints:
+			endpoint.start()
+
+		try:
+			for it in reversed(range(3)):
+				pipes[it][1].send_bytes(encode_pipe_batch([ { "frame": it } ]))
+
+			for it in range(3):
+				self.assertEqual(received[it].get(timeout=1.0), { "frame": it })
+
+			for it in range(3):
+				endpoints[it].send_item({ "reply": it })
+
+			for it in range(3):
+				self.assertTrue(pipes[it][1].poll(1.0))
+				self.assertEqual(decode_pipe_batch(pipes[it][1].recv_bytes()), [ { "reply": it } ])
+
+			# An endpoint whose other end goes away is removed, the others keep working
+			pipes[0][1].close()
+
+			self.assertTrue(endpoints[0].finished.wait(1.0))
+			self.assertFalse(endpoints[0].is_alive())
+
+			pipes[1][1].send_bytes(encode_pipe_batch([ { "frame": 4 } ]))
+			self.assertEqual(received[1].get(timeout=1.0), { "frame": 4 })
+			self.assertEqual(hub.endpoint_count(), 2)
+		finally:
+			for endpoint in endpoints[1:]:
+				endpoint.close()
+
+		self.assertEqual(hub.endpoint_count(), 0)
+
+# The time as seen by the output schedule
+class _TestClock:
+	def __init__(self):
+		self.now = 100.0
+
+	def monotonic(self):
+		return self.now
+
+class OutputScheduleTests(unittest.TestCase):
+	def take_steps(self, schedule, step_count, seconds_per_step=0.0, clock=None):
+		written_steps = []
+
+		for _ in range(step_count):
+			if schedule.step_completed():
+				written_steps.append(schedule.current_step())
+
+			if not clock is None:
+				clock.now += seconds_per_step
+
+		return written_steps
+
+	def test_step_stride(self):
+		schedule = OutputSchedule(step_stride=3)
+
+		self.assertEqual(self.take_steps(schedule, 8), [ 1, 4, 7 ])
+		self.assertTrue(schedule.has_unwritten_step())
+
+		# Resumed simulations keep counting from their checkpoint
+		schedule = OutputSchedule(step_stride=3, steps_taken=6)
+		self.assertEqual(self.take_steps(schedule, 4), [ 7, 10 ])
+		self.assertFalse(schedule.has_unwritten_step())
+
+	def test_min_interval(self):
+		clock = _TestClock()
+
+		with mock.patch.object(output_schedule, "time", clock):
+			schedule = OutputSchedule(step_stride=1, min_interval=1.0)
+
+			self.assertEqual(self.take_steps(schedule, 10, 0.3, clock), [ 1, 5, 9 ])
+
+	def test_model_stride(self):
+		class _TestSimulatorModule:
+			class Simulator:
+				def __init__(self, pickleSteps=50):
+					pass
+
+		backend = CellModeller4Backend(BackendParameters())
+		backend.sim_module = _TestSimulatorModule
+		backend.simulation = types.SimpleNamespace(pickleSteps=50)
+
+		instance_params = _InstanceProcessParams()
+
+		# The default value doesn't count as a stride requested by the model
+		self.assertEqual(create_output_schedule(instance_params, backend).step_stride, 1)
+
+		backend.simulation.pickleSteps = 20
+		self.assertEqual(create_output_schedule(instance_params, backend).step_stride, 20)
+
+		# A stride set for the simulation overrides the model
+		instance_params.output_stride = 5
+		self.assertEqual(create_output_schedule(instance_params, backend).step_stride, 5)
+
+# Reports a fixed sequence of budget usages
+class _TestIOBudget:
+	def __init__(self, usages):
+		self.usages = usages
+
+	def is_enabled(self):
+		return True
+
+	def record_frame(self, byte_count, write_seconds):
+		return self.usages.pop(0)
+
+class IOBudgetTests(unittest.TestCase):
+	def test_budget_usage(self):
+		clock = _TestClock()
+
+		with mock.patch.object(output_schedule, "time", clock):
+			self.assertFalse(IOBudget().is_enabled())
+
+			budget = IOBudget(max_bytes_per_second=1000.0, window=5.0)
+
+			# The usage is only known once the window has ended
+			self.assertIsNone(budget.record_frame(1000, 0.1))
+
+			clock.now += 10.0
+			self.assertAlmostEqual(budget.record_frame(9000, 0.1), 1.0)
+
+			clock.now += 10.0
+			self.assertAlmostEqual(budget.record_frame(2000, 0.1), 0.2)
+
+			# The larger part of the budget counts
+			budget = IOBudget(max_bytes_per_second=1000.0, max_write_fraction=0.1, window=5.0)
+
+			clock.now += 10.0
+			self.assertAlmostEqual(budget.record_frame(1000, 2.0), 2.0)
+
+	def test_decimation(self):
+		schedule = OutputSchedule(step_stride=2, io_budget=_TestIOBudget([ 2.5, None, 1.5, 0.3, 0.8, 0.1, 0.1 ]))
+		strides = []
+
+		# The schedule prints every change of the stride
+		with contextlib.redirect_stdout(io.StringIO()):
+			for _ in range(7):
+				schedule.on_frame_written(0, 0.0)
+				schedule.step_completed()
+
+				strides.append(schedule.step_stride)
+
+		# Over the budget, the stride grows by the (rounded up) usage. Well below it, it is halved,
+		# but never below the base stride.
+		self.assertEqual(strides, [ 6, 6, 12, 6, 6, 2, 2 ])
+
+# Stands in for CellModeller's 'Simulator', which numbers its steps from one ('stepNum' is incremented
+# at the end of every step)
+class _TestSimulator:
+	def __init__(self, output_dir):
+		self.stepNum = 0
+		self.cellStates = {}
+		self.renderers = []
+		self.outputDirPath = output_dir
+
+	def step(self):
+		self.stepNum += 1
+
+class OutputStepTests(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		os.mkdir(os.path.join(self.directory, "cache"))
+
+	def tearDown(self):
+		archiver.release_sim_index(os.path.join(self.directory, archiver.INDEX_FILE_NAME))
+		shutil.rmtree(self.directory)
+
+	def test_frames_record_the_step_of_their_files(self):
+		params = BackendParameters()
+		params.sim_root_dir = self.directory
+		params.cache_relative_prefix = "cache"
+		params.cache_dir = os.path.join(self.directory, "cache")
+
+		backend = CellModeller4Backend(params)
+		backend.simulation = _TestSimulator(self.directory)
+		backend.render_module = types.SimpleNamespace()
+
+		index_path = os.path.join(self.directory, archiver.INDEX_FILE_NAME)
+
+		def commit_frame(step_path, viz_path, step, stride, write_seconds):
+			archiver.write_entry_to_sim_index(index_path, step_path, viz_path, step, stride)
+
+		schedule = OutputSchedule(step_stride=3)
+		writer = FrameWriter(commit_frame)
+
+		for _ in range(7):
+			backend.simulation.step()
+
+			if schedule.step_completed():
+				writer.submit(backend.capture_step_frame(), schedule.current_step(), schedule.step_stride)
+
+		writer.close()
+
+		self.assertEqual(archiver.read_sim_frame_count(index_path), 3)
+
+		frame_index = FrameIndex(os.path.join(self.directory, archiver.FRAME_INDEX_FILE_NAME))
+
+		for (frame, expected_step) in enumerate([ 1, 4, 7 ]):
+			(step_file, viz_file, step, stride) = frame_index.lookup(frame)
+
+			self.assertEqual((step, stride), (expected_step, 3))
+			self.assertEqual(os.path.basename(step_file), "step-%05i.cm5_step" % expected_step)
+			self.assertEqual(os.path.basename(viz_file), "step-%05i.cm5_viz" % expected_step)
+			self.assertTrue(os.path.exists(os.path.join(self.directory, step_file)))
+
+		frame_index.close()
+
+# Records the messages sent to the viewers of a simulation
+class _TestConsumer:
+	def __init__(self):
+		self.messages = []
+
+	def send_client_message(self, message):
+		self.messages.append(message)
+
+	def on_websocket_group_closed(self):
+		pass
+
+class IndexDeltaTests(TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.archive_root = archiver.global__archiver.archive_root
+		archiver.global__archiver.archive_root = self.directory
+
+		user = User.objects.create_user("test-user", password="test-password")
+		self.simulation = archiver.register_simulation(user, "Test simulation", "", 0)
+
+		self.index_path = os.path.join(self.simulation.save_location, archiver.INDEX_FILE_NAME)
+		archiver.update_instance_index(self.simulation.uuid, archiver.write_empty_index_file(self.index_path, "CellModeller4"))
+
+		# Launch metrics are only recorded for the first frame
+		self.instance = SimulationInstance(self.simulation.uuid, "CellModeller4", self.simulation.save_location)
+		self.instance.has_received_frame = True
+
+		self.consumer = _TestConsumer()
+		self.group_name = f"simcomms/{self.simulation.uuid}"
+		wsgroups.add_websocket_to_group(self.group_name, self.consumer)
+
+	def tearDown(self):
+		wsgroups.remove_websocket_from_group(self.group_name, self.consumer)
+
+		archiver.release_sim_index(self.index_path)
+		archiver.global__archiver.archive_root = self.archive_root
+		shutil.rmtree(self.directory)
+
+	def receive(self, message):
+		self.instance.recv_message_from_instance(message)
+
+	def announced_frames(self):
+		return [ message.frame_count for message in self.consumer.messages if type(message) == clientmessages.NewFrame ]
+
+	def test_frames_are_applied_to_the_server_index(self):
+		uuid = self.simulation.uuid
+
+		self.receive({ "newframe": { "frame": 0, "step_file": "./step-00001.cm5_step", "viz_file": "cache/step-00001.cm5_viz", "step": 1, "stride": 1 } })
+
+		# The simulation process writes the frame index itself, so the server only has the delta
+		self.assertEqual(archiver.get_instance_index_data(uuid)["num_frames"], 1)
+		self.assertEqual(archiver.get_simulation_step_files(uuid, 0), (os.path.join(self.simulation.save_location, "./step-00001.cm5_step"), os.path.join(self.simulation.save_location, "cache/step-00001.cm5_viz")))
+		self.assertEqual(archiver.get_simulation_frame_step(uuid, 0), (1, 1))
+
+		self.receive({ "newshape": { "shape_list": [ { "type": "sphere" } ] } })
+		self.assertEqual(archiver.get_instance_index_data(uuid)["shape_list"], [ { "type": "sphere" } ])
+
+		index_data = archiver.write_empty_index_file(self.index_path, "CellModeller4")
+		self.receive({ "resetindex": { "new_data": index_data } })
+
+		self.assertEqual(archiver.get_instance_index_data(uuid)["num_frames"], 0)
+		self.assertIsNone(archiver.get_simulation_step_files(uuid, 0))
+
+		self.assertEqual(self.announced_frames(), [ 0, 0 ])
+
+	def test_live_frames_are_announced_once(self):
+		self.receive({ "liveframe": { "frame": 0 } })
+		self.receive({ "liveframe": { "frame": 2 } })
+		self.receive({ "liveframe": { "frame": 1 } })
+
+		for frame in range(3):
+			self.receive({ "newframe": { "frame": frame, "step_file": f"./step-{frame}.cm5_step", "viz_file": f"cache/step-{frame}.cm5_viz", "step": frame + 1, "stride": 1 } })
+
+		self.assertEqual(self.announced_frames(), [ 0, 2 ])
+		self.assertEqual(archiver.get_instance_index_data(self.simulation.uuid)["num_frames"], 3)
+
+# Stands in for 'SimulationInstance' in the scheduler, without starting any processes
+class _TestSchedulerInstance:
+	def __init__(self, owner_id=None):
+		self.uuid = uuid.uuid4()
+		self.owner_id = owner_id
+		self.is_alive = True
+		self.is_launched = False
+		self.is_paused = False
+		self.core_slot = None
+		self.priority = 0
+		self.cpu_affinity = None
+		self.resumed_count = 0
+
+	def prepare(self, resume):
+		pass
+
+	def launch(self, pipe_hub=None, cpu_affinity=None):
+		self.is_launched = True
+		self.cpu_affinity = cpu_affinity
+
+	def pause(self):
+		if not self.is_launched or self.is_paused:
+			return False
+
+		self.is_paused = True
+		return True
+
+	def resume(self, cpu_affinity=None):
+		if not self.is_paused:
+			return False
+
+		self.is_paused = False
+		self.cpu_affinity = cpu_affinity
+		self.resumed_count += 1
+
+		return True
+
+	def send_message_to_clients(self, message):
+		pass
+
+	def is_closed(self):
+		return not self.is_alive
+
+	def is_queued(self):
+		return self.is_alive and not self.is_launched
+
+	# What happens once the process of the instance has stopped
+	def stop(self):
+		self.is_alive = False
+		self.closed_callback(self)
+
+class SchedulerTests(unittest.TestCase):
+	def setUp(self):
+		patches = [
+			mock.patch.object(settings, "SIM_MAX_RUNNING_INSTANCES", 2),
+			mock.patch.object(settings, "SIM_PIN_INSTANCES_TO_CORES", False),
+			mock.patch.object(manager, "global__active_instances", {}),
+			mock.patch.object(manager, "global__pending_instances", []),
+			mock.patch.object(manager, "global__launched_instances", set()),
+			mock.patch.object(manager, "global__core_slots", [ [ 0 ], [ 1 ] ]),
+			mock.patch.object(manager, "global__free_core_slots", [ 1, 0 ]),
+			mock.patch.object(manager, "get_pipe_hub", lambda: None),
+			mock.patch.object(manager, "get_fair_share_scheduler", lambda: types.SimpleNamespace(add_usage=None)),
+			mock.patch.object(manager.wsgroups, "send_message_to_websocket_group", lambda *args: None),
+		]
+
+		for patch in patches:
+			patch.start()
+			self.addCleanup(patch.stop)
+
+	def schedule(self, owner_id=None, cpu_share=1.0, priority=0):
+		sim_instance = _TestSchedulerInstance(owner_id)
+
+		with manager.global__instance_lock:
+			getattr(manager, "__schedule_instance")(sim_instance, cpu_share, priority=priority)
+
+		return sim_instance
+
+	def launched(self, instances):
+		return [ instance.is_launched for instance in instances ]
+
+	def test_instances_wait_for_a_slot(self):
+		instances = [ self.schedule() for _ in range(4) ]
+
+		self.assertEqual(self.launched(instances), [ True, True, False, False ])
+		self.assertEqual(manager.get_simulation_status(instances[2].uuid), "queued")
+
+		# A queued instance that is closed never launches
+		instances[2].is_alive = False
+
+		instances[0].stop()
+		self.assertEqual(self.launched(instances), [ True, True, False, True ])
+
+	def test_admission_order(self):
+		first = self.schedule(owner_id=1)
+		self.schedule(owner_id=1)
+
+		late_instance = self.schedule(owner_id=1)
+		other_user_instance = self.schedule(owner_id=2)
+		urgent_instance = self.schedule(owner_id=1, priority=-1)
+
+		# Lower priorities go first
+		first.stop()
+		self.assertEqual(self.launched([ late_instance, other_user_instance, urgent_instance ]), [ False, False, True ])
+
+		# Then the user with the fewest running instances
+		urgent_instance.stop()
+		self.assertEqual(self.launched([ late_instance, other_user_instance ]), [ False, True ])
+
+	def test_admission_follows_cpu_shares(self):
+		with mock.patch.object(settings, "SIM_MAX_RUNNING_INSTANCES", 3):
+			self.schedule(owner_id=1, cpu_share=1.0)
+			self.schedule(owner_id=2, cpu_share=2.0)
+			other_user_instance = self.schedule(owner_id=3)
+
+			# Both users have one instance running, but the second one is entitled to twice as much
+			instances = [ self.schedule(owner_id=1, cpu_share=1.0), self.schedule(owner_id=2, cpu_share=2.0) ]
+
+			other_user_instance.stop()
+			self.assertEqual(self.launched(instances), [ False, True ])
+
+	def test_lone_instances_are_not_pinned(self):
+		with mock.patch.object(settings, "SIM_PIN_INSTANCES_TO_CORES", True):
+			instances = [ self.schedule() for _ in range(2) ]
+
+		self.assertIsNone(instances[0].cpu_affinity)
+		self.assertEqual(instances[1].cpu_affinity, [ 0 ])
+
+		instances[1].stop()
+		self.assertEqual(manager.global__free_core_slots, [ 1, 0 ])
+
+	def test_paused_instances_give_up_their_slot(self):
+		instances = [ self.schedule() for _ in range(3) ]
+
+		self.assertTrue(manager.pause_simulation(instances[0].uuid))
+		self.assertEqual(self.launched(instances), [ True, True, True ])
+		self.assertEqual(manager.get_simulation_status(instances[0].uuid), "paused")
+
+		# Resuming waits for a slot
+		self.assertTrue(manager.resume_simulation(instances[0].uuid))
+		self.assertEqual(manager.get_simulation_status(instances[0].uuid), "queued")
+
+		instances[1].stop()
+		self.assertEqual(manager.get_simulation_status(instances[0].uuid), "running")
+		self.assertEqual(instances[0].resumed_count, 1)
+
+		# Pausing again while it waits for a slot keeps it paused, without a second resume
+		self.assertTrue(manager.pause_simulation(instances[0].uuid))
+		self.assertTrue(self.schedule().is_launched)
+
+		self.assertTrue(manager.resume_simulation(instances[0].uuid))
+		self.assertEqual(manager.get_simulation_status(instances[0].uuid), "queued")
+
+		self.assertTrue(manager.pause_simulation(instances[0].uuid))
+		self.assertEqual(manager.get_simulation_status(instances[0].uuid), "paused")
+
+		instances[2].stop()
+		self.assertEqual(instances[0].resumed_count, 1)
+		self.assertEqual(manager.get_simulation_status(instances[0].uuid), "paused")
@@ -174,7 +174,7 @@ async function refreshSimList() {
 	}
 
 	for (let sim of simList) {
-		const statusText = sim.isOnline ? "Online" : "Offline";
+		const statusText = sim.status === "queued" ? "Queued" : (sim.status === "paused" ? "Paused" : (sim.isOnline ? "Online" : "Offline"));
 
 		const item = document.createElement("div");
 		item.innerHTML = 
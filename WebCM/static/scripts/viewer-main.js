@@ -5,8 +5,9 @@ function setSimName(name) {
 	document.title = `${name} - CellModeller Simulation`;
 }
 
-function setSimFrame(index, frameCount) {
-	document.getElementById("sim-frame").innerHTML = `Frame: ${index} / ${frameCount}`;
+function setSimFrame(index, frameCount, step) {
+	const stepLabel = step === undefined || step === null ? "" : ` (Step ${step})`;
+	document.getElementById("sim-frame").innerHTML = `Frame: ${index} / ${frameCount}${stepLabel}`;
 }
 
 function setSimMaxCellCount(cellCount) {
@@ -17,6 +18,15 @@ function setStatusMessage(message) {
 	document.getElementById("status-label").innerHTML = `Status: ${message}`;
 }
 
+function setSimStatus(context, status) {
+	context["simInfo"].status = status;
+
+	const statusMessages = { "queued": "Queued", "paused": "Paused", "running": "Running" };
+	setStatusMessage(statusMessages[status] || "Running");
+
+	document.getElementById("pause-btn").innerText = status === "paused" ? "Resume" : "Pause";
+}
+
 function setButtonContainerDisplay(display) {
 	document.getElementById("button-container").style.display = display;
 }
@@ -102,18 +112,133 @@ async function requestShapes(context, uuid) {
 	context["renderSettings"]["shapeList"] = buffer;
 }
 
+//Frames can be cached by the browser as long as the simulation stays on the same run
+function frameGenerationQuery(context) {
+	const generation = context["simInfo"].runGeneration;
+
+	return generation ? `&generation=${generation}` : "";
+}
+
+//Number of frames that are loaded ahead of the current frame, and the number of frames that are kept
+const FRAME_PREFETCH_COUNT = 32;
+const FRAME_CACHE_SIZE = 128;
+
+//Each frame in a /api/vizframes response starts with a header of four little-endian uint32 values:
+//frame index, simulation step, output stride and the length of the deflate compressed viz data
+const FRAME_BATCH_HEADER_SIZE = 16;
+
+function frameCacheKey(context, index) {
+	return `${context["simInfo"].runGeneration}:${index}`;
+}
+
+function setRunGeneration(context, generation) {
+	//The frames of the previous run are not needed anymore
+	if (context["simInfo"].runGeneration !== generation) {
+		context["frameCache"].clear();
+	}
+
+	context["simInfo"].runGeneration = generation;
+}
+
+function addFrameToCache(context, index, compressedData, step) {
+	const cache = context["frameCache"];
+
+	cache.set(frameCacheKey(context, index), { "compressedData": compressedData, "step": step });
+
+	//Maps iterate in insertion order, so the first key is the oldest frame
+	while (cache.size > FRAME_CACHE_SIZE) {
+		cache.delete(cache.keys().next().value);
+	}
+}
+
+async function decompressFrame(compressedData) {
+	const stream = new Blob([ compressedData ]).stream().pipeThrough(new DecompressionStream("deflate"));
+
+	return await new Response(stream).arrayBuffer();
+}
+
+//Loads the frames after 'index' that are not cached yet in a single request
+async function prefetchFrames(context, uuid, index) {
+	if (context["isPrefetchingFrames"]) {
+		return;
+	}
+
+	const lastIndex = Math.min(index + FRAME_PREFETCH_COUNT, context["simInfo"].frameCount - 1);
+
+	let first = index + 1;
+	while (first <= lastIndex && context["frameCache"].has(frameCacheKey(context, first))) {
+		first++;
+	}
+
+	if (first > lastIndex) {
+		return;
+	}
+
+	context["isPrefetchingFrames"] = true;
+
+	try {
+		const generation = context["simInfo"].runGeneration;
+
+		const response = await fetch(`/api/vizframes?uuid=${uuid}&first=${first}&count=${lastIndex - first + 1}${frameGenerationQuery(context)}`);
+		if (!response.ok) {
+			console.error(`Error when prefetching frames ${first}-${lastIndex}: ${response.status} - ${response.statusText}`);
+			return;
+		}
+
+		const buffer = await response.arrayBuffer();
+
+		//The simulation was reloaded while the frames were loading
+		if (context["simInfo"].runGeneration !== generation) {
+			return;
+		}
+
+		const view = new DataView(buffer);
+
+		for (let offset = 0; offset + FRAME_BATCH_HEADER_SIZE <= buffer.byteLength;) {
+			const frame = view.getUint32(offset, true);
+			const step = view.getUint32(offset + 4, true);
+			const length = view.getUint32(offset + 12, true);
+
+			offset += FRAME_BATCH_HEADER_SIZE;
+
+			addFrameToCache(context, frame, buffer.slice(offset, offset + length), step);
+
+			offset += length;
+		}
+	} finally {
+		context["isPrefetchingFrames"] = false;
+	}
+}
+
 async function requestFrame(context, uuid, index) {
 	context["currentFrameIndex"] = index;
 
 	const frameRequestIndex = context["frameRequestIndex_Latest"]++;
-	
-	const frameData = await fetch(`/api/vizdata?index=${index}&uuid=${uuid}`);
-	if (!frameData.ok) {
-		console.error(`Error when requesting frame ${index}: ${frameData.status} - ${frameData.statusText}`);
-		return;
+
+	let frameBuffer = null;
+	let step = null;
+
+	const cachedFrame = context["frameCache"].get(frameCacheKey(context, index));
+
+	if (cachedFrame) {
+		frameBuffer = await decompressFrame(cachedFrame.compressedData);
+		step = cachedFrame.step;
+	} else {
+		const frameData = await fetch(`/api/vizdata?index=${index}&uuid=${uuid}${frameGenerationQuery(context)}`);
+		if (!frameData.ok) {
+			console.error(`Error when requesting frame ${index}: ${frameData.status} - ${frameData.statusText}`);
+			return;
+		}
+
+		frameBuffer = await frameData.arrayBuffer();
+
+		//Frames are not always written every step, so we show the step the frame was taken at
+		const stepHeader = frameData.headers.get("X-Simulation-Step");
+		step = stepHeader === null ? null : parseInt(stepHeader);
 	}
 
-	const frameBuffer = await frameData.arrayBuffer();
+	//Load the next frames while this one is being shown
+	prefetchFrames(context, uuid, index);
 
 	if (frameRequestIndex < context["frameRequestIndex_Received"]) {
 		//Skip this frame
@@ -122,8 +247,9 @@ async function requestFrame(context, uuid, index) {
 
 	context["frameRequestIndex_Received"] = frameRequestIndex;
 	context["simInfo"].frameIndex = index;
+	context["simInfo"].frameStep = step;
 
-	setSimFrame(index + 1, context["simInfo"].frameCount);
+	setSimFrame(index + 1, context["simInfo"].frameCount, context["simInfo"].frameStep);
 
 	//Update UI
 	const [ cellCount ] = render.pushFrameData(context["graphics"]["gl"], context, frameBuffer)
@@ -147,12 +273,7 @@ async function requestFrame(context, uuid, index) {
 	await updateCellInfo(context);
 }
 
-async function confirmDownload(context) {
-	if (context["isDownloadingFrames"]) {
-		alert("Cannot start a new download while another is in progress");
-		return;
-	}
-
+function confirmDownload(context) {
 	const frameCount = context["simInfo"].frameCount;
 	let startValue = document.getElementById("download-range-start-input").value;
 	let endValue = document.getElementById("download-range-end-input").value;
@@ -175,65 +296,15 @@ async function confirmDownload(context) {
 
 	closeDownloadOptions(context);
 
-	//Start download
-	context["isDownloadingFrames"] = true;
-
+	//The server builds the archive while it is being downloaded, so the browser can save it directly
 	const downloadCount = endValue - startValue + 1;
 	const downloadFirstIndex = startValue - 1;
-	const uuid = context["simUUID"];
-	const simName = context["simInfo"].name;
-
-	const finalBlobContainer = new zip.BlobWriter();
-	const zipWriter = new zip.ZipWriter(finalBlobContainer);
-
-	const downloadBtn = document.getElementById("download-btn");
-	downloadBtn.textContent = `0 / ${downloadCount} `;	
-	downloadBtn.style.pointerEvents = "none";
-
-	let failed = false;
-
-	for (let i = 0; i < downloadCount; i++) {
-		const filename = `step-${downloadFirstIndex + i + 1}.cm5_step`
-		
-		const response = await fetch(`/api/cellstates?uuid=${uuid}&index=${downloadFirstIndex + i}`);
-		if (!response.ok) {
-			console.log(`Error when downloading step: ${response.status}:${response.statusText}`);
-
-			failed = true;
-			break;
-		}
-		
-		const cellData = await response.blob();
-		const cellDataReader = new zip.BlobReader(cellData);
-		await zipWriter.add(filename, cellDataReader);
-
-		downloadBtn.textContent = `${i + 1} / ${downloadCount} `;	
-	}
-
-	await zipWriter.close();
-
-	if (failed) {
-		downloadBtn.style.pointerEvents = "";
-		downloadBtn.textContent = "Failed to download";
-		context["isDownloadingFrames"] = false;
-
-		return;
-	}
-
-	downloadBtn.textContent = "Packaging...";
-
-	const zippedData = await finalBlobContainer.getData();
-	const dataURL = URL.createObjectURL(zippedData);
+	const includeViz = document.getElementById("download-include-viz").checked ? 1 : 0;
+	const includeSource = document.getElementById("download-include-source").checked ? 1 : 0;
 
 	const downloaderLink = document.getElementById("downloader-link");
-	downloaderLink.href = dataURL;
-	downloaderLink.download = `${simName}.zip`;
+	downloaderLink.href = `/api/exportframes?uuid=${context["simUUID"]}&first=${downloadFirstIndex}&count=${downloadCount}&viz=${includeViz}&source=${includeSource}&index=${includeSource}`;
 	downloaderLink.click();
-	URL.revokeObjectURL(dataURL);
-
-	downloadBtn.style.pointerEvents = "";
-	downloadBtn.textContent = "Download";
-	context["isDownloadingFrames"] = false;
 }
 
 function connectToSimulation(context, uuid) {
@@ -292,6 +363,7 @@ function connectToServer(context) {
 				context["simInfo"].frameIndex = 0;
 				context["simInfo"].frameCount = data.frameCount;
 				context["simInfo"].isOnline = data.isOnline;
+				setRunGeneration(context, data.runGeneration);
 
 				context["timelineSlider"].max = data.frameCount;
 
@@ -308,7 +380,7 @@ function connectToServer(context) {
 
 				if (data.isOnline) {
 					setButtonContainerDisplay("block");
-					setStatusMessage("Running");
+					setSimStatus(context, data.status);
 				}
 
 				if (data.crashMessage) {
@@ -319,6 +391,7 @@ function connectToServer(context) {
 				const frameCount = data["frameCount"];
 
 				context["simInfo"].frameCount = frameCount;
+				setRunGeneration(context, data["runGeneration"]);
 				context["timelineSlider"].max = frameCount;
 
 				if (context["alwaysUseLatestStep"] && frameCount > 0) {
@@ -326,7 +399,7 @@ function connectToServer(context) {
 
 					context["timelineSlider"].value = frameCount;
 				} else {
-					setSimFrame(context["simInfo"].frameIndex, context["simInfo"].frameCount);
+					setSimFrame(context["simInfo"].frameIndex, context["simInfo"].frameCount, context["simInfo"].frameStep);
 				}
 			} else if (action === "newshape") {
 				await requestShapes(context, context["simUUID"]);
@@ -340,6 +413,8 @@ function connectToServer(context) {
 				setStatusMessage("Fatal Error");
 			} else if (action === "closeinfolog") {
 				closeInitLogWindow(context, true);
+			} else if (action === "simstatus") {
+				setSimStatus(context, data);
 			} else if (action === "simstopped") {
 				setStatusMessage("Terminated");
 			} else if (action === "reloaddone") {
@@ -366,6 +441,23 @@ function reloadSimulation(context) {
 	}
 }
 
+function continueSimulation(context) {
+	if (context["commsSocket"] !== null) {
+		setStatusMessage("Continuing");
+		closeInitLogWindow(context, true);
+
+		context["commsSocket"].send(JSON.stringify({ "action": "continue", "data": "" }));
+	}
+}
+
+function togglePauseSimulation(context) {
+	if (context["commsSocket"] !== null) {
+		const action = context["simInfo"].status === "paused" ? "resume" : "pause";
+
+		context["commsSocket"].send(JSON.stringify({ "action": action, "data": "" }));
+	}
+}
+
 function stopSimulation(context) {
 	fetch(`/api/stopsimulation?uuid=${context["simUUID"]}`);
 }
@@ -564,8 +656,6 @@ async function initFrame(gl, context) {
 	context["isMessageLogOpen"] = false;
 	context["isSettingsWindowOpen"] = false;
 	context["isDownloadOptionsWindowOpen"] = false;
-	
-	context["isDownloadingFrames"] = false;
 
 	//Initialize camera details
 	context["camera"] = {
@@ -607,6 +697,10 @@ async function initFrame(gl, context) {
 		"frameCount": 0
 	};
 
+	//Compressed viz frames that have already been loaded (see prefetchFrames)
+	context["frameCache"] = new Map();
+	context["isPrefetchingFrames"] = false;
+
 	//Initialize render settings
 	context["renderSettings"] = {
 		"shapeList": [],
@@ -643,6 +737,8 @@ async function initFrame(gl, context) {
 	if (tempButton = document.getElementById("download-btn")) tempButton.onclick = (e) => { toggleDownloadOptions(context); };
 	if (tempButton = document.getElementById("settings-btn")) tempButton.onclick = (e) => { toggleSettings(context); };
 	if (tempButton = document.getElementById("reload-btn")) tempButton.onclick = (e) => { reloadSimulation(context); };
+	if (tempButton = document.getElementById("continue-btn")) tempButton.onclick = (e) => { continueSimulation(context); };
+	if (tempButton = document.getElementById("pause-btn")) tempButton.onclick = (e) => { togglePauseSimulation(context); };
 	if (tempButton = document.getElementById("stop-btn")) tempButton.onclick = (e) => { stopSimulation(context); };
 
 	if (tempButton = document.getElementById("download-options-confirm")) tempButton.onclick = (e) => { confirmDownload(context); };